@@ -41,7 +41,8 @@ Classes for creating, connecting, modifying and recording from neurons
     Connectors: AllToAllConnector, OneToOneConnector, FixedProbabilityConnector,
                 DistanceDependentProbabilityConnector, FixedNumberPreConnector,
                 FixedNumberPostConnector, FromListConnector, FromFileConnector,
-                CSAConnector, ArrayConnector, IndexBasedConnector
+                CSAConnector, ArrayConnector, SparseMatrixConnector,
+                IndexBasedConnector
     Standard cell types: IF_curr_exp, IF_curr_alpha, IF_cond_exp, IF_cond_alpha,
                 IF_cond_exp_gsfa_grr, IF_facets_hardware1, HH_cond_exp,
                 EIF_cond_alpha_isfa_ista, EIF_cond_exp_isfa_ista,
@@ -8,7 +8,7 @@ Brian2 implementation of the PyNN API.
 from .. import errors, random, space                            # noqa: F401
 from ..network import Network                                   # noqa: F401
 from ..standardmodels import StandardCellType
-from ..random import NumpyRNG, GSLRNG, RandomDistribution       # noqa: F401
+from ..random import NumpyRNG, GSLRNG, CounterRNG, RandomDistribution       # noqa: F401
 from ..connectors import *                                      # noqa: F401, F403
 from .standardmodels.cells import *                             # noqa: F401, F403
 from .standardmodels.synapses import *                          # noqa: F401, F403
@@ -25,6 +25,7 @@ from .projections import Projection                             # noqa: F401
 from .control import (                                          # noqa: F401
     setup,
     end,
+    build,
     run,
     run_until,
     run_for,
@@ -29,6 +29,10 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
     simulator.state.max_delay = max_delay
     simulator.state.mpi_rank = 0
     simulator.state.num_processes = 1
+    simulator.state.n_threads = extra_params.get('n_threads', 1)
+    simulator.state.deferred_build = extra_params.get('deferred_build', False)
+    simulator.state.build_processes = extra_params.get('build_processes', None)
+    simulator.state.build_plan = []
 
     simulator.state.network.add(
         brian2.NetworkOperation(update_currents, when="start", clock=simulator.state.network.clock)
@@ -46,6 +50,7 @@ def end(compatible_output=True):
 
 
 run, run_until = common.build_run(simulator)
+build = common.build_build(simulator)
 run_for = run
 
 reset = common.build_reset(simulator)
@@ -88,6 +88,7 @@ class Projection(common.Projection):
     __doc__ = common.Projection.__doc__
     _simulator = simulator
     _static_synapse_class = StaticSynapse
+    _bytes_per_connection = 40
 
     def __init__(self, presynaptic_population, postsynaptic_population,
                  connector, synapse_type=None, source=None, receptor_type=None,
@@ -142,7 +143,10 @@ class Projection(common.Projection):
                 self._brian2_synapses[i][j] = syn_obj
                 simulator.state.network.add(syn_obj)
         # connect the populations
-        connector.connect(self)
+        self._build_or_defer()
+
+    def _build(self, connector=None):
+        super()._build(connector)
         # special-case: the Tsodyks-Markram short-term plasticity model takes
         #               a parameter value from the post-synaptic response model
         if isinstance(self.synapse_type, TsodyksMarkramSynapse):
@@ -234,6 +238,36 @@ class Projection(common.Projection):
                     # ^ doesn't work with multiple connections between a given neuron pair.
                     #   Need to understand the internals of Synapses and SynapticVariable better
 
+    def _connect_block(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
+            return super()._connect_block(presynaptic_indices, postsynaptic_indices,
+                                          **connection_parameters)
+        connection_parameters.pop("dendritic_delay_fraction", None)  # TODO: need to to handle this
+        i = self._partition(presynaptic_indices)[0]
+        j = self._localize_index(postsynaptic_indices)[1]
+        syn_obj = self._brian2_synapses[0][0]
+        # new synapses are appended in the order given, so we can set their
+        # parameters using a slice, which also works for multiple connections
+        # between a given neuron pair
+        start = len(syn_obj)
+        syn_obj.connect(i=i, j=j)
+        stop = len(syn_obj)
+        self._n_connections += i.size
+        for name, value in chain(connection_parameters.items(),
+                                 self.synapse_type.initial_conditions.items()):
+            if name == 'delay':
+                scale = self._simulator.state.dt * ms
+                value = np.round(value / scale) * scale  # round to the nearest time step
+            brian2_var = getattr(syn_obj, name)
+            try:
+                brian2_var[start:stop] = value
+            except TypeError as err:
+                if "read-only" in str(err):
+                    logger.info(f"Cannot set synaptic initial value for variable {name}")
+                else:
+                    raise
+
     def _set_attributes(self, connection_parameters):
         if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
             raise NotImplementedError
@@ -243,56 +277,40 @@ class Projection(common.Projection):
             creation_order_sorted_value = value[syn_obj.i[:], syn_obj.j[:]]
             setattr(syn_obj, name, creation_order_sorted_value)
 
-    def _get_attributes_as_arrays(self, attribute_names, multiple_synapses='sum'):
+    def _set_attributes_by_connection(self, connection_parameters, connection_indices=None):
         if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
             raise NotImplementedError
-        values = []
         syn_obj = self._brian2_synapses[0][0]
-        nan_mask = np.full((self.pre.size, self.post.size), True)
-        iarr, jarr = syn_obj.i[:], syn_obj.j[:]
-        nan_mask[iarr, jarr] = False
-
-        multi_synapse_aggregation_map = {
-            'sum': (np.add.at, 0.0),
-            'min': (np.minimum.at, np.inf),
-            'max': (np.maximum.at, -np.inf)
-        }
-
-        for name in attribute_names:
-            value = getattr(syn_obj, name)[:]
-            # should really use the translated name
-            native_ps = ParameterSpace({name: value}, shape=value.shape)
-            ps = self.synapse_type.reverse_translate(native_ps)
-            ps.evaluate()
-
-            if multiple_synapses in multi_synapse_aggregation_map:
-                aggregation_func, dummy_val = multi_synapse_aggregation_map[multiple_synapses]
-                array_val = np.full((self.pre.size, self.post.size), dummy_val)
-                aggregation_func(array_val, (syn_obj.i[:], syn_obj.j[:]), ps[name])
-                array_val[nan_mask] = np.nan
+        for name, value in connection_parameters.items():
+            if connection_indices is None:
+                setattr(syn_obj, name, value)
             else:
-                raise NotImplementedError
-            values.append(array_val)
-        return values
+                getattr(syn_obj, name)[connection_indices] = value
 
     def _get_attributes_as_list(self, attribute_names):
+        columns = self._get_attributes_as_columns(attribute_names)
+        a = np.array([columns[name] for name in attribute_names])
+
+        return [tuple(x) for x in a.T]
+
+    def _get_attributes_as_columns(self, attribute_names, connections=slice(None)):
         if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
             raise NotImplementedError
-        values = []
+        columns = {}
         syn_obj = self._brian2_synapses[0][0]
         for name in attribute_names:
             if name == "presynaptic_index":
-                value = syn_obj.i[:]  # _indices.synaptic_pre.get_value()
+                value = syn_obj.i[connections]  # _indices.synaptic_pre.get_value()
                 if hasattr(self.pre, "parent"):
                     # map index in parent onto index in view
                     value = self.pre.index_from_parent_index(value)
             elif name == "postsynaptic_index":
-                value = syn_obj.j[:]  # _indices.synaptic_post.get_value()
+                value = syn_obj.j[connections]  # _indices.synaptic_post.get_value()
                 if hasattr(self.post, "parent"):
                     # map index in parent onto index in view
                     value = self.post.index_from_parent_index(value)
             else:
-                value = getattr(syn_obj, name)[:]
+                value = getattr(syn_obj, name)[connections]
                 # should really use the translated name
                 native_ps = ParameterSpace({name: value}, shape=value.shape)
                 # todo: this whole "get attributes" thing needs refactoring
@@ -300,10 +318,16 @@ class Projection(common.Projection):
                 ps = self.synapse_type.reverse_translate(native_ps)
                 ps.evaluate()
                 value = ps[name]
-            values.append(value)
-        a = np.array(values)
+            columns[name] = value
+        return columns
 
-        return [tuple(x) for x in a.T]
+    def _get_attributes_as_column_chunks(self, attribute_names, chunk_size):
+        if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
+            raise NotImplementedError
+        n_connections = len(self._brian2_synapses[0][0])
+        for start in range(0, n_connections, chunk_size):
+            yield self._get_attributes_as_columns(attribute_names,
+                                                  slice(start, start + chunk_size))
 
     def _set_tau_syn_for_tsodyks_markram(self):
         if isinstance(self.post, common.Assembly) or isinstance(self.pre, common.Assembly):
@@ -19,6 +19,7 @@ Base classes to be sub-classed by individual backends:
     Projection
 
 Function-factories to generate backend-specific API functions:
+    build_build()
     build_reset()
     build_state_queries()
     build_create()
@@ -49,4 +50,4 @@ Global constants:
 from .populations import IDMixin, BasePopulation, Population, PopulationView, Assembly, is_conductance
 from .projections import Projection, Connection
 from .procedural_api import build_create, build_connect, set, build_record, initialize
-from .control import setup, end, build_run, build_reset, build_state_queries
+from .control import setup, end, build_run, build_build, build_reset, build_state_queries
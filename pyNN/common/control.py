@@ -30,6 +30,12 @@ class BaseState(object):
         # that should be written to file on end()
         self.write_on_end = []
         self.recorders = set([])
+        # number of threads used to evaluate connection maps (see `setup()`)
+        self.n_threads = 1
+        # projections waiting to be built, with `setup(deferred_build=True)`
+        self.deferred_build = False
+        self.build_processes = None
+        self.build_plan = []
 
 
 def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
@@ -41,7 +47,25 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
     `timestep`, `min_delay` and `max_delay` should all be in milliseconds.
 
     `extra_params` contains any keyword arguments that are required by a given
-    simulator but not by others.
+    simulator but not by others. The following are common to all simulators:
+
+    `n_threads`:
+        number of threads used by connectors to evaluate blocks of their
+        connection maps. Connections are still created in the same order, and
+        random numbers drawn in the same order, as with a single thread. This
+        can be overridden for an individual connector by setting its
+        `n_threads` attribute.
+
+    `deferred_build`:
+        if True, creating a `Projection` does not create its connections. Instead,
+        the projections are built together by `build()`, or at the start of the
+        first `run()`. Projections between the same populations then share their
+        distance calculations.
+
+    `build_processes`:
+        with `deferred_build`, the number of processes in which to evaluate the
+        connectors of independent projections, i.e. those which do not share a
+        random number generator with another projection (see `build()`).
     """
     max_delay = extra_params.get('max_delay', DEFAULT_MAX_DELAY)
     invalid_extra_params = ('mindelay', 'maxdelay', 'dt', 'time_step')
@@ -62,6 +86,8 @@ def end(compatible_output=True):
 
 
 def build_run(simulator):
+    build = build_build(simulator)
+
     def run_until(time_point, callbacks=None):
         """
         Advance the simulation until `time_point` (in ms).
@@ -73,6 +99,8 @@ def build_run(simulator):
         ``run_until()`` and ``run()`` may be combined freely. See the
         documentation of the ``run()`` function for further information.
         """
+        if simulator.state.build_plan:
+            build()
         now = simulator.state.t
         if time_point - now < -simulator.state.dt / 2.0:  # allow for floating point error
             raise ValueError("Time %g is in the past (current time %g)" % (time_point, now))
@@ -115,6 +143,24 @@ def build_run(simulator):
     return run, run_until
 
 
+def build_build(simulator):
+    def build(processes=None):
+        """
+        Create the connections for all projections created since `setup()` was
+        called with `deferred_build=True`, or since the last call to `build()`.
+
+        `processes` is the number of processes in which to evaluate the
+        connectors of independent projections (by default, the value of
+        `build_processes` given to `setup()`). The connections are created
+        in the same order, with the same random numbers, as without deferral.
+        """
+        from .projections import build_projections
+        projections = simulator.state.build_plan
+        simulator.state.build_plan = []
+        build_projections(projections, processes or simulator.state.build_processes)
+    return build
+
+
 def build_reset(simulator):
     def reset(annotations={}):
         """
@@ -38,6 +38,27 @@ def is_conductance(target_cell):
     return is_conductance
 
 
+def _ids_to_indices(all_cells, ids, container="View"):
+    """
+    Return the positions of the IDs `ids` within the (not necessarily sorted)
+    array `all_cells`, using a binary search in a sorted copy of `all_cells`.
+    """
+    ids = np.asarray(ids)
+    order = np.argsort(all_cells, kind="stable")
+    sorted_cells = all_cells[order]
+    positions = np.searchsorted(sorted_cells, ids)
+    found = sorted_cells[np.minimum(positions, sorted_cells.size - 1)] == ids
+    if not found.all():
+        raise IndexError("ID %s not present in the %s" % (ids[~found].flat[0], container))
+    duplicated = sorted_cells[1:][sorted_cells[1:] == sorted_cells[:-1]]
+    if duplicated.size > 0:
+        is_duplicated = np.isin(ids, duplicated)
+        if is_duplicated.any():
+            raise Exception("ID %s is duplicated in the %s"
+                            % (ids[is_duplicated].flat[0], container))
+    return order[positions]
+
+
 class IDMixin(object):
     """
     Instead of storing ids as integers, we store them as ID objects,
@@ -923,16 +944,7 @@ class PopulationView(BasePopulation):
             if self._is_sorted:
                 return np.searchsorted(self.all_cells, id)
             else:
-                result = np.array([], dtype=int)
-                for item in id:
-                    data = np.where(self.all_cells == item)[0]
-                    if len(data) == 0:
-                        raise IndexError("ID %s not present in the View" % item)
-                    elif len(data) > 1:
-                        raise Exception("ID %s is duplicated in the View" % item)
-                    else:
-                        result = np.append(result, data)
-                return result
+                return _ids_to_indices(self.all_cells, id, "View")
 
     @property
     def grandparent(self):
@@ -1183,16 +1195,7 @@ class Assembly(object):
             if self._is_sorted:
                 return np.searchsorted(all_cells, id)
             else:
-                result = np.array([], dtype=int)
-                for item in id:
-                    data = np.where(all_cells == item)[0]
-                    if len(data) == 0:
-                        raise IndexError("ID %s not present in the Assembly" % item)
-                    elif len(data) > 1:
-                        raise Exception("ID %s is duplicated in the Assembly" % item)
-                    else:
-                        result = np.append(result, data)
-                return result
+                return _ids_to_indices(all_cells, id, "Assembly")
 
     @property
     def positions(self):
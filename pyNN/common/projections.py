@@ -8,14 +8,18 @@ backend-specific Projection classes.
 """
 
 
-from functools import reduce
 import logging
+import multiprocessing
 import operator
-from copy import deepcopy
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from copy import copy, deepcopy
+from itertools import islice
 from warnings import warn
 import numpy as np
 from .. import recording, errors, models, core, descriptions
-from ..parameters import ParameterSpace, LazyArray
+from ..parameters import ParameterSpace, LazyArray, _contains_random_values
+from ..random import AbstractRNG, RandomDistribution
 from ..space import Space
 from ..standardmodels import StandardSynapseType
 from ..connectors import Connector
@@ -55,6 +59,11 @@ class Projection(object):
             TO DOCUMENT
     """
     _nProj = 0
+    # typical memory used by one static connection, in bytes, for Connector.estimate()
+    _bytes_per_connection = 100
+    # number of connections processed at a time by `statistics()`
+    _statistics_chunk_size = 1000000
+
     MULTI_SYNAPSE_OPERATIONS = {
         'last': lambda a, b: b,
         'first': lambda a, b: a,
@@ -122,6 +131,25 @@ class Projection(object):
         self.annotations = {}
         Projection._nProj += 1
 
+    def _build_or_defer(self):
+        """
+        Create the connections now or, if `setup()` was called with
+        `deferred_build=True`, add this projection to the build plan, to be
+        built by `build()` or at the start of the first `run()`.
+        """
+        if getattr(self._simulator.state, "deferred_build", False):
+            self._simulator.state.build_plan.append(self)
+        else:
+            self._build()
+
+    def _build(self, connector=None):
+        """
+        Create the connections, with `connector` if given, otherwise with the
+        projection's own connector. Backends may extend this for set-up which
+        needs the connections to exist.
+        """
+        (connector or self._connector).connect(self)
+
     def _guess_receptor_type(self):
         """
         If the receptor_type is not specified, we follow the convention that the first element
@@ -178,6 +206,39 @@ class Projection(object):
         for i in range(len(self)):
             yield self[i]
 
+    def _connect_block(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        Create connections for a block of post-synaptic neurons in a single call.
+
+        `presynaptic_indices` and `postsynaptic_indices` are integer arrays of
+        the same length, with connection `k` going from
+        `presynaptic_indices[k]` to `postsynaptic_indices[k]`. Connections are
+        grouped by post-synaptic neuron, i.e. all connections to a given neuron
+        are contiguous. Each connection parameter is either a single value or
+        an array of the same length as the index arrays.
+
+        Backends should override this method where they can create many
+        connections at once; the default implementation falls back to calling
+        `_convergent_connect()` once per post-synaptic neuron.
+        """
+        n = presynaptic_indices.size
+        if n == 0:
+            return
+        boundaries = np.flatnonzero(np.diff(postsynaptic_indices)) + 1
+        starts = np.hstack(([0], boundaries))
+        stops = np.hstack((boundaries, [n]))
+        for start, stop in zip(starts, stops):
+            column_parameters = {}
+            for name, value in connection_parameters.items():
+                if core.is_listlike(value):
+                    column_parameters[name] = value[start:stop]
+                else:
+                    column_parameters[name] = value
+            self._convergent_connect(presynaptic_indices[start:stop],
+                                     postsynaptic_indices[start],
+                                     **column_parameters)
+
     # --- Methods for setting connection parameters ---------------------------
 
     def set(self, **attributes):
@@ -194,21 +255,29 @@ class Projection(object):
                 (as returned by `get(format='array')`
             (4) a mapping function, which accepts a single float argument (the
                 distance between pre- and post-synaptic cells) and returns a single value.
+            (5) a list or 1D array with one value per connection on the local
+                MPI node, in the order given by `get(..., gather=False)`
+            (6) a tuple of three 1D arrays (pre-synaptic indices, post-synaptic
+                indices, values). Connections between pairs of neurons which
+                are not listed keep their current values.
+
+        Options (5) and (6) are passed directly to the simulator, without creating
+        an array with the dimensions of the connectivity matrix.
 
         Weights should be in nA for current-based and µS for conductance-based
         synapses. Delays should be in milliseconds.
 
         Note that where a projection contains multiple connections between a given pair
-        of neurons, all these connections will be set to the same value.
+        of neurons, all these connections will be set to the same value (except
+        with option (5)).
         """
         # should perhaps add a "distribute" argument, for symmetry with "gather" in get()
-
-        # Note: we have removed the option:
-        #      "a list/1D array of the same length as the number of local connections"
-        # because it was proving tricky to implement and was holding up the release.
-        # The plan is to add this option back at a later date.
-
-        attributes = self._value_list_to_array(attributes)
+        for name, value in list(attributes.items()):
+            if isinstance(value, tuple) or isinstance(value, list) or (
+                    isinstance(value, np.ndarray) and value.ndim == 1):
+                self._set_connection_values(name, attributes.pop(name))
+        if not attributes:
+            return
         parameter_space = ParameterSpace(attributes,
                                          self.synapse_type.get_schema(),
                                          (self.pre.size, self.post.size))
@@ -243,15 +312,93 @@ class Projection(object):
             self._set_initial_value_array(variable, initial_value)
             self.initial_values[variable] = initial_value
 
-    def _value_list_to_array(self, attributes):
-        """Convert a list of connection parameters/attributes to a 2D array."""
-        connection_mask = ~np.isnan(self.get('weight', format='array', gather='all'))
-        for name, value in attributes.items():
-            if isinstance(value, list) or (isinstance(value, np.ndarray) and value.ndim == 1):
-                array_value = np.nan * np.ones(self.shape)
-                array_value[connection_mask] = value
-                attributes[name] = array_value
-        return attributes
+    def _evaluate_at_connections(self, map, presynaptic_indices, postsynaptic_indices):
+        """
+        Evaluate the lazy array `map`, of the same shape as the projection, for
+        the local connections from `presynaptic_indices` to `postsynaptic_indices`.
+
+        Random values are drawn as by `ParameterSpace.evaluate()` with a mask of
+        the local columns, so they do not depend on which connections exist, nor,
+        with a parallel-safe random number generator, on the number of MPI nodes.
+        Homogeneous values are returned as scalars.
+        """
+        if map.is_homogeneous:
+            return map.evaluate(simplify=True)
+        if (
+            isinstance(map.base_value, RandomDistribution)
+            and map.base_value.rng.parallel_safe
+            and not map.base_value.rng.counter_based
+        ):
+            # every MPI node draws the values for the whole array
+            return map.evaluate()[presynaptic_indices, postsynaptic_indices]
+        if (
+            _contains_random_values(map)
+            or (isinstance(map.base_value, core.IndexBasedExpression)
+                and not map.base_value.supports_blocks)
+        ):
+            local_columns = self.post._mask_local.nonzero()[0]
+            return map[:, local_columns][
+                presynaptic_indices, np.searchsorted(local_columns, postsynaptic_indices)]
+        return map[presynaptic_indices, postsynaptic_indices]
+
+    def _set_connection_values(self, name, value):
+        """
+        Set the values of an attribute for individual connections, given
+        either as a vector with one value per local connection, or as a tuple
+        (pre-synaptic indices, post-synaptic indices, values).
+        """
+        connection_indices = None
+        if isinstance(value, tuple):
+            presynaptic_indices, postsynaptic_indices, value = value
+            columns = self._get_attributes_as_columns(["presynaptic_index", "postsynaptic_index"])
+            addresses = np.ravel_multi_index(
+                (np.asarray(columns["presynaptic_index"], dtype=int),
+                 np.asarray(columns["postsynaptic_index"], dtype=int)),
+                self.shape)
+            given_addresses = np.ravel_multi_index(
+                (np.asarray(presynaptic_indices, dtype=int),
+                 np.asarray(postsynaptic_indices, dtype=int)),
+                self.shape)
+            # find, for each local connection, the position of its address in
+            # the given addresses, if it is there
+            order = np.argsort(given_addresses, kind="stable")
+            given_addresses = given_addresses[order]
+            positions = np.searchsorted(given_addresses, addresses)
+            positions[positions == given_addresses.size] = 0
+            found = given_addresses[positions] == addresses
+            connection_indices = found.nonzero()[0]
+            value = np.asarray(value, dtype=float)[order][positions[found]]
+            if connection_indices.size == 0:
+                return
+        else:
+            value = np.asarray(value, dtype=float)
+            if value.size != len(self):
+                raise ValueError(
+                    f"{value.size} values were given for '{name}', but there are "
+                    f"{len(self)} connections on this node")
+        parameter_space = ParameterSpace({name: value},
+                                         self.synapse_type.get_schema(),
+                                         value.shape)
+        if isinstance(self.synapse_type, StandardSynapseType):
+            parameter_space = self.synapse_type.translate(parameter_space, copy=False)
+        parameter_space.evaluate(simplify=True)
+        self._set_attributes_by_connection(dict(parameter_space.items()), connection_indices)
+
+    def _set_attributes_by_connection(self, connection_parameters, connection_indices=None):
+        """
+        Set native attribute values for individual connections.
+
+        `connection_parameters` contains a 1D array of values for each attribute,
+        for the local connections in the order given by `_get_attributes_as_columns()`,
+        or, if `connection_indices` is given, for the connections at those positions
+        in that order. Backends may override this to set the values in bulk.
+        """
+        connections = list(self.connections)
+        if connection_indices is None:
+            connection_indices = range(len(connections))
+        for name, values in connection_parameters.items():
+            for i, value in zip(connection_indices, values):
+                setattr(connections[i], name, value)
 
     def _handle_distance_expressions(self, parameter_space):
         # also index-based expressions
@@ -305,7 +452,7 @@ class Projection(object):
             name of the attributes whose values are wanted, or a list of such
             names.
         `format`:
-            "list" or "array".
+            "list", "array", "columns" or "structured".
         `gather`:
             If True, node 0 gets connection information from all MPI nodes,
             other nodes get information only from connections that exist in this node.
@@ -344,6 +491,19 @@ class Projection(object):
         controlled by the `multiple_synapses` argument, which must be one of
         {'last', 'first', 'sum', 'min', 'max'}.
 
+        With columns format, returns a dict of 1D NumPy arrays, one per
+        connection, keyed by "presynaptic_index" and "postsynaptic_index"
+        (unless `with_address` is False), with integer values, and by the names
+        in `attribute_names`, with float values. With structured format, returns
+        the same columns as a NumPy record array. These formats avoid creating a
+        Python object for every connection. Example::
+
+            >>> prj.get(["weight", "delay"], format="columns")
+            {'presynaptic_index': array([0, 0, 0, 1, 1, 1]),
+             'postsynaptic_index': array([0, 1, 2, 0, 1, 2]),
+             'weight': array([0.34, 0.8 , 0.62, 0.68, 0.72, 0.21]),
+             'delay': array([0.1, 0.3, 0.5, 0.7, 0.9, 1.1])}
+
         Values will be expressed in the standard PyNN units (i.e. millivolts,
         nanoamps, milliseconds, microsiemens, nanofarads, event per second).
         """
@@ -352,18 +512,18 @@ class Projection(object):
             return_single = True
         else:
             return_single = False
+        requested_names = list(attribute_names)
         if isinstance(self.synapse_type, StandardSynapseType):
             attribute_names = self.synapse_type.get_native_names(*attribute_names)
         if format == 'list':
             names = list(attribute_names)
             if with_address:
                 names = ["presynaptic_index", "postsynaptic_index"] + names
-            values = self._get_attributes_as_list(names)
             if gather and self._simulator.state.num_processes > 1:
-                all_values = {self._simulator.state.mpi_rank: values}
-                all_values = recording.gather_dict(all_values, all=(gather == 'all'))
-                if gather == 'all' or self._simulator.state.mpi_rank == 0:
-                    values = reduce(operator.add, all_values.values())
+                columns = self._get_attributes_as_gathered_columns(names, gather)
+                values = list(zip(*(columns[name].tolist() for name in names)))
+            else:
+                values = self._get_attributes_as_list(names)
             if not with_address and return_single:
                 values = [val[0] for val in values]
             return values
@@ -371,54 +531,302 @@ class Projection(object):
             if multiple_synapses not in Projection.MULTI_SYNAPSE_OPERATIONS:
                 raise ValueError("`multiple_synapses` argument must be one of {}".format(
                     list(Projection.MULTI_SYNAPSE_OPERATIONS)))
-            if gather and self._simulator.state.num_processes > 1:
-                # Node 0 is the only one creating a full connection matrix, and returning it
-                # (saving memory)
-                # Slaves nodes are returning list of connections, so this may be inconsistent...
-                names = list(attribute_names)
-                names = ["presynaptic_index", "postsynaptic_index"] + names
-                values = self._get_attributes_as_list(names)
-                all_values = {self._simulator.state.mpi_rank: values}
-                all_values = recording.gather_dict(all_values, all=(gather == 'all'))
-                if gather == 'all' or self._simulator.state.mpi_rank == 0:
-                    tmp_values = reduce(operator.add, all_values.values())
-                    values = self._get_attributes_as_arrays(attribute_names,
-                                                            multiple_synapses=multiple_synapses)
-                    tmp_values = np.array(tmp_values)
-                    for i in range(len(values)):
-                        values[i][tmp_values[:, 0].astype(
-                            int), tmp_values[:, 1].astype(int)] = tmp_values[:, 2 + i]
-            else:
-                values = self._get_attributes_as_arrays(attribute_names,
-                                                        multiple_synapses=multiple_synapses)
+            # with gather=True, only node 0 receives the connections from all nodes;
+            # the other nodes return arrays containing only their local connections
+            values = self._get_attributes_as_arrays(attribute_names,
+                                                    multiple_synapses=multiple_synapses,
+                                                    gather=gather)
             if return_single:
-                if gather == 'all' or self._simulator.state.mpi_rank == 0:
-                    assert len(values) == 1, values
+                assert len(values) == 1, values
                 return values[0]
             else:
                 return values
+        elif format in ('columns', 'structured'):
+            names = list(attribute_names)
+            keys = requested_names
+            if with_address:
+                names = ["presynaptic_index", "postsynaptic_index"] + names
+                keys = ["presynaptic_index", "postsynaptic_index"] + keys
+            values = self._get_attributes_as_gathered_columns(names, gather)
+            columns = dict((key, values[name]) for key, name in zip(keys, names))
+            if format == 'structured':
+                return np.rec.fromarrays(list(columns.values()), names=keys)
+            return columns
         else:
-            raise Exception("format must be 'list' or 'array'")
+            raise Exception("format must be 'list', 'array', 'columns' or 'structured'")
 
     def _get_attributes_as_list(self, names):
         return [c.as_tuple(*names) for c in self.connections]
 
-    def _get_attributes_as_arrays(self, names, multiple_synapses='sum'):
-        multi_synapse_operation = Projection.MULTI_SYNAPSE_OPERATIONS[multiple_synapses]
-        all_values = []
-        for attribute_name in names:
-            values = np.nan * np.ones((self.pre.size, self.post.size))
-            if attribute_name[-1] == "s":  # weights --> weight, delays --> delay
-                attribute_name = attribute_name[:-1]
-            for c in self.connections:
-                value = getattr(c, attribute_name)
-                addr = (c.presynaptic_index, c.postsynaptic_index)
-                if np.isnan(values[addr]):
-                    values[addr] = value
-                else:
-                    values[addr] = multi_synapse_operation(values[addr], value)
-            all_values.append(values)
-        return all_values
+    def _get_attributes_as_columns(self, names):
+        """
+        Return a dict containing a 1D array of the values of each of the
+        attributes in `names` for the local connections. Backends may override
+        this to read the arrays directly from the simulator.
+        """
+        return dict((name, np.fromiter((getattr(c, name) for c in self.connections), dtype=float))
+                    for name in names)
+
+    def _get_attributes_as_column_chunks(self, names, chunk_size):
+        """
+        Yield dicts of columns, as returned by `_get_attributes_as_columns()`,
+        for successive chunks of at most `chunk_size` local connections, so that
+        the values for all connections are never in memory at once. Backends
+        may override this to read the chunks directly from the simulator.
+        """
+        connections = iter(self.connections)
+        while True:
+            chunk = list(islice(connections, chunk_size))
+            if not chunk:
+                break
+            yield dict((name, np.fromiter((getattr(c, name) for c in chunk), dtype=float,
+                                          count=len(chunk)))
+                       for name in names)
+
+    def _get_attributes_as_arrays(self, names, multiple_synapses='sum', gather=False):
+        # weights --> weight, delays --> delay
+        names = [name[:-1] if name in ("weights", "delays") else name for name in names]
+        columns = self._get_attributes_as_gathered_columns(
+            ["presynaptic_index", "postsynaptic_index"] + names, gather)
+        return [self._connection_matrix(columns["presynaptic_index"],
+                                        columns["postsynaptic_index"],
+                                        columns[name], multiple_synapses)
+                for name in names]
+
+    def _get_attributes_as_gathered_columns(self, names, gather=False):
+        """
+        Return the columns from `_get_attributes_as_columns()`, with indices
+        as 64-bit integers and attribute values as floats, gathered from all
+        MPI nodes according to `gather` (see `get()`).
+        """
+        columns = self._get_attributes_as_columns(names)
+        columns = dict(
+            (name, np.asarray(columns[name], dtype=np.int64)
+             if name in ("presynaptic_index", "postsynaptic_index")
+             else np.asarray(columns[name], dtype=float))
+            for name in names)
+        if gather and self._simulator.state.num_processes > 1:
+            columns = recording.gather_columns(columns, all=(gather == 'all'))
+        return columns
+
+    def _connection_matrix(self, presynaptic_indices, postsynaptic_indices, values,
+                           multiple_synapses='sum'):
+        """
+        Return a 2D array, of the same shape as the projection, containing the
+        `values` for the connections from `presynaptic_indices` to
+        `postsynaptic_indices` and NaN where there is no connection.
+
+        Where there are several connections between the same pair of neurons,
+        their values are combined according to `multiple_synapses` (see
+        `MULTI_SYNAPSE_OPERATIONS`), in the order in which they are given.
+        """
+        matrix = np.full(self.shape, np.nan)
+        addresses = np.ravel_multi_index((presynaptic_indices, postsynaptic_indices),
+                                         self.shape)
+        addresses, values = self._reduce_multiple_synapses(addresses, values, multiple_synapses)
+        matrix.flat[addresses] = values
+        return matrix
+
+    def _reduce_multiple_synapses(self, addresses, values, multiple_synapses='sum'):
+        """
+        Combine the `values` of connections with the same (flat) address,
+        according to `multiple_synapses`, in the order in which they are given.
+
+        Returns the sorted unique addresses and the combined values.
+        """
+        if multiple_synapses in ('first', 'last'):
+            if multiple_synapses == 'last':
+                addresses = addresses[::-1]
+                values = values[::-1]
+            unique_addresses, first_occurrences = np.unique(addresses, return_index=True)
+            return unique_addresses, values[first_occurrences]
+        ufunc, identity = {
+            'sum': (np.add, 0.0),
+            'min': (np.minimum, np.inf),
+            'max': (np.maximum, -np.inf)
+        }[multiple_synapses]
+        unique_addresses, inverse = np.unique(addresses, return_inverse=True)
+        reduced = np.full(unique_addresses.size, identity)
+        ufunc.at(reduced, inverse.ravel(), values)
+        return unique_addresses, reduced
+
+    def to_sparse(self, attribute_name="weight", multiple_synapses='sum', format="csr",
+                  gather=True):
+        """
+        Return the values of a given attribute for all connections in this
+        Projection as a SciPy sparse matrix, with the same shape as the
+        projection, without creating a dense array.
+
+        `format`:
+            "csr" or "coo".
+        `multiple_synapses`:
+            how to combine the values of several connections between the same
+            pair of neurons: one of {'last', 'first', 'sum', 'min', 'max'}.
+        `gather`:
+            as for `get()`. The arrays from the different MPI nodes are
+            concatenated before building the matrix.
+
+        Values will be expressed in the standard PyNN units.
+        """
+        from scipy import sparse
+
+        if multiple_synapses not in Projection.MULTI_SYNAPSE_OPERATIONS:
+            raise ValueError("`multiple_synapses` argument must be one of {}".format(
+                list(Projection.MULTI_SYNAPSE_OPERATIONS)))
+        if format not in ("csr", "coo"):
+            raise ValueError("format must be 'csr' or 'coo'")
+        columns = self.get(attribute_name, format="columns", gather=gather)
+        addresses = np.ravel_multi_index(
+            (columns["presynaptic_index"], columns["postsynaptic_index"]), self.shape)
+        addresses, values = self._reduce_multiple_synapses(addresses, columns[attribute_name],
+                                                           multiple_synapses)
+        rows, cols = np.unravel_index(addresses, self.shape)
+        matrix = sparse.coo_matrix((values, (rows, cols)), shape=self.shape)
+        if format == "csr":
+            matrix = matrix.tocsr()
+        return matrix
+
+    def statistics(self, attribute_names=("weight", "delay"), distance_bins=None,
+                   gather=True):
+        """
+        Return summary statistics of the connectivity of this Projection,
+        without creating a list or array of all connections.
+
+        `attribute_names`:
+            the connection attributes for which to compute summary statistics.
+        `distance_bins`:
+            if given, a sequence of bin edges for a histogram of the distances
+            between connected neurons, calculated in the projection's `Space`.
+        `gather`:
+            If True, node 0 gets statistics for all connections, other nodes
+            only for those which exist on that node. If 'all', all nodes get
+            statistics for all connections. If False, all nodes get statistics
+            only for their local connections.
+
+        Returns a dict containing:
+            "n_connections": the number of connections,
+            "in_degree": an array with the number of connections received by each
+                post-synaptic neuron,
+            "out_degree": an array with the number of connections made by each
+                pre-synaptic neuron,
+            "n_multapses": the number of connections which duplicate another
+                connection between the same pair of neurons,
+            "n_autapses": the number of connections from a neuron to itself,
+            "distance_histogram": (counts, bin edges), if `distance_bins` is given,
+        and, for each name in `attribute_names`, a dict with the "mean", "std",
+        "min" and "max" of that attribute, in standard PyNN units.
+
+        The connections are read from the simulator in chunks of
+        `_statistics_chunk_size` (see `_get_attributes_as_column_chunks()`). Means
+        and standard deviations are combined across chunks and MPI nodes with
+        the pairwise algorithm of Chan et al., which, unlike a sum of squares,
+        keeps its precision for large values with a small spread.
+        """
+        if isinstance(attribute_names, str):
+            attribute_names = (attribute_names,)
+        attribute_names = list(attribute_names)
+        native_names = attribute_names
+        if isinstance(self.synapse_type, StandardSynapseType):
+            native_names = self.synapse_type.get_native_names(*attribute_names)
+        pre_ids = np.asarray(self.pre.all_cells, dtype=int)
+        post_ids = np.asarray(self.post.all_cells, dtype=int)
+        if distance_bins is not None:
+            distance_bins = np.asarray(distance_bins, dtype=float)
+            pre_positions = self.pre.positions.T
+            post_positions = self.post.positions.T
+
+        # all integer-valued statistics are summed across MPI nodes in a single array:
+        # in-degrees, out-degrees, counts of connections, multapses and autapses,
+        # then the distance histogram
+        counts = np.zeros(self.post.size + self.pre.size + 3
+                          + (0 if distance_bins is None else distance_bins.size - 1),
+                          dtype=np.int64)
+        in_degree = counts[:self.post.size]
+        out_degree = counts[self.post.size:self.post.size + self.pre.size]
+        i_connections, i_multapses, i_autapses = range(self.post.size + self.pre.size,
+                                                       self.post.size + self.pre.size + 3)
+        histogram = counts[self.post.size + self.pre.size + 3:]
+        # number of values, mean and sum of squared deviations from the mean of each
+        # attribute, combined chunk by chunk (see `_combine_moments()`)
+        n_values = 0
+        means = np.zeros(len(native_names))
+        squared_deviations = np.zeros(len(native_names))
+        minima = np.full(len(native_names), np.inf)
+        maxima = np.full(len(native_names), -np.inf)
+        pairs = _ConnectedPairs(self.shape, len(self))
+
+        # connections between a given pair of neurons are always on the same node
+        for chunk in self._get_attributes_as_column_chunks(
+                ["presynaptic_index", "postsynaptic_index"] + native_names,
+                self._statistics_chunk_size):
+            sources = np.asarray(chunk["presynaptic_index"], dtype=np.int64)
+            targets = np.asarray(chunk["postsynaptic_index"], dtype=np.int64)
+            if sources.size == 0:
+                continue
+            counts[i_connections] += sources.size
+            counts[i_multapses] += sources.size - pairs.add(sources, targets)
+            in_degree += np.bincount(targets, minlength=self.post.size)
+            out_degree += np.bincount(sources, minlength=self.pre.size)
+            counts[i_autapses] += np.count_nonzero(pre_ids[sources] == post_ids[targets])
+            if native_names:
+                values = np.array([chunk[name] for name in native_names], dtype=float)
+                chunk_means = values.mean(axis=1)
+                chunk_squared_deviations = ((values - chunk_means[:, np.newaxis])**2).sum(axis=1)
+                n_values, means, squared_deviations = _combine_moments(
+                    n_values, means, squared_deviations,
+                    sources.size, chunk_means, chunk_squared_deviations)
+                minima = np.minimum(minima, values.min(axis=1))
+                maxima = np.maximum(maxima, values.max(axis=1))
+            if distance_bins is not None:
+                distances = self.space.paired_distances(pre_positions[sources],
+                                                        post_positions[targets])
+                histogram += np.histogram(distances, bins=distance_bins)[0]
+
+        if gather and self._simulator.state.num_processes > 1:
+            to_all = (gather == 'all')
+            counts = recording.reduce_array(counts, 'SUM', all=to_all)
+            minima = recording.reduce_array(minima, 'MIN', all=to_all)
+            maxima = recording.reduce_array(maxima, 'MAX', all=to_all)
+            # the moments from each node are combined in rank order
+            moments = recording.gather_columns(
+                {"n": np.array([n_values]),
+                 "means": means, "squared_deviations": squared_deviations},
+                all=to_all)
+            n_nodes = moments["n"].size
+            node_means = moments["means"].reshape((n_nodes, -1))
+            node_squared_deviations = moments["squared_deviations"].reshape((n_nodes, -1))
+            n_values = 0
+            means = np.zeros(len(native_names))
+            squared_deviations = np.zeros(len(native_names))
+            for node in range(n_nodes):
+                n_values, means, squared_deviations = _combine_moments(
+                    n_values, means, squared_deviations,
+                    int(moments["n"][node]), node_means[node], node_squared_deviations[node])
+
+        n = int(counts[i_connections])
+        statistics = {
+            "n_connections": n,
+            "in_degree": counts[:self.post.size],
+            "out_degree": counts[self.post.size:self.post.size + self.pre.size],
+            "n_multapses": int(counts[i_multapses]),
+            "n_autapses": int(counts[i_autapses]),
+        }
+        if distance_bins is not None:
+            statistics["distance_histogram"] = (counts[self.post.size + self.pre.size + 3:],
+                                                distance_bins)
+        for i, name in enumerate(attribute_names):
+            if n > 0:
+                mean = means[i]
+                std = np.sqrt(squared_deviations[i] / n)
+            else:
+                mean = std = np.nan
+            statistics[name] = {
+                "mean": mean,
+                "std": std,
+                "min": minima[i] if n > 0 else np.nan,
+                "max": maxima[i] if n > 0 else np.nan
+            }
+        return statistics
 
     @deprecated("get('weight', format, gather)")
     def getWeights(self, format='list', gather=True):
@@ -439,11 +847,14 @@ class Projection(object):
 
         Values will be expressed in the standard PyNN units (i.e. millivolts,
         nanoamps, milliseconds, microsiemens, nanofarads, event per second).
+
+        If `file` is a filename ending in ".npy" or ".h5", the values are saved
+        in binary format, which can be read efficiently by `FromFileConnector`.
         """
         if attribute_names in ('all', 'connections'):
             attribute_names = self.synapse_type.get_parameter_names()
         if isinstance(file, str):
-            file = recording.files.StandardTextFile(file, mode='wb')
+            file = recording.files.get_file(file, mode='wb')
         all_values = self.get(attribute_names, format=format,
                               gather=gather, with_address=with_address)
         if format == 'array':
@@ -523,3 +934,215 @@ class Connection(object):
     attributes.
     """
     pass
+
+
+def _combine_moments(n_a, mean_a, squared_deviations_a, n_b, mean_b, squared_deviations_b):
+    """
+    Combine the number of values, means and sums of squared deviations from the
+    mean of two sets of values (Chan, Golub and LeVeque, 1979).
+    """
+    n = n_a + n_b
+    if n_b == 0:
+        return n_a, mean_a, squared_deviations_a
+    if n_a == 0:
+        return n_b, mean_b, squared_deviations_b
+    delta = mean_b - mean_a
+    mean = mean_a + delta * (n_b / n)
+    squared_deviations = squared_deviations_a + squared_deviations_b + delta**2 * (n_a * n_b / n)
+    return n, mean, squared_deviations
+
+
+class _ConnectedPairs(object):
+    """
+    The set of (pre, post) index pairs seen so far, used to count multapses.
+
+    A bit per possible pair is used if that takes no more memory than storing
+    the `n_connections` pairs, otherwise the sorted distinct pairs are kept.
+    """
+    max_bits_per_connection = 64
+
+    def __init__(self, shape, n_connections):
+        self.shape = shape
+        size = int(np.prod(shape))
+        if size <= self.max_bits_per_connection * n_connections:
+            self.bits = np.zeros(size // 8 + 1, dtype=np.uint8)
+        else:
+            self.bits = None
+            self.pairs = np.zeros(0, dtype=np.int64)
+
+    def add(self, presynaptic_indices, postsynaptic_indices):
+        """Add pairs, and return the number of them not seen before."""
+        pairs = np.unique(np.ravel_multi_index((presynaptic_indices, postsynaptic_indices),
+                                               self.shape))
+        if self.bits is None:
+            n_seen = self.pairs.size
+            self.pairs = np.union1d(self.pairs, pairs)
+            return self.pairs.size - n_seen
+        byte_indices = pairs >> 3
+        masks = (1 << (pairs & 7)).astype(np.uint8)
+        n_new = np.count_nonzero(self.bits[byte_indices] & masks == 0)
+        np.bitwise_or.at(self.bits, byte_indices, masks)
+        return n_new
+
+
+# maximum size of the distance matrix shared between projections built together
+SHARED_DISTANCE_MAP_MAX_SIZE = 10**7
+
+# the projections being built in subprocesses (see `build_projections()`)
+_subprocess_build_plan = []
+
+
+def build_projections(projections, processes=None):
+    """
+    Create the connections for a list of projections whose construction was
+    deferred (see `setup(deferred_build=True)`).
+
+    The projections are built in the order in which they were created, so
+    random numbers are drawn in the same order as without deferral, except for
+    those drawn by connector constructors (e.g. `FixedNumberPreConnector` with
+    a `RandomDistribution` for `n`), which all come first. Projections
+    between the same pair of populations, in the same space, share a single
+    evaluation of the distances between their neurons.
+
+    If `processes` is greater than 1, projections which do not share random
+    number generators with any other projection in the list (see
+    `_projection_rngs()`) are evaluated in a pool of that many processes, while
+    the others are built in the calling process; the connections are then
+    created in the calling process, and the random number generators are left
+    in their final state. Connectors which create connections directly in the
+    simulator are always run in the calling process.
+    """
+    projections = list(projections)
+    groups = defaultdict(list)
+    for projection in projections:
+        groups[(id(projection.pre), id(projection.post), id(projection.space))].append(projection)
+    for group in groups.values():
+        if len(group) > 1 and np.prod(group[0].shape) <= SHARED_DISTANCE_MAP_MAX_SIZE:
+            cache = {}
+            for projection in group:
+                projection._distance_map_cache = cache
+
+    executor = None
+    futures = {}
+    try:
+        if (processes or 1) > 1 and "fork" in multiprocessing.get_all_start_methods():
+            rngs = [_projection_rngs(projection) for projection in projections]
+            independent = _with_independent_rngs(rngs)
+            if independent and all(prj._simulator.state.num_processes == 1 for prj in projections):
+                _subprocess_build_plan[:] = projections
+                executor = ProcessPoolExecutor(max_workers=processes,
+                                               mp_context=multiprocessing.get_context("fork"))
+                futures = dict((i, executor.submit(_build_in_subprocess, i)) for i in independent)
+        for i, projection in enumerate(projections):
+            if i in futures:
+                try:
+                    connections, final_rngs = futures[i].result()
+                except NotImplementedError:
+                    projection._build()
+                else:
+                    for rng, final_rng in zip(rngs[i], final_rngs):
+                        rng.__dict__.update(final_rng.__dict__)
+                    projection._build(_RecordedConnections(connections))
+            else:
+                projection._build()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+        _subprocess_build_plan[:] = []
+        for projection in projections:
+            projection.__dict__.pop("_distance_map_cache", None)
+
+
+def _projection_rngs(projection):
+    """
+    Return the random number generators which may be used when building
+    `projection`, in a deterministic order: those of its connector, including
+    those inside the connector's parameters (e.g. the RNG of a
+    `RandomDistribution`), and those in the parameters of its synapse type.
+    """
+    rngs = []
+    _collect_rngs((projection._connector, projection.synapse_type), rngs, {})
+    return rngs
+
+
+def _collect_rngs(obj, rngs, visited):
+    if id(obj) in visited:
+        return
+    visited[id(obj)] = obj  # keep a reference, so the id is not reused
+    if isinstance(obj, (int, float, complex, str, bytes, np.number)):
+        return  # including IDs
+    if isinstance(obj, AbstractRNG):
+        rngs.append(obj)
+        return
+    if isinstance(obj, dict):
+        items = list(obj.values())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        items = list(obj)
+    elif isinstance(obj, np.ndarray) and obj.dtype.hasobject:
+        items = obj.ravel().tolist()
+    elif hasattr(obj, "_simulator"):
+        return  # populations and projections
+    elif hasattr(obj, "__dict__") and type(obj).__module__.split(".")[0] == "pyNN":
+        items = list(obj.__dict__.values())
+    else:
+        return
+    for item in items:
+        _collect_rngs(item, rngs, visited)
+
+
+def _with_independent_rngs(rngs):
+    """
+    Given the random number generators of each projection (see
+    `_projection_rngs()`), return the positions of those projections which do
+    not share a random number generator with any other projection.
+    """
+    users = defaultdict(set)
+    for i, projection_rngs in enumerate(rngs):
+        for rng in projection_rngs:
+            users[id(rng)].add(i)
+    return [i for i, projection_rngs in enumerate(rngs)
+            if all(users[id(rng)] == {i} for rng in projection_rngs)]
+
+
+def _build_in_subprocess(index):
+    """
+    Run the connector of a projection being built in a subprocess, recording
+    the connections instead of creating them. Returns the connections and the
+    projection's random number generators (see `_projection_rngs()`), in their
+    final state.
+    """
+    projection = _subprocess_build_plan[index]
+    rngs = _projection_rngs(projection)
+    connections = []
+
+    def connect_block(presynaptic_indices, postsynaptic_indices, **connection_parameters):
+        connections.append((np.asarray(presynaptic_indices), np.asarray(postsynaptic_indices),
+                            connection_parameters))
+
+    def convergent_connect(presynaptic_indices, postsynaptic_index, **connection_parameters):
+        presynaptic_indices = np.asarray(presynaptic_indices)
+        connections.append((presynaptic_indices,
+                            np.full(presynaptic_indices.shape, postsynaptic_index),
+                            connection_parameters))
+
+    def connect(*args, **kwargs):
+        raise NotImplementedError("Connections are created directly in the simulator")
+
+    recorder = copy(projection)
+    recorder._connect_block = connect_block
+    recorder._convergent_connect = convergent_connect
+    recorder._connect = connect
+    projection._connector.connect(recorder)
+    return connections, rngs
+
+
+class _RecordedConnections(object):
+    """Creates connections recorded by `_build_in_subprocess()`."""
+
+    def __init__(self, connections):
+        self.connections = connections
+
+    def connect(self, projection):
+        for presynaptic_indices, postsynaptic_indices, connection_parameters in self.connections:
+            projection._connect_block(presynaptic_indices, postsynaptic_indices,
+                                      **connection_parameters)
@@ -8,15 +8,25 @@ for improved performance.
 :license: CeCILL, see LICENSE for details.
 """
 
-from .random import RandomDistribution, AbstractRNG, NumpyRNG
+from .random import RandomDistribution, AbstractRNG, NumpyRNG, _hashed_uniform
 from .core import IndexBasedExpression
 from . import errors, descriptions
 from .recording import files
-from .parameters import LazyArray
+from .parameters import LazyArray, _contains_random_values
+from .space import CellList, Space
 from .standardmodels import StandardSynapseType
 import numpy as np
-from itertools import repeat
+from lazyarray import larray
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice, repeat
+import hashlib
 import logging
+import os
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
 from copy import copy, deepcopy
 
 # the following imports are for use within eval()
@@ -43,6 +53,40 @@ def _get_rng(rng):
         raise Exception("rng must be either None, or a subclass of pyNN.random.AbstractRNG")
 
 
+class _ColumnCachedDistances(object):
+    """
+    A function of pre- and post-synaptic indices, to be used as the base value
+    of a `LazyArray`, which returns the same distances as `distance_function`
+    but calculates each column of distances only once, when it is first needed.
+
+    It is shared, not copied, by the lazy arrays derived from it, so that the
+    columns it stores are shared by all the projections using it.
+    """
+
+    def __init__(self, distance_function, n_pre):
+        self.distance_function = distance_function
+        self.all_presynaptic_indices = np.arange(n_pre)
+        self.columns = {}
+
+    def column(self, j):
+        j = int(j)
+        if j not in self.columns:
+            self.columns[j] = self.distance_function(self.all_presynaptic_indices, j)
+        return self.columns[j]
+
+    def __call__(self, i, j):
+        if isinstance(j, (int, np.integer)):
+            return self.column(j)[i]
+        elif isinstance(j, np.ndarray) and j.ndim == 2:
+            # a block of columns, as for `LazyArray.evaluate()`
+            return np.column_stack([self.column(k)[i[:, 0]] for k in j[0, :]])
+        else:
+            return self.distance_function(i, j)
+
+    def __deepcopy__(self, memo):
+        return self
+
+
 class Connector(object):
     """
     Base class for connectors.
@@ -56,6 +100,10 @@ class Connector(object):
             connection routine. An example would be `progress_bar.set_level`.
     """
 
+    # whether the connections to a sample of the post-synaptic neurons can be
+    # generated on their own, for estimate()
+    _sample_columns = True
+
     def __init__(self, safe=True, callback=None):
         """
         docstring needed
@@ -74,11 +122,84 @@ class Connector(object):
             P[name] = getattr(self, name)
         return P
 
+    def _parameter_checks(self, projection, parameter_space):
+        """
+        Check the values of those synaptic parameters which are the same for all
+        connections, once and for all, and return a list of (native parameter name,
+        check function) for the other parameters, which are checked block by block
+        (see `_check_parameters()`).
+
+        Returns an empty list if the connector is not `safe`.
+        """
+        syn = projection.synapse_type
+        checks = []
+        if not self.safe:
+            return checks
+        # it might be cheaper to do the weight and delay check before evaluating the
+        # larray, however this is challenging to do if the base value is a function or
+        # if there are a lot of operations, so for simplicity we do the check after
+        # evaluation
+        for parameter_name, check in getattr(syn, "parameter_checks", {}).items():
+            native_parameter_name = syn.translations[parameter_name]["translated_name"]
+            # note that for delays we should also apply units scaling to the check
+            # values, since this currently only affects Brian we can probably
+            # handle that separately (for weights, checks are all based on zero)
+            if native_parameter_name in parameter_space.keys():
+                map = parameter_space[native_parameter_name]
+                if map.is_homogeneous:
+                    check(map.evaluate(simplify=True), projection)
+                else:
+                    checks.append((native_parameter_name, check))
+        return checks
+
+    def _check_parameters(self, projection, checks, connection_parameters,
+                          presynaptic_indices, column_indices):
+        """
+        Apply the `checks` from `_parameter_checks()` to the parameter values
+        for a block of connections.
+
+        If a check fails, the error gives the (pre, post) indices of the first
+        connection whose value makes the check fail, found by bisection, so that
+        checks on whole arrays (e.g. that all weights have the same sign) can
+        also be located.
+        """
+        for name, check in checks:
+            values = connection_parameters[name]
+            try:
+                check(values, projection)
+            except errors.ConnectionError as err:
+                if not (isinstance(values, np.ndarray) and values.shape == presynaptic_indices.shape):
+                    raise
+                lower, upper = 0, values.size - 1
+                while lower < upper:
+                    middle = (lower + upper) // 2
+                    try:
+                        check(values[:middle + 1], projection)
+                    except errors.ConnectionError:
+                        upper = middle
+                    else:
+                        lower = middle + 1
+                raise errors.ConnectionError(
+                    f"{err} (value {values[lower]} of '{name}' for the connection from "
+                    f"pre-synaptic index {presynaptic_indices[lower]} to post-synaptic "
+                    f"index {column_indices[lower]})"
+                ) from err
+
     def _generate_distance_map(self, projection):
         position_generators = (projection.pre.position_generator,
                                projection.post.position_generator)
-        return LazyArray(projection.space.distance_generator(*position_generators),
-                         shape=projection.shape)
+        distance_map = LazyArray(projection.space.distance_generator(*position_generators),
+                                 shape=projection.shape)
+        # when projections are built together (see `setup(deferred_build=True)`),
+        # those between the same populations, in the same space, share their distances,
+        # each column of which is only calculated when it is first needed
+        cache = getattr(projection, "_distance_map_cache", None)
+        if cache is not None:
+            if "distances" not in cache:
+                cache["distances"] = _ColumnCachedDistances(distance_map.base_value,
+                                                            projection.pre.size)
+            distance_map = LazyArray(cache["distances"], shape=projection.shape)
+        return distance_map
 
     def _parameters_from_synapse_type(self, projection, distance_map=None):
         """
@@ -111,6 +232,91 @@ class Connector(object):
                     parameter_space[name] = map(distance_map)
         return parameter_space
 
+    def estimate(self, presynaptic_population, postsynaptic_population, synapse_type=None,
+                 space=Space(), n_columns=100, num_processes=None):
+        """
+        Estimate how many connections this connector would create between the
+        two populations, how much memory they would need and how long the
+        connector would take, for each MPI process, without creating them.
+
+        The connector's own logic is applied, using copies of its random number
+        generators, to a random sample of `n_columns` post-synaptic neurons, and
+        the results are scaled up to the whole post-synaptic population. If there
+        are no more than `n_columns` post-synaptic neurons, or if the connections
+        to one post-synaptic neuron depend on those to the others (as for
+        :class:`FixedTotalNumberConnector`), all post-synaptic neurons are used,
+        and the numbers of connections are exact.
+
+        The post-synaptic neurons are assumed to be distributed over `num_processes`
+        MPI processes (by default, the number in the current simulation) by ID, in
+        round-robin fashion. The memory needed is based on a typical size of a
+        connection for the simulator, and the time covers only the work done by
+        the connector, not the creation of the connections by the simulator.
+
+        Returns a :class:`ConnectionEstimate`.
+        """
+        from .common import Assembly
+        if isinstance(postsynaptic_population, Assembly):
+            raise NotImplementedError("Connection estimates are not available for Assemblies")
+        simulator = postsynaptic_population._simulator
+        backend = sys.modules[simulator.__name__.rpartition(".")[0]]
+        if synapse_type is None:
+            synapse_type = backend.StaticSynapse()
+        if num_processes is None:
+            num_processes = simulator.state.num_processes
+        n_post = postsynaptic_population.size
+        columns = np.arange(n_post)
+        if self._sample_columns and n_post > n_columns:
+            # the sample itself is always the same, it is not part of the connector's randomness
+            columns = np.sort(np.random.RandomState(n_post).choice(n_post, n_columns,
+                                                                   replace=False))
+        # a calibration run with half the columns, to separate the time taken
+        # for each column from the time taken however many columns there are
+        dry_runs = [self._dry_run(presynaptic_population, postsynaptic_population, sample,
+                                  synapse_type, space)
+                    for sample in (columns[::2], columns)]
+        (_, time_half), (counts, time_all) = dry_runs
+        n_half = columns[::2].size
+        if columns.size > n_half:
+            time_per_column = max(time_all - time_half, 0.0) / (columns.size - n_half)
+        else:
+            time_per_column = time_all / columns.size
+        fixed_time = max(time_all - time_per_column * columns.size, 0.0)
+
+        owners = postsynaptic_population.all_cells.astype(int) % num_processes
+        columns_per_process = np.bincount(owners, minlength=num_processes)
+        exact = columns.size == n_post
+        if exact:
+            connections_per_process = np.bincount(owners, weights=counts,
+                                                  minlength=num_processes).astype(int)
+        else:
+            connections_per_process = counts[columns].mean() * columns_per_process
+        bytes_per_connection = backend.Projection._bytes_per_connection
+        return ConnectionEstimate(
+            connections_per_process,
+            connections_per_process * bytes_per_connection,
+            fixed_time + time_per_column * columns_per_process,
+            exact)
+
+    def _dry_run(self, presynaptic_population, postsynaptic_population, columns,
+                 synapse_type, space):
+        """
+        Run the connector for the post-synaptic neurons in `columns` only, without
+        creating any connections. Return the number of connections to each post-synaptic
+        neuron, and the time taken.
+        """
+        counter = _ConnectionCounter(presynaptic_population, postsynaptic_population, columns,
+                                     synapse_type, space, postsynaptic_population._simulator)
+        # don't disturb the state of this connector's random number generators
+        connector = copy(self)
+        connector.callback = None
+        for name, value in self.__dict__.items():
+            if isinstance(value, (AbstractRNG, RandomDistribution)):
+                setattr(connector, name, deepcopy(value))
+        start_time = time.perf_counter()
+        connector.connect(counter)
+        return counter.counts, time.perf_counter() - start_time
+
     def describe(self, template='connector_default.txt', engine='default'):
         """
         Returns a human-readable description of the connection method.
@@ -126,14 +332,110 @@ class Connector(object):
         return descriptions.render(engine, template, context)
 
 
+class ConnectionEstimate(object):
+    """
+    The numbers of connections, memory and time needed to connect two
+    populations, for each MPI process, as estimated by :meth:`Connector.estimate`.
+
+    Attributes:
+        `connections_per_process`:
+            the number of connections on each MPI process
+        `bytes_per_process`:
+            the approximate memory, in bytes, needed for those connections
+        `build_time_per_process`:
+            the time, in seconds, the connector is expected to take on each process
+        `exact`:
+            True if all the post-synaptic neurons were evaluated, so that the
+            numbers of connections are exact rather than extrapolated from a sample
+    """
+
+    def __init__(self, connections_per_process, bytes_per_process, build_time_per_process,
+                 exact):
+        self.connections_per_process = connections_per_process
+        self.bytes_per_process = bytes_per_process
+        self.build_time_per_process = build_time_per_process
+        self.exact = exact
+
+    def __repr__(self):
+        return "ConnectionEstimate(n_connections=%g, bytes=%g, build_time=%g s, exact=%s)" % (
+            self.n_connections, self.bytes_per_process.sum(),
+            self.build_time_per_process.max(), self.exact)
+
+    @property
+    def n_connections(self):
+        """The total number of connections."""
+        return self.connections_per_process.sum()
+
+
+class _ConnectionCounter(object):
+    """
+    Stands in for a Projection in :meth:`Connector.estimate`, counting the
+    connections to each post-synaptic neuron instead of creating them.
+
+    Only the post-synaptic neurons in `columns` are treated as local, and the
+    connector sees a simulation with a single MPI process.
+    """
+
+    def __init__(self, presynaptic_population, postsynaptic_population, columns,
+                 synapse_type, space, simulator):
+        from .common import PopulationView
+        local = np.zeros((postsynaptic_population.size,), dtype=bool)
+        local[columns] = True
+        self.post = copy(postsynaptic_population)
+        self.post._mask_local = local
+        if isinstance(self.post, PopulationView):
+            self.post.local_cells = self.post.all_cells[local]
+        if presynaptic_population is postsynaptic_population:
+            self.pre = self.post
+        else:
+            self.pre = presynaptic_population
+        self.shape = (self.pre.size, self.post.size)
+        self.synapse_type = synapse_type
+        self.space = space
+        self.source = None
+        self.receptor_type = None
+        self.label = "connection estimate"
+        self._simulator = SimpleNamespace(
+            __name__=simulator.__name__,
+            state=SimpleNamespace(mpi_rank=0, num_processes=1,
+                                  n_threads=getattr(simulator.state, "n_threads", 1)))
+        self.counts = np.zeros((self.post.size,), dtype=int)
+
+    def _connect_block(self, presynaptic_indices, postsynaptic_indices, **connection_parameters):
+        self.counts += np.bincount(np.asarray(postsynaptic_indices, dtype=int),
+                                   minlength=self.post.size)
+
+    def _convergent_connect(self, presynaptic_indices, postsynaptic_index,
+                            **connection_parameters):
+        self.counts[postsynaptic_index] += len(presynaptic_indices)
+
+    def _connect(self, rule_params, syn_params):
+        raise NotImplementedError(
+            "Connections created by the simulator itself cannot be estimated")
+
+
 class MapConnector(Connector):
     """
     Abstract base class for Connectors based on connection maps, where a map is a 2D lazy array
     containing either the (boolean) connectivity matrix (aka adjacency matrix, connection set
     mask, etc.) or the values of a synaptic connection parameter.
+
+    Connections are created in blocks of up to `column_block_size` post-synaptic neurons
+    (columns of the connection map) at a time, which can be changed on the class or on
+    an individual connector instance. Larger blocks reduce the Python overhead per
+    post-synaptic neuron at the cost of more memory for the temporary arrays.
+
+    The blocks may be evaluated in several threads (see `n_threads`, which by default
+    takes the value given to `setup()`). The connections are still created in order,
+    in the calling thread, and random numbers are drawn in the same order as with a
+    single thread, so the result does not depend on the number of threads. Functions
+    used in connection maps or synaptic parameters must then be thread-safe.
     """
+    column_block_size = 1000
+    n_threads = None
 
-    def _standard_connect(self, projection, connection_map_generator, distance_map=None):
+    def _standard_connect(self, projection, connection_map_generator, distance_map=None,
+                          connection_map=None):
         """
 
         `connection_map_generator` should be a function or other callable, with one optional
@@ -145,19 +447,27 @@ class MapConnector(Connector):
             (i) a boolean array, indicating which of the pre-synaptic neurons
                 should be connected to,
             (ii) an integer array indicating the same thing using indices,
-            (iii) or a single boolean, meaning connect to all/none.
+            (iii) a single boolean, meaning connect to all/none,
+            (iv) or a function with no arguments, returning one of the above.
 
         The `mask` argument, a boolean array, can be used to limit processing to just
         neurons which exist on the local MPI node.
 
         todo: explain the argument `distance_map`.
+
+        `connection_map`, if given, is the lazy array whose columns are produced by
+        `connection_map_generator` (see `_needs_all_columns()`).
+
+        The columns are grouped into blocks (see `column_block_size`). For each block, the
+        synaptic parameters are evaluated, checked and passed to the projection's
+        `_connect_block()` method in one go. With more than one thread, blocks are
+        evaluated concurrently (see `_connect_blocks_threaded()`).
         """
 
         column_indices = np.arange(projection.post.size)
         postsynaptic_indices = projection.post.id_to_index(projection.post.all_cells)
 
-        if (projection.synapse_type.native_parameters.parallel_safe
-                or hasattr(self, "rng") and self.rng.parallel_safe):
+        if self._needs_all_columns(projection, connection_map):
 
             # If any of the synapse parameters are based on parallel-safe random number generators,
             # we need to iterate over all post-synaptic cells, so we can generate then
@@ -178,17 +488,55 @@ class MapConnector(Connector):
                 connection_map_generator(mask))
 
         parameter_space = self._parameters_from_synapse_type(projection, distance_map)
+        checks = self._parameter_checks(projection, parameter_space)
+        blocks = self._column_blocks(components)
+        n_threads = self._get_n_threads(projection)
+        if n_threads > 1:
+            self._connect_blocks_threaded(projection, parameter_space, blocks, n_threads, checks)
+        else:
+            for block, n_local_columns in blocks:
+                block = self._select_sources(projection, block)
+                self._connect_block(projection, parameter_space, block, checks)
+                if self.callback:
+                    self.callback(n_local_columns / projection.post.local_size)
 
-        # Loop over columns of the connection_map array
-        # (equivalent to looping over post-synaptic neurons)
-        for count, (col, postsynaptic_index, local, source_mask) in enumerate(zip(*components)):
+    def _column_blocks(self, components):
+        """
+        Group the columns of the connection map into blocks of `column_block_size`.
+
+        Yields (block, number of local columns so far), where `block` is a list of
+        (column index, post-synaptic index, local, source mask) tuples.
+        """
+        block = []
+        n_columns = 0
+        n_local_columns = 0
+        for col, postsynaptic_index, local, source_mask in zip(*components):
             # `col`: column index
             # `postsynaptic_index`: index of the post-synaptic neuron
             # `local`: boolean - does the post-synaptic neuron exist on this MPI node
             # `source_mask`: boolean numpy array, indicating which of the pre-synaptic neurons
             #                should be connected to, or a single boolean, meaning connect to
             #                all/none of the pre-synaptic neurons.
-            #                It can also be an array of addresses.
+            #                It can also be an array of addresses, or a function with no
+            #                arguments returning any of these.
+            n_columns += 1
+            n_local_columns += bool(local)
+            block.append((col, postsynaptic_index, local, source_mask))
+            if n_columns % self.column_block_size == 0:
+                yield block, n_local_columns
+                block = []
+        if n_columns % self.column_block_size != 0:
+            yield block, n_local_columns
+
+    def _select_sources(self, projection, block):
+        """
+        Convert the source masks in a block of columns to arrays of pre-synaptic
+        indices, dropping those columns which have no connections.
+        """
+        selected = []
+        for col, postsynaptic_index, local, source_mask in block:
+            if callable(source_mask):
+                source_mask = source_mask()
             _proceed = False
             if source_mask is True or source_mask.any():
                 _proceed = True
@@ -204,37 +552,151 @@ class MapConnector(Connector):
                     source_mask = np.arange(projection.pre.size, dtype=int)
                 elif source_mask.dtype == bool:
                     source_mask = source_mask.nonzero()[0]
+                selected.append((col, postsynaptic_index, local, source_mask))
+        return selected
 
-                # Evaluate the lazy arrays containing the synaptic parameters
-                connection_parameters = {}
-                for name, map in parameter_space.items():
-                    if map.is_homogeneous:
-                        connection_parameters[name] = map.evaluate(simplify=True)
-                    else:
-                        connection_parameters[name] = map[source_mask, col]
-
-                # Check that parameter values are valid
-                if self.safe:
-                    # it might be cheaper to do the weight and delay check before evaluating the
-                    # larray, however this is challenging to do if the base value is a function or
-                    # if there are a lot of operations, so for simplicity we do the check after
-                    # evaluation
-                    syn = projection.synapse_type
-                    if hasattr(syn, "parameter_checks"):
-                        for parameter_name, check in syn.parameter_checks.items():
-                            native_parameter_name = syn.translations[parameter_name]["translated_name"]  # noqa:E501
-                            # note that for delays we should also apply units scaling to the check
-                            # values, since this currently only affects Brian we can probably
-                            # handle that separately (for weights, checks are all based on zero)
-                            if native_parameter_name in connection_parameters:
-                                check(connection_parameters[native_parameter_name], projection)
-
-                if local:
-                    # Connect the neurons
-                    projection._convergent_connect(
-                        source_mask, postsynaptic_index, **connection_parameters)
-                    if self.callback:
-                        self.callback(count / projection.post.local_size)
+    def _get_n_threads(self, projection):
+        """
+        The number of threads to use for evaluating the connection map, from
+        the connector's `n_threads` attribute if set, otherwise from `setup()`.
+        """
+        return self.n_threads or getattr(projection._simulator.state, "n_threads", 1) or 1
+
+    def _connect_blocks_threaded(self, projection, parameter_space, blocks, n_threads,
+                                 checks=()):
+        """
+        Evaluate blocks of columns in a pool of threads, and create the connections
+        for each block, in order, in the calling thread.
+
+        Random numbers are only ever drawn in the calling thread, in the same order
+        as with a single thread: those for the connection map when the block is
+        generated (see `LazyArray.by_column_deferred()`), those for the synaptic
+        parameters just before the block is connected. Synaptic parameters that do
+        not depend on random numbers are evaluated in the threads.
+        """
+        evaluate_parameters = not any(_contains_random_values(map)
+                                      for name, map in parameter_space.items())
+        # make sure the positions are generated once, before they are shared between threads
+        projection.pre.positions
+        projection.post.positions
+
+        def evaluate(block):
+            block = self._select_sources(projection, block)
+            if evaluate_parameters:
+                return block, self._evaluate_block(projection, parameter_space, block, checks)
+            return block, None
+
+        def connect_next():
+            future, n_local_columns = pending.popleft()
+            block, connections = future.result()
+            if connections is None:
+                connections = self._evaluate_block(projection, parameter_space, block, checks)
+            if connections is not None:
+                presynaptic_indices, postsynaptic_indices, connection_parameters = connections
+                projection._connect_block(presynaptic_indices, postsynaptic_indices,
+                                          **connection_parameters)
+            if self.callback:
+                self.callback(n_local_columns / projection.post.local_size)
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=n_threads) as executor:
+            for block, n_local_columns in blocks:
+                pending.append((executor.submit(evaluate, block), n_local_columns))
+                # limit the number of blocks held in memory at once
+                if len(pending) >= 2 * n_threads:
+                    connect_next()
+            while pending:
+                connect_next()
+
+    def _needs_all_columns(self, projection, connection_map=None):
+        """
+        Whether all columns of the connection map must be generated on every
+        MPI node, rather than only the local ones, because they draw from a
+        parallel-safe random number generator in sequence.
+
+        If the connection map is given as a lazy array, only the random numbers
+        it contains are considered, otherwise the connector's own RNG. Random
+        numbers from a counter-based RNG (see :class:`~pyNN.random.CounterRNG`)
+        can be generated for the local columns alone.
+        """
+        if projection.synapse_type.native_parameters.parallel_safe:
+            return True
+        if connection_map is not None:
+            random_map = connection_map.base_value
+            return (isinstance(random_map, RandomDistribution)
+                    and random_map.rng.parallel_safe
+                    and not random_map.rng.counter_based)
+        return hasattr(self, "rng") and self.rng.parallel_safe
+
+    def _connect_block(self, projection, parameter_space, block, checks=()):
+        """
+        Evaluate and check the synaptic parameters for a block of columns, then
+        create the connections for those columns which are local.
+
+        `block` is a list of (column index, post-synaptic index, local, source indices)
+        tuples, as produced by `_select_sources()`, and `checks` is a list of
+        parameter checks, as produced by `_parameter_checks()`.
+        """
+        connections = self._evaluate_block(projection, parameter_space, block, checks)
+        if connections is not None:
+            presynaptic_indices, postsynaptic_indices, connection_parameters = connections
+            projection._connect_block(presynaptic_indices, postsynaptic_indices,
+                                      **connection_parameters)
+
+    def _evaluate_block(self, projection, parameter_space, block, checks=()):
+        """
+        Evaluate and check the synaptic parameters for a block of columns.
+
+        Returns (pre-synaptic indices, post-synaptic indices, parameters) for the
+        connections of those columns which are local, or `None` if there are none.
+        """
+        if not block:
+            return None
+        columns, postsynaptic_indices, local, source_masks = zip(*block)
+        n_sources = [source_mask.size for source_mask in source_masks]
+        presynaptic_indices = np.hstack(source_masks).astype(int)
+        column_indices = np.repeat(columns, n_sources)
+        n = presynaptic_indices.size
+
+        # Evaluate the lazy arrays containing the synaptic parameters.
+        # Addressing a lazy array with two index arrays gives the values for
+        # the paired indices, i.e. element (presynaptic_indices[k], column_indices[k])
+        # for each k, with random numbers drawn in the same order as when
+        # evaluating one column at a time.
+        connection_parameters = {}
+        for name, map in parameter_space.items():
+            if map.is_homogeneous:
+                connection_parameters[name] = map.evaluate(simplify=True)
+            elif (isinstance(map.base_value, IndexBasedExpression)
+                  and not map.base_value.supports_blocks):
+                # index-based expressions are defined as functions of an array
+                # of pre-synaptic indices and a single post-synaptic index
+                connection_parameters[name] = np.hstack(
+                    [map[source_mask, col] for col, source_mask in zip(columns, source_masks)])
+            else:
+                value = map[presynaptic_indices, column_indices]
+                if not isinstance(value, np.ndarray) or value.ndim == 0:
+                    value = np.full((n,), value)
+                connection_parameters[name] = value
+
+        # Check that parameter values are valid (homogeneous values have
+        # already been checked, in `_parameter_checks()`)
+        if checks:
+            self._check_parameters(projection, checks, connection_parameters,
+                                   presynaptic_indices, column_indices)
+
+        # Connect the neurons, for those post-synaptic neurons that exist on this MPI node
+        postsynaptic_indices = np.repeat(postsynaptic_indices, n_sources)
+        if not all(local):
+            local_mask = np.repeat(local, n_sources)
+            presynaptic_indices = presynaptic_indices[local_mask]
+            postsynaptic_indices = postsynaptic_indices[local_mask]
+            for name, value in connection_parameters.items():
+                if isinstance(value, np.ndarray) and value.shape == (n,):
+                    connection_parameters[name] = value[local_mask]
+        if presynaptic_indices.size > 0:
+            return presynaptic_indices, postsynaptic_indices, connection_parameters
+        return None
 
     def _connect_with_map(self, projection, connection_map, distance_map=None):
         """
@@ -251,7 +713,29 @@ class MapConnector(Connector):
                 TODO
         """
         logger.debug("Connecting %s using a connection map" % projection.label)
-        self._standard_connect(projection, connection_map.by_column, distance_map)
+        if self._get_n_threads(projection) > 1:
+            connection_map_generator = connection_map.by_column_deferred
+        else:
+            connection_map_generator = connection_map.by_column
+        self._standard_connect(projection, connection_map_generator, distance_map, connection_map)
+
+    def _build_source_masks_from_pairs(self, sources, targets, n_targets):
+        """
+        Group (source, target) index pairs by target, in compressed sparse
+        column form, and return a function suitable for use as the
+        `connection_map_generator` argument of `_standard_connect()`.
+        Within each column, sources are in increasing order.
+        """
+        order = np.lexsort((sources, targets))
+        sources = sources[order]
+        indptr = np.hstack(([0], np.cumsum(np.bincount(targets, minlength=n_targets))))
+
+        def build_source_masks(mask=None):
+            column_indices = np.arange(n_targets)
+            if mask is not None:
+                column_indices = column_indices[mask]
+            return (sources[indptr[j]:indptr[j + 1]] for j in column_indices)
+        return build_source_masks
 
     def _get_connection_map_no_self_connections(self, projection):
         from pyNN.common import Population
@@ -330,11 +814,20 @@ class FixedProbabilityConnector(MapConnector):
             or only to other neurons in the Population.
         `rng`:
             an :class:`RNG` instance used to evaluate whether connections exist
+        `sparse`:
+            if True, rather than drawing a random number for every possible
+            connection, the gaps between successive connections are drawn from
+            a geometric distribution, so that the cost of connecting is
+            proportional to the number of connections created rather than to
+            the number of possible connections. This is much faster for
+            small values of `p_connect`. The resulting connectivity has the
+            same statistics, but is not identical to that obtained with
+            `sparse=False` for the same random number generator.
     """
-    parameter_names = ('allow_self_connections', 'p_connect')
+    parameter_names = ('allow_self_connections', 'p_connect', 'sparse')
 
     def __init__(self, p_connect, allow_self_connections=True,
-                 rng=None, safe=True, callback=None):
+                 rng=None, safe=True, callback=None, sparse=False):
         """
         Create a new connector.
         """
@@ -344,8 +837,14 @@ class FixedProbabilityConnector(MapConnector):
         self.p_connect = float(p_connect)
         assert 0 <= self.p_connect
         self.rng = _get_rng(rng)
+        self.sparse = sparse
 
     def connect(self, projection):
+        if self.sparse:
+            def connection_map_generator(mask=None):
+                return self._sample_sources_by_column(projection, mask)
+            self._standard_connect(projection, connection_map_generator)
+            return
         random_map = LazyArray(RandomDistribution('uniform', (0, 1), rng=self.rng),
                                projection.shape)
         connection_map = random_map < self.p_connect
@@ -357,6 +856,78 @@ class FixedProbabilityConnector(MapConnector):
             connection_map *= mask
         self._connect_with_map(projection, connection_map)
 
+    def _sample_sources_by_column(self, projection, mask=None):
+        """
+        For each post-synaptic neuron (or only those selected by `mask`), yield
+        an array containing the indices of the pre-synaptic neurons to connect to.
+
+        The possible connections for a block of columns are laid end to end,
+        in the same order as for the connection map (i.e. column by column),
+        and the connections made are found by geometric skip sampling: the
+        gap between one connection and the next is geometrically distributed
+        with parameter `p_connect`. Since the geometric distribution is
+        memoryless, sampling can start afresh for each block.
+        """
+        n_pre = projection.pre.size
+        columns = np.arange(projection.post.size)
+        if mask is not None:
+            columns = columns[mask]
+        # for each column, the candidate pre-synaptic neurons are
+        # `first_source + k` for k in range(n_candidates), skipping `excluded`
+        first_source = np.zeros_like(columns)
+        n_candidates = np.full(columns.shape, n_pre)
+        excluded = np.full(columns.shape, n_pre)
+        if self.allow_self_connections == 'NoMutual':
+            from pyNN.common import Population
+            if not (isinstance(projection.pre, Population)
+                    and isinstance(projection.post, Population)
+                    and projection.pre == projection.post):
+                raise NotImplementedError("todo")
+            first_source = columns + 1
+            n_candidates = n_pre - first_source
+        elif not self.allow_self_connections:
+            # find the position, if any, of each post-synaptic neuron in the pre-synaptic population
+            pre_ids = projection.pre.all_cells.astype(int)
+            post_ids = projection.post.all_cells[columns].astype(int)
+            sort_indices = np.argsort(pre_ids)
+            positions = np.searchsorted(pre_ids, post_ids, sorter=sort_indices)
+            positions = np.minimum(positions, n_pre - 1)
+            found = pre_ids[sort_indices[positions]] == post_ids
+            excluded[found] = sort_indices[positions[found]]
+            n_candidates = n_candidates - found
+
+        if self.p_connect < 1:
+            log_q = np.log1p(-self.p_connect)
+        block_size = self.column_block_size
+        for start in range(0, columns.size, block_size):
+            block = slice(start, start + block_size)
+            offsets = np.cumsum(n_candidates[block])
+            n_total = offsets[-1] if offsets.size > 0 else 0
+            if self.p_connect == 0 or n_total == 0:
+                positions = np.array([], dtype=int)
+            elif self.p_connect >= 1:
+                positions = np.arange(n_total)
+            else:
+                chunks = []
+                last = -1.0
+                while True:
+                    n_draws = int((n_total - last) * self.p_connect * 1.1) + 10
+                    u = self.rng.next(n_draws, 'uniform', {'low': 0.0, 'high': 1.0})
+                    gaps = np.floor(np.log1p(-u) / log_q) + 1
+                    candidate_positions = last + np.cumsum(gaps)
+                    inside = candidate_positions < n_total
+                    chunks.append(candidate_positions[inside])
+                    if not inside.all():
+                        break
+                    last = candidate_positions[-1]
+                positions = np.hstack(chunks).astype(int)
+            column_positions = np.searchsorted(offsets, positions, side='right')
+            sources = positions - (offsets - n_candidates[block])[column_positions]
+            sources += first_source[block][column_positions]
+            sources += sources >= excluded[block][column_positions]
+            for sources_for_column in np.split(sources, np.searchsorted(positions, offsets[:-1])):
+                yield sources_for_column
+
 
 class DistanceDependentProbabilityConnector(MapConnector):
     """
@@ -374,11 +945,24 @@ class DistanceDependentProbabilityConnector(MapConnector):
             or only to other neurons in the Population.
         `rng`:
             an :class:`RNG` instance used to evaluate whether connections exist
+        `max_distance`:
+            if given, the connection probability is taken to be zero for
+            neurons further apart than this distance, and only pairs of neurons
+            within this distance of each other are considered, using a spatial
+            index. This is much faster than considering all possible pairs when
+            `max_distance` is small compared to the size of the network.
+            If `max_distance` is "auto", it is determined by evaluating
+            `d_expression` at closely-spaced distances up to the largest
+            distance between any two neurons (this assumes that the
+            probability does not become non-zero again between the sample points).
+            Note that the random numbers are used differently with and without
+            `max_distance`, so the resulting connectivity is not identical.
     """
-    parameter_names = ('allow_self_connections', 'd_expression')
+    parameter_names = ('allow_self_connections', 'd_expression', 'max_distance')
+    n_support_samples = 10000
 
     def __init__(self, d_expression, allow_self_connections=True,
-                 rng=None, safe=True, callback=None):
+                 rng=None, safe=True, callback=None, max_distance=None):
         """
         Create a new connector.
         """
@@ -398,8 +982,19 @@ class DistanceDependentProbabilityConnector(MapConnector):
         self.allow_self_connections = allow_self_connections
         self.distance_function = eval("lambda d: %s" % self.d_expression)
         self.rng = _get_rng(rng)
+        assert max_distance is None or max_distance == "auto" or max_distance > 0
+        self.max_distance = max_distance
 
     def connect(self, projection):
+        if self.max_distance is not None:
+            max_distance = self.max_distance
+            if max_distance == "auto":
+                max_distance = self._find_support_radius(projection)
+            if max_distance > 0:
+                def connection_map_generator(mask=None):
+                    return self._sources_within(projection, max_distance, mask)
+                self._standard_connect(projection, connection_map_generator)
+            return
         distance_map = self._generate_distance_map(projection)
         probability_map = self.distance_function(distance_map)
         random_map = LazyArray(RandomDistribution('uniform', (0, 1), rng=self.rng),
@@ -413,6 +1008,66 @@ class DistanceDependentProbabilityConnector(MapConnector):
             connection_map *= mask
         self._connect_with_map(projection, connection_map, distance_map)
 
+    def _find_support_radius(self, projection):
+        """
+        Return the distance beyond which the connection probability is zero,
+        by evaluating the distance expression at closely-spaced sample points.
+        """
+        pre_positions = projection.pre.positions.T
+        post_positions = projection.post.positions.T
+        space = projection.space
+        # upper bound on the distance between any pre- and post-synaptic neurons
+        corners = np.vstack([pre_positions.min(axis=0), pre_positions.max(axis=0)])
+        scaled_post = space.scale_factor * (post_positions + space.offset)
+        corners = np.vstack([corners, scaled_post.min(axis=0), scaled_post.max(axis=0)])
+        extent = corners.max(axis=0) - corners.min(axis=0)
+        d_max = np.sqrt(np.sum(extent[space.axes]**2))
+        d = np.linspace(0, d_max, self.n_support_samples)
+        p = np.broadcast_to(self.distance_function(d), d.shape)
+        nonzero = np.flatnonzero(p > 0)
+        if nonzero.size == 0:
+            return 0.0
+        elif nonzero[-1] == d.size - 1:
+            return d_max
+        return d[nonzero[-1] + 1]
+
+    def _sources_within(self, projection, max_distance, mask=None):
+        """
+        For each post-synaptic neuron (or only those selected by `mask`), yield
+        an array containing the indices of the pre-synaptic neurons to connect to,
+        considering only those within `max_distance`.
+        """
+        from pyNN.common import Population
+        pre_positions = projection.pre.positions.T
+        post_positions = projection.post.positions.T
+        index = CellList(projection.space, pre_positions, max_distance)
+        columns = np.arange(projection.post.size)
+        if mask is not None:
+            columns = columns[mask]
+        exclude_self = not self.allow_self_connections
+        if self.allow_self_connections == 'NoMutual':
+            if not (isinstance(projection.pre, Population)
+                    and isinstance(projection.post, Population)
+                    and projection.pre == projection.post):
+                raise NotImplementedError("todo")
+        elif exclude_self:
+            pre_ids = projection.pre.all_cells.astype(int)
+            post_ids = projection.post.all_cells.astype(int)
+        for start in range(0, columns.size, self.column_block_size):
+            block_columns = columns[start:start + self.column_block_size]
+            i, j, d = index.pairs_within(post_positions[block_columns])
+            j = block_columns[j]
+            connected = self.rng.next(i.size, 'uniform', {'low': 0.0, 'high': 1.0}) \
+                < self.distance_function(d)
+            if self.allow_self_connections == 'NoMutual':
+                connected &= i > j
+            elif exclude_self:
+                connected &= pre_ids[i] != post_ids[j]
+            i, j = i[connected], j[connected]
+            boundaries = np.searchsorted(j, block_columns[1:])
+            for sources in np.split(i, boundaries):
+                yield sources
+
 
 class IndexBasedProbabilityConnector(MapConnector):
     """
@@ -452,17 +1107,52 @@ class IndexBasedProbabilityConnector(MapConnector):
         # function, which is probably unexpected behaviour.
         index_expression = copy(self.index_expression)
         index_expression.projection = projection
-        probability_map = LazyArray(index_expression, projection.shape)
         random_map = LazyArray(RandomDistribution('uniform', (0, 1), rng=self.rng),
                                projection.shape)
-        connection_map = random_map < probability_map
+        mask = None
         if not self.allow_self_connections:
             mask = self._get_connection_map_no_self_connections(projection)
-            connection_map *= mask
         elif self.allow_self_connections == 'NoMutual':
             mask = self._get_connection_map_no_mutual_connections(projection)
-            connection_map *= mask
-        self._connect_with_map(projection, connection_map)
+        if index_expression.supports_blocks:
+            def connection_map_generator(mask_local=None):
+                return self._sources_by_block(projection, index_expression, random_map,
+                                              mask, mask_local)
+            self._standard_connect(projection, connection_map_generator,
+                                   connection_map=random_map)
+        else:
+            probability_map = LazyArray(index_expression, projection.shape)
+            connection_map = random_map < probability_map
+            if mask is not None:
+                connection_map *= mask
+            self._connect_with_map(projection, connection_map)
+
+    def _sources_by_block(self, projection, index_expression, random_map, mask=None,
+                          mask_local=None):
+        """
+        For each post-synaptic neuron (or only those selected by `mask_local`), yield
+        a boolean array indicating which pre-synaptic neurons to connect to.
+
+        The probabilities are evaluated for blocks of columns at once, with a single
+        call to the index expression, while the random numbers are drawn column by
+        column, exactly as for the equivalent connection map.
+        """
+        n_pre, n_post = projection.shape
+        columns = np.arange(n_post)
+        if mask_local is not None:
+            columns = columns[mask_local]
+        random_columns = random_map.by_column(mask_local)
+        # limit the size of the probability array for one block
+        block_size = max(1, min(self.column_block_size, 2**20 // max(n_pre, 1)))
+        for start in range(0, columns.size, block_size):
+            block_columns = columns[start:start + block_size]
+            i, j = np.meshgrid(np.arange(n_pre), block_columns, indexing='ij')
+            probabilities = index_expression(i, j)
+            for k, col in enumerate(block_columns):
+                connected = next(random_columns) < probabilities[:, k]
+                if mask is not None:
+                    connected *= mask[:, col]
+                yield connected
 
 
 class DisplacementDependentProbabilityConnector(IndexBasedProbabilityConnector):
@@ -499,9 +1189,11 @@ class DisplacementDependentProbabilityConnector(IndexBasedProbabilityConnector):
             """
             self._disp_function = disp_function
 
+        supports_blocks = True
+
         def __call__(self, i, j):
-            disp = (self.projection.post.positions.T[j] - self.projection.pre.positions.T[i]).T
-            return self._disp_function(disp)
+            disp = self.post_positions[j] - self.pre_positions[i]
+            return self._disp_function(np.moveaxis(disp, -1, 0))
 
     def __init__(self, disp_function, allow_self_connections=True,
                  rng=None, safe=True, callback=None):
@@ -521,7 +1213,8 @@ class FromListConnector(Connector):
             (i.e. order in the Population, not the ID) of the presynaptic
             neuron, `post_idx` is the index of the postsynaptic neuron, and
             p1, p2, etc. are the synaptic parameters (e.g. weight, delay,
-            plasticity parameters).
+            plasticity parameters). A 2D array may be given instead, and is
+            used without being copied.
         `column_names`:
             the names of the parameters p1, p2, etc. If not provided, it is
             assumed the parameters are 'weight', 'delay' (for backwards
@@ -539,9 +1232,9 @@ class FromListConnector(Connector):
         Create a new connector.
         """
         Connector.__init__(self, safe=safe, callback=callback)
-        self.conn_list = np.array(conn_list)
-        if len(conn_list) > 0:
-            n_columns = self.conn_list.shape[1]
+        self.conn_list = conn_list
+        if len(self._indices) > 0:
+            n_columns = self._values.shape[1] + 2
             if column_names is None:
                 if n_columns == 2:
                     self.column_names = ()
@@ -557,49 +1250,75 @@ class FromListConnector(Connector):
         else:
             self.column_names = ()
 
+    @property
+    def conn_list(self):
+        """The connection list, as a 2D array."""
+        if self._conn_list is None:
+            return np.hstack((self._indices, self._values))
+        return self._conn_list
+
+    @conn_list.setter
+    def conn_list(self, conn_list):
+        if isinstance(conn_list, np.ndarray) or len(conn_list) == 0:
+            # an array is used as it is, without copying
+            self._conn_list = np.asarray(conn_list)
+            if self._conn_list.size == 0:
+                self._indices = np.zeros((0, 2), dtype=int)
+                self._values = np.zeros((0, 0))
+            else:
+                self._indices = self._conn_list[:, :2]
+                self._values = self._conn_list[:, 2:]
+        else:
+            # a list of tuples is converted column by column, so the index columns
+            # become integer arrays without a float64 copy of the whole list
+            self._conn_list = None
+            n = len(conn_list)
+            n_columns = len(conn_list[0])
+            self._indices = np.column_stack([
+                np.fromiter((row[col] for row in conn_list), dtype=int, count=n)
+                for col in range(2)])
+            self._values = np.empty((n, n_columns - 2))
+            for col in range(2, n_columns):
+                self._values[:, col - 2] = np.fromiter((row[col] for row in conn_list),
+                                                       dtype=float, count=n)
+
     def connect(self, projection):
         """Connect-up a Projection."""
-        logger.debug("conn_list (original) = \n%s", self.conn_list)
         synapse_parameter_names = projection.synapse_type.get_parameter_names()
         for name in self.column_names:
             if name not in synapse_parameter_names:
                 raise ValueError("%s is not a valid parameter for %s" % (
                                  name, projection.synapse_type.__class__.__name__))
-        if self.conn_list.size == 0:
+        if self._indices.shape[0] == 0:
             return
-        if np.any(self.conn_list[:, 0] >= projection.pre.size):
+        if np.any(self._indices[:, 0] >= projection.pre.size):
             raise errors.ConnectionError("source index out of range")
-        # need to do some profiling, to figure out the best way to do this:
-        #  - order of sorting/filtering by local
-        #  - use np.unique, or just do in1d(self.conn_list)?
-        idx = np.argsort(self.conn_list[:, 1])
-        targets = np.unique(self.conn_list[:, 1]).astype(int)
-        local = np.in1d(targets,
-                        np.arange(projection.post.size)[projection.post._mask_local],
-                        assume_unique=True)
-        local_targets = targets[local]
-        self.conn_list = self.conn_list[idx]
-        left = np.searchsorted(self.conn_list[:, 1], local_targets, 'left')
-        right = np.searchsorted(self.conn_list[:, 1], local_targets, 'right')
-        logger.debug("idx = %s", idx)
-        logger.debug("targets = %s", targets)
-        logger.debug("local_targets = %s", local_targets)
-        logger.debug("conn_list (sorted by target) = \n%s", self.conn_list)
-        logger.debug("left = %s", left)
-        logger.debug("right = %s", right)
-
-        for tgt, l, r in zip(local_targets, left, right):
-            sources = self.conn_list[l:r, 0].astype(int)
-            connection_parameters = deepcopy(projection.synapse_type.parameter_space)
-
-            connection_parameters.shape = (r - l,)
-            for col, name in enumerate(self.column_names, 2):
-                connection_parameters.update(**{name: self.conn_list[l:r, col]})
-            if isinstance(projection.synapse_type, StandardSynapseType):
-                connection_parameters = projection.synapse_type.translate(
-                    connection_parameters)
-            connection_parameters.evaluate()
-            projection._convergent_connect(sources, tgt, **connection_parameters)
+        # Sort the rows for local targets by target index. A stable sort keeps
+        # the connections to any given target in the order they were listed.
+        # Only the index arrays are converted to integers, not the whole list.
+        targets = self._indices[:, 1].astype(int, copy=False)
+        local = np.zeros(targets.shape, dtype=bool)
+        in_range = (targets >= 0) & (targets < projection.post.size)
+        local[in_range] = projection.post._mask_local[targets[in_range]]
+        rows = np.flatnonzero(local)
+        rows = rows[np.argsort(targets[rows], kind="stable")]
+        logger.debug("rows (sorted by target) = %s", rows)
+        if rows.size == 0:
+            return
+        sources = self._indices[rows, 0].astype(int, copy=False)
+        targets = targets[rows]
+
+        # Translate and evaluate the synaptic parameters for all local
+        # connections at once, rather than once per target.
+        connection_parameters = deepcopy(projection.synapse_type.parameter_space)
+        connection_parameters.shape = (rows.size,)
+        for col, name in enumerate(self.column_names):
+            connection_parameters.update(**{name: self._values[rows, col]})
+        if isinstance(projection.synapse_type, StandardSynapseType):
+            connection_parameters = projection.synapse_type.translate(
+                connection_parameters, copy=False)
+        connection_parameters.evaluate(simplify=True)
+        projection._connect_block(sources, targets, **connection_parameters)
 
 
 class FromFileConnector(FromListConnector):
@@ -617,6 +1336,11 @@ class FromFileConnector(FromListConnector):
 
             Note that the header requires `#` at the beginning of the line.
 
+            Filenames ending in ".npy" are read as binary `NumpyMemmapFile`s,
+            and ".h5" as `HDF5ArrayFile`s. These files are indexed by
+            post-synaptic neuron, so each MPI node reads only the connections
+            to its own neurons.
+
         `distributed`:
             if this is True, then each node will read connections from a file
             called `filename.x`, where `x` is the MPI rank. This speeds up
@@ -635,7 +1359,7 @@ class FromFileConnector(FromListConnector):
         """
         Connector.__init__(self, safe=safe, callback=callback)
         if isinstance(file, str):
-            file = files.StandardTextFile(file, mode='r')
+            file = files.get_file(file, mode='r')
         self.file = file
         self.distributed = distributed
 
@@ -644,11 +1368,12 @@ class FromFileConnector(FromListConnector):
         if self.distributed:
             self.file.rename("%s.%d" % (self.file.name,
                                         projection._simulator.state.mpi_rank))
-        self.column_names = self.file.get_metadata().get('columns', ('weight', 'delay'))
+        self.column_names = list(self.file.get_metadata().get('columns', ('weight', 'delay')))
         for ignore in "ij":
             if ignore in self.column_names:
                 self.column_names.remove(ignore)
-        self.conn_list = self.file.read()
+        local_targets = projection.post._mask_local.nonzero()[0]
+        self.conn_list = self.file.read_targets(local_targets)
         FromListConnector.connect(self, projection)
 
 
@@ -688,6 +1413,57 @@ class FixedNumberConnector(MapConnector):
             logger.debug("RNG2 exclude=%d redrawn=%s res=%s idx=%s" % (exclude, redrawn, res, idx))
         return res
 
+    def _draw_without_replacement(self, counts, size, exclude=None):
+        """
+        For each element `k` of the integer array `counts`, draw `counts[k]` integers
+        from `range(size)`, omitting `exclude[k]` if `exclude` is given.
+
+        Integers are drawn without replacement until all of them have been drawn,
+        then drawing starts again from the full set, i.e. if `counts[k]` is larger
+        than the number of candidates, every candidate is drawn at least once.
+
+        Returns two arrays, containing the index `k` and the value for each draw.
+        """
+        n_candidates = size if exclude is None else size - 1
+        if n_candidates < 1:
+            raise errors.ConnectionError("No neurons available to connect to.")
+        full_sets, remainders = np.divmod(counts, n_candidates)
+        # complete sets of candidates
+        n_full = full_sets * n_candidates
+        full_rows = np.repeat(np.arange(counts.size), n_full)
+        full_values = (np.arange(full_rows.size)
+                       - np.repeat(np.cumsum(n_full) - n_full, n_full)) % n_candidates
+        # the remainders are drawn at random, redrawing any repeated values.
+        # Where more than half of the candidates are needed, it is cheaper to draw
+        # those which are to be left out.
+        complement = remainders > n_candidates // 2
+        n_draws = np.where(complement, n_candidates - remainders, remainders)
+        rows = np.repeat(np.arange(counts.size), n_draws)
+        values = self.rng.next(rows.size, 'uniform_int', {"low": 0, "high": n_candidates},
+                               mask=None).astype(int)
+        while True:
+            keys = rows * n_candidates + values
+            order = np.argsort(keys, kind='stable')
+            repeated = order[1:][np.diff(keys[order]) == 0]
+            if repeated.size == 0:
+                break
+            values[repeated] = self.rng.next(repeated.size, 'uniform_int',
+                                             {"low": 0, "high": n_candidates},
+                                             mask=None).astype(int)
+        if complement.any():
+            complement_rows = np.flatnonzero(complement)
+            selected = np.ones((complement_rows.size, n_candidates), dtype=bool)
+            left_out = complement[rows]
+            selected[np.searchsorted(complement_rows, rows[left_out]), values[left_out]] = False
+            i, j = selected.nonzero()
+            rows = np.hstack((rows[~left_out], complement_rows[i]))
+            values = np.hstack((values[~left_out], j))
+        rows = np.hstack((full_rows, rows))
+        values = np.hstack((full_values, values))
+        if exclude is not None:
+            values += values >= exclude[rows]
+        return rows, values
+
 
 class FixedNumberPostConnector(FixedNumberConnector):
     """
@@ -728,44 +1504,34 @@ class FixedNumberPostConnector(FixedNumberConnector):
             are created.
     """
 
-    def _get_num_post(self):
+    def _get_num_post(self, size):
         if isinstance(self.n, int):
-            n_post = self.n
+            n_post = np.full((size,), self.n, dtype=int)
         else:
-            n_post = self.n.next()
+            n_post = np.asarray(self.n.next(size), dtype=int).reshape((size,))
         return n_post
 
     def connect(self, projection):
-        connections = [[] for i in range(projection.post.size)]
-        for source_index in range(projection.pre.size):
-            n = self._get_num_post()
-            if self.with_replacement:
-                if not self.allow_self_connections and projection.pre == projection.post:
-                    targets = self._rng_uniform_int_exclude(n, projection.post.size, source_index)
-                else:
-                    targets = self.rng.next(
-                        n, 'uniform_int', {"low": 0, "high": projection.post.size}, mask=None)
-            else:
-                all_cells = np.arange(projection.post.size)
-                if not self.allow_self_connections and projection.pre == projection.post:
-                    all_cells = all_cells[all_cells != source_index]
-                full_sets = n // all_cells.size
-                remainder = n % all_cells.size
-                target_sets = []
-                if full_sets > 0:
-                    target_sets = [all_cells] * full_sets
-                if remainder > 0:
-                    target_sets.append(self.rng.permutation(all_cells)[:remainder])
-                targets = np.hstack(target_sets)
-            assert targets.size == n
-            for target_index in targets:
-                connections[target_index].append(source_index)
-
-        def build_source_masks(mask=None):
-            if mask is None:
-                return [np.array(x) for x in connections]
+        n_post = self._get_num_post(projection.pre.size)
+        exclude_self = not self.allow_self_connections and projection.pre == projection.post
+        if self.with_replacement:
+            sources = np.repeat(np.arange(projection.pre.size), n_post)
+            if exclude_self:
+                # draw from the other neurons only, by skipping over the source index
+                targets = self.rng.next(sources.size, 'uniform_int',
+                                        {"low": 0, "high": projection.post.size - 1},
+                                        mask=None).astype(int)
+                targets += targets >= sources
             else:
-                return [np.array(x) for x in np.array(connections)[mask]]
+                targets = self.rng.next(sources.size, 'uniform_int',
+                                        {"low": 0, "high": projection.post.size},
+                                        mask=None).astype(int)
+        else:
+            sources, targets = self._draw_without_replacement(
+                n_post, projection.post.size,
+                exclude=np.arange(projection.pre.size) if exclude_self else None)
+        build_source_masks = self._build_source_masks_from_pairs(sources, targets,
+                                                                 projection.post.size)
         self._standard_connect(projection, build_source_masks)
 
 
@@ -908,10 +1674,15 @@ class OneToOneConnector(MapConnector):
         self._connect_with_map(projection, connection_map)
 
 
-class SmallWorldConnector(Connector):
+class SmallWorldConnector(MapConnector):
     """
     Connect cells so as to create a small-world network.
 
+    Each post-synaptic neuron is first connected to all the pre-synaptic
+    neurons closer than `degree`, forming a lattice. Then each of these
+    connections is, with probability `rewiring`, rewired to a pre-synaptic
+    neuron chosen at random from the whole population.
+
     Takes any of the standard :class:`Connector` optional arguments and, in
     addition:
 
@@ -924,10 +1695,17 @@ class SmallWorldConnector(Connector):
             flag determines whether a neuron is allowed to connect to itself,
             or only to other neurons in the Population.
         `n_connections`:
-            if specified, the number of efferent synaptic connections per neuron.
+            if specified, each post-synaptic neuron is connected in the
+            lattice only to its `n_connections` nearest pre-synaptic neurons
+            closer than `degree`.
         `rng`:
             an :class:`RNG` instance used to evaluate which connections
             are created.
+
+    The random numbers used for rewiring the connections to a given
+    post-synaptic neuron do not depend on those for other neurons, so each
+    MPI node only needs to generate the connections to its own neurons, even
+    when `rng` is parallel-safe.
     """
     parameter_names = ('allow_self_connections', 'degree', 'rewiring', 'n_connections')
 
@@ -939,6 +1717,7 @@ class SmallWorldConnector(Connector):
         Connector.__init__(self, safe, callback)
         assert 0 <= rewiring <= 1
         assert isinstance(allow_self_connections, bool) or allow_self_connections == 'NoMutual'
+        self.degree = degree
         self.rewiring = rewiring
         self.d_expression = "d < %g" % degree
         self.allow_self_connections = allow_self_connections
@@ -947,7 +1726,86 @@ class SmallWorldConnector(Connector):
 
     def connect(self, projection):
         """Connect-up a Projection."""
-        raise NotImplementedError
+        # a single draw from the RNG, the same on all nodes if the RNG is parallel-safe,
+        # is the key for the random numbers for all the columns
+        key = int(self.rng.next(1, 'uniform_int', {'low': 0, 'high': 2**62})[0])
+
+        def connection_map_generator(mask=None):
+            return self._small_world_sources(projection, key, mask)
+        self._standard_connect(projection, connection_map_generator)
+
+    def _needs_all_columns(self, projection, connection_map=None):
+        return projection.synapse_type.native_parameters.parallel_safe
+
+    def _small_world_sources(self, projection, key, mask=None):
+        """
+        For each post-synaptic neuron (or only those selected by `mask`), yield
+        an array containing the indices of the pre-synaptic neurons to connect to.
+        """
+        from pyNN.common import Population
+        pre_positions = projection.pre.positions.T
+        post_positions = projection.post.positions.T
+        index = CellList(projection.space, pre_positions, self.degree)
+        columns = np.arange(projection.post.size)
+        if mask is not None:
+            columns = columns[mask]
+        n_pre = projection.pre.size
+        no_mutual = self.allow_self_connections == 'NoMutual'
+        exclude_self = not self.allow_self_connections
+        if no_mutual:
+            if not (isinstance(projection.pre, Population)
+                    and isinstance(projection.post, Population)
+                    and projection.pre == projection.post):
+                raise NotImplementedError("todo")
+        elif exclude_self:
+            # index of each post-synaptic neuron in the pre-synaptic population, or -1
+            pre_ids = projection.pre.all_cells.astype(int)
+            post_ids = projection.post.all_cells.astype(int)
+            order = np.argsort(pre_ids)
+            pos = np.minimum(np.searchsorted(pre_ids, post_ids, sorter=order), n_pre - 1)
+            self_index = np.where(pre_ids[order[pos]] == post_ids, order[pos], -1)
+        for start in range(0, columns.size, self.column_block_size):
+            block_columns = columns[start:start + self.column_block_size]
+            i, j, d = index.pairs_within(post_positions[block_columns])
+            j = block_columns[j]
+            keep = d < self.degree
+            if no_mutual:
+                keep &= i > j
+            elif exclude_self:
+                keep &= i != self_index[j]
+            i, j, d = i[keep], j[keep], d[keep]
+            if self.n_connections is not None:
+                # keep the nearest neighbours, breaking ties by index
+                order = np.lexsort((i, d, j))
+                i, j = i[order], j[order]
+                keep = np.arange(j.size) - np.searchsorted(j, j) < self.n_connections
+                i, j = i[keep], j[keep]
+                order = np.lexsort((i, j))
+                i, j = i[order], j[order]
+            # rewiring, using random numbers that depend only on the column
+            # and on the position of the connection within the column
+            k = np.arange(j.size) - np.searchsorted(j, j)
+            rewire = _hashed_uniform(key, j, 2 * k) < self.rewiring
+            u = _hashed_uniform(key, j[rewire], 2 * k[rewire] + 1)
+            j_rewired = j[rewire]
+            if no_mutual:
+                n_choices = n_pre - j_rewired - 1
+                i[rewire] = j_rewired + 1 + (u * n_choices).astype(int)
+                keep = np.ones(j.size, dtype=bool)
+                keep[rewire] = n_choices > 0
+                i, j = i[keep], j[keep]
+            elif exclude_self:
+                has_self = self_index[j_rewired] >= 0
+                new_sources = (u * (n_pre - has_self)).astype(int)
+                new_sources += has_self & (new_sources >= self_index[j_rewired])
+                i[rewire] = new_sources
+            else:
+                i[rewire] = (u * n_pre).astype(int)
+            order = np.lexsort((i, j))
+            i, j = i[order], j[order]
+            boundaries = np.searchsorted(j, block_columns[1:])
+            for sources in np.split(i, boundaries):
+                yield sources
 
 
 class CSAConnector(MapConnector):
@@ -958,9 +1816,14 @@ class CSAConnector(MapConnector):
     addition:
 
         `cset`:
-            a connection set object.
+            a connection set object. For a connection set with arity 2, the
+            values are used as the weight and delay, in standard PyNN units.
+
+    The connection set is evaluated only for the post-synaptic neurons on the
+    local MPI node, in blocks of up to `element_block_size` connections.
     """
     parameter_names = ('cset',)
+    element_block_size = 100000
 
     if haveCSA:
         def __init__(self, cset, safe=True, callback=None):
@@ -976,32 +1839,77 @@ class CSAConnector(MapConnector):
 
     def connect(self, projection):
         """Connect-up a Projection."""
-        # Cut out finite part
-        c = csa.cross((0, projection.pre.size - 1), (0, projection.post.size - 1)) * \
-            self.cset  # can't we cut out just the columns we want?
-
+        if (csa.arity(self.cset) == 0
+                and projection.synapse_type.native_parameters.parallel_safe):
+            # all columns are needed, so that the random numbers for the
+            # synaptic parameters do not depend on the number of MPI processes
+            columns = np.arange(projection.post.size)
+        else:
+            columns = projection.post._mask_local.nonzero()[0]
+        connections = self._connection_list(projection, columns)
         if csa.arity(self.cset) == 2:
             # Connection-set with arity 2
-            for (i, j, weight, delay) in c:
-                projection._convergent_connect(
-                    [projection.pre[i]], projection.post[j], weight, delay)
+            FromListConnector(connections, column_names=('weight', 'delay'),
+                              safe=self.safe).connect(projection)
         elif csa.arity(self.cset) == 0:
-            # inefficient implementation as a starting point
-            connection_map = np.zeros((projection.pre.size, projection.post.size), dtype=bool)
-            for addr in c:
-                connection_map[addr] = True
-            self._connect_with_map(projection, LazyArray(connection_map))
+            sources = connections[:, 0].astype(int)
+            targets = connections[:, 1].astype(int)
+            build_source_masks = self._build_source_masks_from_pairs(sources, targets,
+                                                                     projection.post.size)
+            self._standard_connect(projection, build_source_masks)
         else:
             raise NotImplementedError
 
+    def _connection_list(self, projection, columns):
+        """
+        Return the elements of the connection set for the given post-synaptic
+        indices as an array, with one row per connection.
+
+        Only the columns of the connection set that are needed are cut out,
+        as a set of intervals, and the elements are read from the connection
+        set iterator in blocks.
+        """
+        n_columns = 2 + csa.arity(self.cset)
+        if columns.size == 0:
+            return np.zeros((0, n_columns))
+        boundaries = np.flatnonzero(np.diff(columns) != 1) + 1
+        intervals = [(int(interval[0]), int(interval[-1]))
+                     for interval in np.split(columns, boundaries)]
+        c = csa.cross((0, projection.pre.size - 1), intervals) * self.cset
+        elements = iter(c)
+        blocks = []
+        while True:
+            block = np.array(list(islice(elements, self.element_block_size)), dtype=float)
+            if block.size == 0:
+                break
+            blocks.append(block)
+        if blocks:
+            return np.vstack(blocks)
+        else:
+            return np.zeros((0, n_columns))
+
 
 class CloneConnector(MapConnector):
     """
     Connects cells with the same connectivity pattern as a previous projection.
+
+    Arguments:
+        `reference_projection`:
+            the projection to clone the connectivity pattern from.
+        `reuse_parameters`:
+            if True, the synaptic parameter values (weights, delays, etc.) of
+            the reference projection are also used for the new projection,
+            for those parameters that both synapse types have. Otherwise,
+            they are taken from the synapse type of the new projection.
+        `safe`:
+            if True, check that weights and delays have valid values. If False,
+            this check is skipped.
+        `callback`:
+            if True, display a progress bar on the terminal.
     """
-    parameter_names = ('reference_projection',)
+    parameter_names = ('reference_projection', 'reuse_parameters')
 
-    def __init__(self, reference_projection, safe=True, callback=None):
+    def __init__(self, reference_projection, reuse_parameters=False, safe=True, callback=None):
         """
         Create a new CloneConnector.
 
@@ -1009,6 +1917,7 @@ class CloneConnector(MapConnector):
         """
         MapConnector.__init__(self, safe, callback=callback)
         self.reference_projection = reference_projection
+        self.reuse_parameters = reuse_parameters
 
     def connect(self, projection):
         if (projection.pre != self.reference_projection.pre or
@@ -1019,9 +1928,34 @@ class CloneConnector(MapConnector):
                     self.reference_projection.pre,
                     self.reference_projection.post,
                     projection.pre, projection.post))
-        connection_map = LazyArray(~np.isnan(self.reference_projection.get(['weight'], 'array',
-                                                                           gather='all')[0]))
-        self._connect_with_map(projection, connection_map)
+        if self.reuse_parameters:
+            reference_names = self.reference_projection.synapse_type.get_parameter_names()
+            column_names = [name for name in projection.synapse_type.get_parameter_names()
+                            if name in reference_names]
+        else:
+            column_names = ['weight']
+        # The connections to local targets are sufficient, unless random values of
+        # the synaptic parameters must be the same for any number of MPI processes.
+        # In either case we fetch a list, including multiple connections between
+        # the same pair of neurons, never a dense array.
+        if (not self.reuse_parameters
+                and projection.synapse_type.native_parameters.parallel_safe):
+            gather = 'all'
+        else:
+            gather = False
+        connections = np.array(
+            self.reference_projection.get(column_names, format='list', gather=gather,
+                                          with_address=True),
+            dtype=float).reshape((-1, len(column_names) + 2))
+        if self.reuse_parameters:
+            FromListConnector(connections, column_names=column_names,
+                              safe=self.safe).connect(projection)
+        else:
+            sources = connections[:, 0].astype(int)
+            targets = connections[:, 1].astype(int)
+            build_source_masks = self._build_source_masks_from_pairs(sources, targets,
+                                                                     projection.post.size)
+            self._standard_connect(projection, build_source_masks)
 
 
 class ArrayConnector(MapConnector):
@@ -1044,8 +1978,79 @@ class ArrayConnector(MapConnector):
         self._connect_with_map(projection, connection_map)
 
 
+class SparseMatrixConnector(Connector):
+    """
+    Make connections according to a sparse matrix of weights, with shape (m, n)
+    where m is the size of the presynaptic population and n that of the
+    postsynaptic population.
+
+    Each element stored in the matrix (including explicitly stored zeros) gives
+    a connection, so the matrix is never converted to a dense array.
+
+    Arguments:
+        `weights`:
+            a `scipy.sparse` matrix (e.g. in CSR format) of synaptic weights.
+        `delays`:
+            an optional `scipy.sparse` matrix of synaptic delays, with the same
+            elements stored as `weights`. If not given, the delays are taken
+            from the synapse type.
+        `safe`:
+            if True, check that weights and delays have valid values. If False,
+            this check is skipped.
+        `callback`:
+            if True, display a progress bar on the terminal.
+    """
+    parameter_names = ('weights', 'delays')
+
+    def __init__(self, weights, delays=None, safe=True, callback=None):
+        """
+        Create a new connector.
+        """
+        Connector.__init__(self, safe=safe, callback=callback)
+        self.weights = weights
+        self.delays = delays
+        # column-oriented copies, from which the connections to a given set
+        # of post-synaptic neurons can be extracted without densifying
+        self._weights = weights.tocsc()
+        if delays is not None:
+            self._delays = delays.tocsc()
+            if not (self._delays.shape == self._weights.shape
+                    and np.array_equal(self._delays.indptr, self._weights.indptr)
+                    and np.array_equal(self._delays.indices, self._weights.indices)):
+                raise errors.ConnectionError(
+                    "The weight and delay matrices must contain the same elements")
+
+    def connect(self, projection):
+        """Connect-up a Projection."""
+        if self._weights.shape != projection.shape:
+            raise errors.ConnectionError(
+                f"Weight matrix has shape {self._weights.shape}, "
+                f"but the projection has shape {projection.shape}")
+        # select the stored elements in columns for local post-synaptic neurons
+        n_per_column = np.diff(self._weights.indptr)
+        local = np.repeat(projection.post._mask_local, n_per_column)
+        sources = self._weights.indices[local].astype(int)
+        targets = np.repeat(np.arange(projection.post.size), n_per_column)[local]
+        if sources.size > 0:
+            connection_parameters = deepcopy(projection.synapse_type.parameter_space)
+            connection_parameters.shape = (sources.size,)
+            connection_parameters.update(weight=self._weights.data[local])
+            if self.delays is not None:
+                connection_parameters.update(delay=self._delays.data[local])
+            if isinstance(projection.synapse_type, StandardSynapseType):
+                connection_parameters = projection.synapse_type.translate(
+                    connection_parameters, copy=False)
+            checks = self._parameter_checks(projection, connection_parameters)
+            connection_parameters.evaluate(simplify=True)
+            self._check_parameters(projection, checks, connection_parameters, sources, targets)
+            projection._connect_block(sources, targets, **connection_parameters)
+        if self.callback:
+            self.callback(1.0)
+
+
 class FixedTotalNumberConnector(FixedNumberConnector):
     parameter_names = ('allow_self_connections', 'n')
+    _sample_columns = False
 
     def __init__(self, n, allow_self_connections=True, with_replacement=True,
                  rng=None, safe=True, callback=None):
@@ -1068,44 +2073,302 @@ class FixedTotalNumberConnector(FixedNumberConnector):
         self.rng = _get_rng(rng)
 
     def connect(self, projection):
-        # This implementation is not "parallel safe" for random numbers.
-        # todo: support the `parallel_safe` flag.
-
-        # Determine number of processes and current rank
-        rank = projection._simulator.state.mpi_rank
-        num_processes = projection._simulator.state.num_processes
-
-        # Assume that targets are equally distributed over processes
-        targets_per_process = int(len(projection.post) / num_processes)
-
-        # Calculate the number of synapses on each process
-        bino = RandomDistribution('binomial',
-                                  [self.n, targets_per_process / len(projection.post)],
-                                  rng=self.rng)
-        num_conns_on_vp = np.zeros(num_processes, dtype=int)
-        sum_dist = 0
-        sum_partitions = 0
-        for k in range(num_processes):
-            p_local = targets_per_process / (len(projection.post) - sum_dist)
-            bino.parameters['p'] = p_local
-            bino.parameters['n'] = self.n - sum_partitions
-            num_conns_on_vp[k] = bino.next()
-            sum_dist += targets_per_process
-            sum_partitions += num_conns_on_vp[k]
+        exclude_self = not self.allow_self_connections and projection.pre == projection.post
+        if self.rng.parallel_safe:
+            # All MPI nodes draw all the connections, then keep those whose
+            # targets are local (see _standard_connect), so the result does not
+            # depend on the number of processes.
+            n_connections = self.n
+            possible_targets = np.arange(projection.post.size)
+        else:
+            # Determine number of processes and current rank
+            rank = projection._simulator.state.mpi_rank
+            num_processes = projection._simulator.state.num_processes
+
+            # Assume that targets are equally distributed over processes
+            targets_per_process = int(len(projection.post) / num_processes)
+
+            # Calculate the number of synapses on each process
+            bino = RandomDistribution('binomial',
+                                      [self.n, targets_per_process / len(projection.post)],
+                                      rng=self.rng)
+            num_conns_on_vp = np.zeros(num_processes, dtype=int)
+            sum_dist = 0
+            sum_partitions = 0
+            for k in range(num_processes):
+                p_local = targets_per_process / (len(projection.post) - sum_dist)
+                bino.parameters['p'] = p_local
+                bino.parameters['n'] = self.n - sum_partitions
+                num_conns_on_vp[k] = bino.next()
+                sum_dist += targets_per_process
+                sum_partitions += num_conns_on_vp[k]
+            n_connections = num_conns_on_vp[rank]
+            possible_targets = np.arange(projection.post.size)[projection.post._mask_local]
 
         # Draw random sources and targets
-        connections = [[] for i in range(projection.post.size)]
-        possible_targets = np.arange(projection.post.size)[projection.post._mask_local]
-        for i in range(num_conns_on_vp[rank]):
-            source_index = self.rng.next(1, 'uniform_int',
-                                         {"low": 0, "high": projection.pre.size},
-                                         mask=None)[0]
-            target_index = self.rng.choice(possible_targets, size=1)[0]
-            connections[target_index].append(source_index)
-
-        def build_source_masks(mask=None):
-            if mask is None:
-                return [np.array(x) for x in connections]
-            else:
-                return [np.array(x) for x in np.array(connections)[mask]]
+        targets = possible_targets[
+            self.rng.next(n_connections, 'uniform_int',
+                          {"low": 0, "high": possible_targets.size}, mask=None).astype(int)]
+        if exclude_self:
+            # draw from the other neurons only, by skipping over the target index
+            sources = self.rng.next(n_connections, 'uniform_int',
+                                    {"low": 0, "high": projection.pre.size - 1},
+                                    mask=None).astype(int)
+            sources += sources >= targets
+        else:
+            sources = self.rng.next(n_connections, 'uniform_int',
+                                    {"low": 0, "high": projection.pre.size},
+                                    mask=None).astype(int)
+        build_source_masks = self._build_source_masks_from_pairs(sources, targets,
+                                                                 projection.post.size)
         self._standard_connect(projection, build_source_masks)
+
+
+class _Uncacheable(Exception):
+    pass
+
+
+def _hash_update(h, obj, _active=None, rngs=None):
+    """
+    Update the hash object `h` with the contents of `obj`. Raises
+    `_Uncacheable` for objects whose contents cannot be determined reliably.
+
+    If `rngs` is a list, the random number generators found in `obj` are
+    appended to it, each once, in the order in which they are found.
+    """
+    if _active is None:
+        _active = set()
+    if id(obj) in _active:
+        raise _Uncacheable("circular reference")
+    obj_id = id(obj)
+    h.update(type(obj).__qualname__.encode())
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, np.number)):
+        h.update(repr(obj).encode())
+        return
+    if isinstance(obj, bytes):
+        h.update(obj)
+        return
+    if isinstance(obj, np.ndarray):
+        h.update(str((obj.dtype, obj.shape)).encode())
+        if obj.dtype.hasobject:
+            obj = obj.tolist()
+        else:
+            h.update(np.ascontiguousarray(obj).tobytes())
+            return
+    if isinstance(obj, AbstractRNG):
+        if type(obj) is not NumpyRNG or obj.seed is None:
+            raise _Uncacheable("random number generator %s" % obj)
+        if rngs is not None and not any(rng is obj for rng in rngs):
+            rngs.append(obj)
+        obj = (obj.seed, obj.parallel_safe, obj.rng.get_state())
+    elif isinstance(obj, larray):
+        obj = (obj.base_value, obj.operations, obj.dtype)
+    elif hasattr(obj, "_simulator"):
+        # populations and projections: their state is not captured by their attributes
+        raise _Uncacheable(repr(obj))
+    elif hasattr(obj, "__code__"):
+        code = obj.__code__
+        closure = [cell.cell_contents for cell in (obj.__closure__ or ())]
+        obj = (obj.__qualname__, code.co_code, code.co_consts, code.co_names, closure)
+    elif callable(obj) and hasattr(obj, "__qualname__"):  # built-in functions
+        obj = (getattr(obj, "__module__", None), obj.__qualname__)
+    elif isinstance(obj, np.ufunc) or type(obj).__name__ == "module":
+        obj = obj.__name__
+    elif isinstance(obj, dict):
+        obj = sorted(obj.items(), key=lambda item: str(item[0]))
+    elif isinstance(obj, (set, frozenset)):
+        obj = sorted(obj, key=repr)
+    elif hasattr(obj, "__dict__") and type(obj).__module__.split(".")[0] == "pyNN":
+        obj = sorted(obj.__dict__.items())
+    elif not isinstance(obj, (list, tuple)):
+        raise _Uncacheable("object of type %s" % type(obj).__name__)
+    _active.add(obj_id)
+    if isinstance(obj, (list, tuple)):
+        h.update(b"(%d" % len(obj))
+        for item in obj:
+            _hash_update(h, item, _active, rngs)
+        h.update(b")")
+    else:
+        _hash_update(h, obj, _active, rngs)
+    _active.discard(obj_id)
+
+
+class ConnectionCache(object):
+    """
+    An on-disk cache of the connections created by connectors, used by
+    :class:`CachedConnector`.
+
+    Arguments:
+        `directory`:
+            the directory in which the cache files are stored. Each MPI node
+            uses its own sub-directory. Defaults to "~/.cache/pyNN/connections".
+        `max_size`:
+            the maximum total size of the cache files for each MPI node, in
+            bytes. When this is exceeded, the least recently used entries are
+            deleted.
+    """
+    # part of every key, so that entries written in an older format are not used
+    format_version = 2
+
+    def __init__(self, directory=None, max_size=2**30):
+        if directory is None:
+            directory = os.path.join("~", ".cache", "pyNN", "connections")
+        self.directory = os.path.expanduser(directory)
+        self.max_size = max_size
+
+    def __repr__(self):
+        return "ConnectionCache(directory=%r, max_size=%r)" % (self.directory, self.max_size)
+
+    def _rank_directory(self, projection):
+        state = projection._simulator.state
+        return os.path.join(self.directory,
+                            "rank%d_of_%d" % (state.mpi_rank, state.num_processes))
+
+    def key(self, connector, projection, rngs=None):
+        """
+        Return a key identifying the connections that `connector` would create
+        for `projection`, or None if they cannot be identified reliably, e.g.
+        if the random number generator was not given a seed.
+
+        If `rngs` is a list, the random number generators whose state is part
+        of the key (those of the connector, including any inside its
+        parameters, and those of the synapse type) are appended to it.
+        """
+        state = projection._simulator.state
+        connector_attributes = dict((name, value) for name, value in connector.__dict__.items()
+                                    if name != "callback")
+        populations = []
+        for population in (projection.pre, projection.post):
+            populations.append((population.size, population.positions, population._mask_local))
+        h = hashlib.sha1()
+        found_rngs = []
+        try:
+            _hash_update(h, (
+                self.format_version,
+                type(connector).__module__, type(connector).__qualname__, connector_attributes,
+                projection._simulator.__name__, state.mpi_rank, state.num_processes,
+                populations, projection.space, projection.source, projection.receptor_type,
+                type(projection.synapse_type).__qualname__,
+                list(projection.synapse_type.parameter_space.items())
+            ), rngs=found_rngs)
+        except _Uncacheable as err:
+            logger.info("Connections from %s cannot be cached: %s", connector, err)
+            return None
+        if rngs is not None:
+            rngs.extend(found_rngs)
+        return h.hexdigest()
+
+    def load(self, key, projection):
+        """
+        Return the cached connection list, column names and the list of random
+        number generator states for `key`, or None if there is no entry for this key.
+        """
+        path = os.path.join(self._rank_directory(projection), key + ".npz")
+        try:
+            with np.load(path) as entry:
+                data = dict((name, entry[name]) for name in entry.files)
+        except (OSError, ValueError):
+            return None
+        os.utime(path)  # mark as recently used
+        rng_states = []
+        if "rng_keys" in data:
+            for keys, pos, has_gauss, cached_gaussian in zip(
+                    data["rng_keys"], data["rng_pos"], data["rng_has_gauss"],
+                    data["rng_cached_gaussian"]):
+                rng_states.append(("MT19937", keys, int(pos), int(has_gauss),
+                                   float(cached_gaussian)))
+        return data["connections"], list(data["columns"]), rng_states
+
+    def save(self, key, projection, connections, column_names, rng_states=()):
+        """
+        Store a connection list in the cache, then delete the least recently
+        used entries if the cache has grown larger than `max_size`.
+        """
+        directory = self._rank_directory(projection)
+        os.makedirs(directory, exist_ok=True)
+        data = {"connections": connections, "columns": np.array(column_names, dtype=str)}
+        if rng_states:
+            data.update(rng_keys=np.array([state[1] for state in rng_states]),
+                        rng_pos=np.array([state[2] for state in rng_states]),
+                        rng_has_gauss=np.array([state[3] for state in rng_states]),
+                        rng_cached_gaussian=np.array([state[4] for state in rng_states]))
+        # write to a temporary file first, so other processes never see a partial entry
+        with tempfile.NamedTemporaryFile(dir=directory, suffix=".tmp", delete=False) as fp:
+            np.savez(fp, **data)
+        os.replace(fp.name, os.path.join(directory, key + ".npz"))
+        self._evict(directory)
+
+    def _evict(self, directory):
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.name.endswith(".npz"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        entries.sort()
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total_size -= size
+
+
+class CachedConnector(Connector):
+    """
+    Wrap another connector, storing the connections it creates in an on-disk
+    cache. If the same connector, with the same parameters and random number
+    generator seed and state, is later used to connect populations with the
+    same sizes and positions, using the same space and synapse type, the
+    connections are read from the cache rather than generated again.
+
+    Connectors with random number generators without a seed, or parameters
+    whose values cannot be determined (e.g. other projections), are never
+    cached.
+
+    Arguments:
+        `connector`:
+            the connector whose connections should be cached.
+        `cache`:
+            a :class:`ConnectionCache`. If not given, a cache in the default
+            directory is used.
+    """
+    parameter_names = ('connector', 'cache')
+
+    def __init__(self, connector, cache=None, safe=True, callback=None):
+        """
+        Create a new connector.
+        """
+        Connector.__init__(self, safe=safe, callback=callback)
+        assert isinstance(connector, Connector)
+        self.connector = connector
+        self.cache = cache or ConnectionCache()
+
+    def estimate(self, *args, **kwargs):
+        return self.connector.estimate(*args, **kwargs)
+    estimate.__doc__ = Connector.estimate.__doc__
+
+    def connect(self, projection):
+        """Connect-up a Projection."""
+        rngs = []
+        key = self.cache.key(self.connector, projection, rngs)
+        entry = key and self.cache.load(key, projection)
+        if entry:
+            logger.debug("Reading connections for %s from the cache", projection.label)
+            connections, column_names, rng_states = entry
+            # leave the RNGs in the same state as if the connections had been generated
+            for rng, rng_state in zip(rngs, rng_states):
+                rng.rng.set_state(rng_state)
+            if connections.size > 0:
+                FromListConnector(connections, column_names, safe=False).connect(projection)
+        else:
+            self.connector.connect(projection)
+            if key:
+                column_names = projection.synapse_type.get_parameter_names()
+                connections = np.array(
+                    projection.get(column_names, format='list', gather=False, with_address=True),
+                    dtype=float).reshape((-1, len(column_names) + 2))
+                rng_states = [rng.rng.get_state() for rng in rngs]
+                self.cache.save(key, projection, connections, column_names, rng_states)
@@ -83,7 +83,13 @@ class IndexBasedExpression(object):
     """
     Abstract base class for general expressions that use the cell indices and projection class to
     determine their value instead of just the the distance between the cells
+
+    By default, `__call__(i, j)` is given an array of pre-synaptic indices `i` and a
+    single post-synaptic index `j`. Sub-classes which set `supports_blocks` to True
+    accept instead arrays `i` and `j` of the same shape, and return the value for each
+    pair (i[k], j[k]), so that whole blocks of columns can be evaluated in one call.
     """
+    supports_blocks = False
 
     @property
     def projection(self):
@@ -95,6 +101,27 @@ class IndexBasedExpression(object):
     @projection.setter
     def projection(self, projection):
         self._projection = projection
+        self._positions = {}
+
+    def _cached_positions(self, name):
+        # positions of a PopulationView or Assembly are rebuilt each time they are
+        # accessed, so we keep a contiguous (N, 3) copy for each projection
+        if not hasattr(self, "_positions"):
+            self._positions = {}
+        if name not in self._positions:
+            population = getattr(self.projection, name)
+            self._positions[name] = np.ascontiguousarray(population.positions.T)
+        return self._positions[name]
+
+    @property
+    def pre_positions(self):
+        """Positions of the pre-synaptic neurons, as an (N, 3) array."""
+        return self._cached_positions("pre")
+
+    @property
+    def post_positions(self):
+        """Positions of the post-synaptic neurons, as an (N, 3) array."""
+        return self._cached_positions("post")
 
     def __call__(self, i, j):
         raise NotImplementedError
@@ -12,7 +12,7 @@ really running simulations.
 from .. import errors, random, space                            # noqa: F401
 from ..network import Network                                   # noqa: F401
 from ..space import Space                                       # noqa: F401
-from ..random import NumpyRNG, GSLRNG, RandomDistribution       # noqa: F401
+from ..random import NumpyRNG, GSLRNG, CounterRNG, RandomDistribution       # noqa: F401
 from ..connectors import *                                      # noqa: F403, F401
 from ..recording import *                                       # noqa: F403, F401
 from ..standardmodels import StandardCellType
@@ -22,6 +22,7 @@ from .projections import Projection                             # noqa: F401
 from .control import (                                          # noqa: F401
     setup,
     end,
+    build,
     run,
     run_until,
     run_for,
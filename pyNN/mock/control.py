@@ -15,6 +15,10 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
     simulator.state.max_delay = max_delay
     simulator.state.mpi_rank = extra_params.get('rank', 0)
     simulator.state.num_processes = extra_params.get('num_processes', 1)
+    simulator.state.n_threads = extra_params.get('n_threads', 1)
+    simulator.state.deferred_build = extra_params.get('deferred_build', False)
+    simulator.state.build_processes = extra_params.get('build_processes', None)
+    simulator.state.build_plan = []
     return rank()
 
 
@@ -28,6 +32,7 @@ def end(compatible_output=True):
 
 
 run, run_until = common.build_run(simulator)
+build = common.build_build(simulator)
 run_for = run
 
 reset = common.build_reset(simulator)
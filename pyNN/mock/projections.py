@@ -1,6 +1,6 @@
 from itertools import repeat
 from .. import common
-from ..core import ezip
+from ..core import ezip, is_listlike
 from ..space import Space
 from . import simulator
 
@@ -26,6 +26,7 @@ class Connection(common.Connection):
 class Projection(common.Projection):
     __doc__ = common.Projection.__doc__
     _simulator = simulator
+    _bytes_per_connection = 400
 
     def __init__(self, presynaptic_population, postsynaptic_population,
                  connector, synapse_type, source=None, receptor_type=None,
@@ -36,13 +37,17 @@ class Projection(common.Projection):
 
         #  Create connections
         self.connections = []
-        connector.connect(self)
+        self._build_or_defer()
 
     def __len__(self):
         return len(self.connections)
 
-    def set(self, **attributes):
-        raise NotImplementedError
+    def _set_attributes(self, parameter_space):
+        parameter_space.evaluate()
+        for name, value in parameter_space.items():
+            for connection in self.connections:
+                setattr(connection, name,
+                        value[connection.presynaptic_index, connection.postsynaptic_index])
 
     def _convergent_connect(self, presynaptic_indices, postsynaptic_index,
                             **connection_parameters):
@@ -54,3 +59,15 @@ class Projection(common.Projection):
             self.connections.append(
                 Connection(pre_idx, postsynaptic_index, **other_attributes)
             )
+
+    def _connect_block(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        for name, value in connection_parameters.items():
+            if not is_listlike(value):
+                connection_parameters[name] = repeat(value)
+        for pre_idx, post_idx, *other in zip(presynaptic_indices, postsynaptic_indices,
+                                             *connection_parameters.values()):
+            other_attributes = dict(zip(connection_parameters.keys(), other))
+            self.connections.append(
+                Connection(pre_idx, post_idx, **other_attributes)
+            )
@@ -15,7 +15,7 @@ from .. import errors, random, space                                # noqa: F401
 from ..network import Network                                       # noqa: F401
 from ..space import Space                                           # noqa: F401
 from ..standardmodels import StandardCellType
-from ..random import NumpyRNG, GSLRNG, RandomDistribution           # noqa: F401
+from ..random import NumpyRNG, GSLRNG, CounterRNG, RandomDistribution           # noqa: F401
 from .cells import NativeCellType, native_cell_type                 # noqa: F401
 from .electrodes import NativeElectrodeType, native_electrode_type  # noqa: F401
 from .synapses import NativeSynapseType, native_synapse_type        # noqa: F401
@@ -31,6 +31,7 @@ from .projections import Projection                                 # noqa: F401
 from .control import (                                              # noqa: F401
     setup,
     end,
+    build,
     run,
     run_until,
     run_for,
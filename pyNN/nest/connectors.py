@@ -31,7 +31,10 @@ from ..connectors import (                      # noqa: F401
     FromFileConnector,
     CloneConnector,
     ArrayConnector,
+    SparseMatrixConnector,
     FixedTotalNumberConnector,
+    CachedConnector,
+    ConnectionCache,
     CSAConnector as DefaultCSAConnector)
 from .random import NativeRNG
 
@@ -78,9 +81,8 @@ class CSAConnector(DefaultCSAConnector):
             nest.CGConnect(presynaptic_cells, postsynaptic_cells, self.cset,
                            model=projection.nest_synapse_model)
 
-        # reset the caching of the connection list, since this will have to be recalculated
-        projection._connections = None
-        projection._sources.extend(presynaptic_cells)
+        projection._sources.update(presynaptic_cells.tolist())
+        projection._connections_changed()
 
 
 class NESTConnectorMixin(object):
@@ -57,6 +57,10 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY,
             setattr(simulator.state, key, extra_params[key])
     # set kernel RNG seeds
     simulator.state.num_threads = extra_params.get('threads') or 1
+    simulator.state.n_threads = extra_params.get('n_threads', 1)
+    simulator.state.deferred_build = extra_params.get('deferred_build', False)
+    simulator.state.build_processes = extra_params.get('build_processes', None)
+    simulator.state.build_plan = []
     if 'grng_seed' in extra_params:
         warnings.warn("The setup argument 'grng_seed' is now 'rng_seed'")
         simulator.state.rng_seed = extra_params['grng_seed']
@@ -95,6 +99,7 @@ def end():
 
 
 run, run_until = common.build_run(simulator)
+build = common.build_build(simulator)
 run_for = run
 
 reset = common.build_reset(simulator)
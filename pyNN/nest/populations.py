@@ -269,7 +269,11 @@ class Population(common.Population, PopulationMixin):
     def _set_initial_value_array(self, variable, value):
         if hasattr(self.celltype, "variable_map"):
             variable = self.celltype.variable_map[variable]
-        if isinstance(value.base_value, RandomDistribution) and value.base_value.rng.parallel_safe:
+        if (
+            isinstance(value.base_value, RandomDistribution)
+            and value.base_value.rng.parallel_safe
+            and not value.base_value.rng.counter_based
+        ):
             local_values = value.evaluate()[self._mask_local]
         else:
             local_values = value._partially_evaluate(self._mask_local, simplify=True)
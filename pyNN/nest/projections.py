@@ -53,10 +53,43 @@ def split_array_to_avoid_repeats(arr, **associated_arrays):
     return sub_arrays, sub_associated
 
 
+def merge_connection_blocks(blocks):
+    """
+    Concatenate blocks of (presynaptic indices, postsynaptic indices, connection
+    parameters), as passed to `Projection._connect_block()`, into a single block.
+
+    Parameters which have the same scalar value in every block remain scalars,
+    all others are expanded to one value per connection.
+    """
+    presynaptic_indices = np.concatenate([block[0] for block in blocks])
+    postsynaptic_indices = np.concatenate([block[1] for block in blocks])
+    connection_parameters = {}
+    for name in blocks[0][2]:
+        values = [block[2][name] for block in blocks]
+        if all(np.isscalar(value) and value == values[0] for value in values):
+            connection_parameters[name] = values[0]
+            continue
+        arrays = []
+        for value, block in zip(values, blocks):
+            if isinstance(value, np.ndarray):
+                arrays.append(value)
+            elif np.isscalar(value):
+                arrays.append(np.full(block[0].shape, value))
+            else:
+                array = np.empty(block[0].shape, dtype=object)
+                array[:] = [value] * block[0].size
+                arrays.append(array)
+        connection_parameters[name] = np.concatenate(arrays)
+    return presynaptic_indices, postsynaptic_indices, connection_parameters
+
+
 class Projection(common.Projection):
     __doc__ = common.Projection.__doc__
     _simulator = simulator
     _static_synapse_class = StaticSynapse
+    _bytes_per_connection = 48
+    # maximum number of connections collected by _connect_block() before they are created
+    _max_pending_connections = 10**7
 
     def __init__(self, presynaptic_population, postsynaptic_population,
                  connector, synapse_type=None, source=None, receptor_type=None,
@@ -68,13 +101,19 @@ class Projection(common.Projection):
         self.nest_synapse_label = Projection._nProj
         self.synapse_type._set_tau_minus(self.post.local_node_collection)
         self._sources = set()
+        # number of local connections, and a cache of the SynapseCollection
+        # which is rebuilt only when this projection's connections change
+        self._n_connections = 0
+        self._generation = 0
         self._connections = None
+        self._connections_key = None
+        self._pending_blocks = None
         # This is used to keep track of common synapse properties
         self._common_synapse_properties = {}
         self._common_synapse_property_names = None
 
         # Create connections
-        connector.connect(self)
+        self._build_or_defer()
 
     def __getitem__(self, i):
         """Return the `i`th connection on the local MPI node."""
@@ -91,16 +130,12 @@ class Projection(common.Projection):
 
     def __len__(self):
         """Return the number of connections on the local MPI node."""
-        nest_model = self.post.celltype.nest_name[self._simulator.state.spike_precision]
-        local_nodes = nest.GetNodes({"model": nest_model}, local_only=True)
-        local_connections = nest.GetConnections(target=local_nodes,
-                                                synapse_model=self.nest_synapse_model,
-                                                synapse_label=self.nest_synapse_label)
-        return len(local_connections)
+        return self._n_connections
 
     @property
     def nest_connections(self):
-        if self._connections is None or self._simulator.state.stale_connection_cache:
+        key = (self._generation, self._simulator.state.connection_epoch)
+        if self._connections is None or self._connections_key != key:
             if len(self._sources) > 0:
                 self._connections = nest.GetConnections(
                     nest.NodeCollection(sorted(self._sources)),
@@ -108,9 +143,24 @@ class Projection(common.Projection):
                     synapse_label=self.nest_synapse_label)
             else:
                 self._connections = []
-            self._simulator.state.stale_connection_cache = False
+            self._connections_key = key
         return self._connections
 
+    def _connections_changed(self, n_new=None):
+        """
+        Record that connections have been added to this projection.
+
+        `n_new` - the number of new local connections. If not given, the
+                  connections are counted by querying NEST.
+        """
+        self._generation += 1
+        self._connections = None
+        self._simulator.state.stale_connection_cache = True
+        if n_new is None:
+            self._n_connections = len(self.nest_connections)
+        else:
+            self._n_connections += n_new
+
     @property
     def connections(self):
         """
@@ -138,11 +188,12 @@ class Projection(common.Projection):
         nest.Connect(self.pre.node_collection,
                      self.post.node_collection,
                      rule_params, syn_params)
-        self._simulator.state.stale_connection_cache = True
         self._sources.update(
             nest.GetConnections(synapse_model=self.nest_synapse_model,
                                 synapse_label=self.nest_synapse_label).sources()
         )
+        # the number of connections created by a probabilistic rule is not known in advance
+        self._connections_changed()
 
     def _identify_common_synapse_properties(self):
         """
@@ -326,9 +377,162 @@ class Projection(common.Projection):
                 )
                 raise errors.ConnectionError(err_msg)
 
-        # Reset the caching of the connection list, since this will have to be recalculated
-        self._connections = None
-        self._simulator.state.stale_connection_cache = True
+        self._connections_changed(presynaptic_indices.size)
+
+    def _build(self, connector=None):
+        # collect the blocks of connections produced by the connector, so they
+        # can be created with as few calls to nest.Connect() as possible
+        self._pending_blocks = []
+        self._n_pending = 0
+        try:
+            super()._build(connector)
+            self._connect_pending_blocks()
+        finally:
+            self._pending_blocks = None
+
+    def _connect_block(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        Connect a block of neurons.
+
+        `presynaptic_indices` - 1D array of presynaptic indices
+        `postsynaptic_indices` - 1D array of postsynaptic indices, of the same length
+        `connection_parameters` - dict whose keys are native NEST parameter names.
+                                  Values may be scalars or arrays.
+
+        While a connector is running (see `_build()`), blocks are collected and
+        then created together, so that a connector normally results in a single
+        call to nest.Connect() (see `_max_pending_connections`).
+        """
+        if presynaptic_indices.size == 0:
+            return
+        if self._pending_blocks is None:
+            self._connect_arrays(presynaptic_indices, postsynaptic_indices,
+                                 **connection_parameters)
+        else:
+            self._pending_blocks.append(
+                (presynaptic_indices, postsynaptic_indices, connection_parameters))
+            self._n_pending += presynaptic_indices.size
+            if self._n_pending >= self._max_pending_connections:
+                self._connect_pending_blocks()
+
+    def _connect_pending_blocks(self):
+        """Create the connections collected by `_connect_block()`."""
+        if self._pending_blocks:
+            blocks = self._pending_blocks
+            self._pending_blocks = []
+            self._n_pending = 0
+            presynaptic_indices, postsynaptic_indices, connection_parameters = \
+                merge_connection_blocks(blocks)
+            self._connect_arrays(presynaptic_indices, postsynaptic_indices,
+                                 **connection_parameters)
+
+    def _connect_arrays(self, presynaptic_indices, postsynaptic_indices,
+                        **connection_parameters):
+        """
+        Create connections using NEST's array-based "one_to_one" rule, which
+        accepts repeated node IDs, so there is no need to split the arrays.
+
+        Arguments are as for `_connect_block()`. There is a single call to
+        nest.Connect() for a Population, and one per component for an Assembly,
+        since receptor types may differ between the components.
+        """
+        if self._common_synapse_property_names is None:
+            # we need an existing connection to find out which synapse
+            # parameters are common, so the first column is created separately
+            different = np.flatnonzero(postsynaptic_indices != postsynaptic_indices[0])
+            n_first = different[0] if different.size > 0 else postsynaptic_indices.size
+            first_column_parameters = {}
+            for name, value in connection_parameters.items():
+                if isinstance(value, np.ndarray):
+                    first_column_parameters[name] = value[:n_first]
+                    connection_parameters[name] = value[n_first:]
+                else:
+                    first_column_parameters[name] = value
+            self._convergent_connect(presynaptic_indices[:n_first], postsynaptic_indices[0],
+                                     **first_column_parameters)
+            presynaptic_indices = presynaptic_indices[n_first:]
+            postsynaptic_indices = postsynaptic_indices[n_first:]
+            if presynaptic_indices.size == 0:
+                return
+
+        # Clean the connection parameters by removing parameters that are
+        # used by PyNN but should not be passed to NEST
+        connection_parameters.pop('tau_minus', None)
+        connection_parameters.pop('dendritic_delay_fraction', None)
+        connection_parameters.pop('w_min_always_zero_in_NEST', None)
+
+        n = presynaptic_indices.size
+        syn_dict = {
+            'synapse_model': self.nest_synapse_model,
+            'synapse_label': self.nest_synapse_label,
+        }
+
+        # Weights require some special handling (see _convergent_connect())
+        if self.receptor_type == 'inhibitory' and self.post.conductance_based:
+            connection_parameters['weight'] = -1 * connection_parameters['weight']
+            if "stdp" in self.nest_synapse_model:
+                connection_parameters["Wmax"] = -1 * connection_parameters["Wmax"]
+        if hasattr(self.post, "celltype") and hasattr(self.post.celltype, "receptor_scale"):
+            connection_parameters['weight'] = (connection_parameters['weight']
+                                               * self.post.celltype.receptor_scale)
+
+        # With array-based connection, all local parameters must be arrays with
+        # one value per connection
+        for name, value in connection_parameters.items():
+            if name in self._common_synapse_property_names:
+                self._set_common_synapse_property(name, value)
+            else:
+                value = make_sli_compatible(value)
+                if isinstance(value, np.ndarray):
+                    syn_dict[name] = value.astype(float)
+                else:
+                    syn_dict[name] = np.full((n,), value, dtype=float)
+
+        presynaptic_cells = self.pre.all_cells[presynaptic_indices].astype(int)
+        postsynaptic_cells = self.post.all_cells[postsynaptic_indices].astype(int)
+
+        if isinstance(self.post, common.Assembly):
+            offsets = np.cumsum([0] + [p.size for p in self.post.populations])
+            groups = []
+            for population, start, stop in zip(self.post.populations, offsets[:-1], offsets[1:]):
+                mask = (postsynaptic_indices >= start) & (postsynaptic_indices < stop)
+                if mask.any():
+                    groups.append((population, mask, postsynaptic_indices[mask] - start))
+        else:
+            groups = [(self.post, slice(None), postsynaptic_indices)]
+
+        for post, mask, indices in groups:
+            group_syn_dict = {name: value[mask] if isinstance(value, np.ndarray) else value
+                              for name, value in syn_dict.items()}
+            if not post.celltype.standard_receptor_type:
+                group_syn_dict["receptor_type"] = post.celltype.get_receptor_type(
+                    self.receptor_type)
+            # For Tsodyks-Markram synapses models we set the "tau_psc" parameter to match
+            # the relevant "tau_syn" parameter from the post-synaptic neurons.
+            elif 'tsodyks' in self.nest_synapse_model:
+                translations = post.celltype.translations
+                if self.receptor_type == 'inhibitory':
+                    param_name = translations['tau_syn_I']['translated_name']
+                elif self.receptor_type == 'excitatory':
+                    param_name = translations['tau_syn_E']['translated_name']
+                else:
+                    raise NotImplementedError()
+                targets = np.unique(indices)
+                tau_syn = np.array(nest.GetStatus(post.node_collection[targets], param_name))
+                group_syn_dict["tau_psc"] = tau_syn[np.searchsorted(targets, indices)]
+            try:
+                nest.Connect(presynaptic_cells[mask], postsynaptic_cells[mask],
+                             'one_to_one', group_syn_dict)
+            except nest.NESTError as err:
+                err_msg = (
+                    f"{err}. presynaptic_cells={presynaptic_cells[mask]}, "
+                    f"postsynaptic_cells={postsynaptic_cells[mask]}, "
+                    f"synapse model='{self.nest_synapse_model}'"
+                )
+                raise errors.ConnectionError(err_msg)
+        self._sources.update(presynaptic_cells.tolist())
+        self._connections_changed(n)
 
     def _set_attributes(self, parameter_space):
         if (
@@ -337,41 +541,63 @@ class Projection(common.Projection):
         ):
             raise ValueError("tau_minus cannot be heterogeneous "
                              "within a single Projection with NEST.")
-        # only columns for connections that exist on this machine
-        parameter_space.evaluate(mask=(slice(None), self.post._mask_local))
-        sources = nest.NodeCollection(sorted(self._sources))
+        connections = self.nest_connections
+        if len(connections) == 0:
+            return
         if self._common_synapse_property_names is None:
             self._identify_common_synapse_properties()
-        for postsynaptic_cell, connection_parameters in zip(self.post.local_cells,
-                                                            parameter_space.columns()):
-            connections = nest.GetConnections(source=sources,
-                                              target=postsynaptic_cell.node_collection,
-                                              synapse_model=self.nest_synapse_model,
-                                              synapse_label=self.nest_synapse_label)
-            if connections:
-                source_mask = self.pre.id_to_index(list(connections.sources()))
-                for name, value in connection_parameters.items():
-                    if (
-                        name == "weight"
-                        and self.receptor_type == 'inhibitory'
-                        and self.post.conductance_based
-                    ):
-                        # NEST uses negative values for inhibitory weights,
-                        # even if these are conductances
-                        value *= -1
-                    if name == "tau_minus":  # set on the post-synaptic cell
-                        nest.SetStatus(self.post.node_collection[self.post.node_collection.local],
-                                       {"tau_minus": simplify(value)})
-                    elif name not in self._common_synapse_property_names:
-                        value = make_sli_compatible(value)
-                        if len(source_mask) > 1:
-                            nest.SetStatus(connections, name, value[source_mask])
-                        elif isinstance(value, np.ndarray):  # OneToOneConnector
-                            nest.SetStatus(connections, name, value[source_mask])
-                        else:
-                            nest.SetStatus(connections, name, value)
-                    else:
-                        self._set_common_synapse_property(name, value)
+        # (pre, post) indices of the local connections, in the order used by NEST
+        addresses = connections.get(["source", "target"])
+        presynaptic_indices = self.pre.id_to_index(
+            np.atleast_1d(np.array(addresses["source"], dtype=int)))
+        postsynaptic_indices = self.post.id_to_index(
+            np.atleast_1d(np.array(addresses["target"], dtype=int)))
+        for name, map in parameter_space.items():
+            value = self._evaluate_at_connections(map, presynaptic_indices, postsynaptic_indices)
+            if (
+                name == "weight"
+                and self.receptor_type == 'inhibitory'
+                and self.post.conductance_based
+            ):
+                # NEST uses negative values for inhibitory weights,
+                # even if these are conductances
+                value = -1 * value
+            if name == "tau_minus":  # set on the post-synaptic cell
+                nest.SetStatus(self.post.node_collection[self.post.node_collection.local],
+                               {"tau_minus": simplify(value)})
+            elif name not in self._common_synapse_property_names:
+                value = make_sli_compatible(value)
+                if isinstance(value, np.ndarray):
+                    connections.set({name: value.tolist()})
+                else:
+                    connections.set({name: value})
+            else:
+                self._set_common_synapse_property(name, value)
+
+    def _set_attributes_by_connection(self, connection_parameters, connection_indices=None):
+        connections = self.nest_connections
+        if len(connections) == 0:
+            return
+        if self._common_synapse_property_names is None:
+            self._identify_common_synapse_properties()
+        for name, value in connection_parameters.items():
+            if name == "tau_minus" or name in self._common_synapse_property_names:
+                raise ValueError(f"{name} cannot be set for individual connections "
+                                 "within a single Projection with NEST.")
+            if (
+                name == "weight"
+                and self.receptor_type == 'inhibitory'
+                and self.post.conductance_based
+            ):
+                # NEST uses negative values for inhibitory weights,
+                # even if these are conductances
+                value = -value
+            if connection_indices is not None:
+                # with a single connection, NEST returns a scalar rather than a list
+                all_values = np.atleast_1d(np.array(connections.get(name), dtype=float))
+                all_values[connection_indices] = value
+                value = all_values
+            connections.set({name: value.tolist()})
 
     def _set_common_synapse_property(self, name, value):
         """
@@ -436,6 +662,22 @@ class Projection(common.Projection):
     #        file.close()
 
     def _get_attributes_as_list(self, names):
+        columns = self._get_attributes_as_columns(names)
+        return list(zip(*(np.asarray(columns[name], dtype=float).tolist() for name in names)))
+
+    def _get_attributes_as_columns(self, names):
+        return self._get_connection_columns(self.nest_connections, names)
+
+    def _get_attributes_as_column_chunks(self, names, chunk_size):
+        connections = self.nest_connections
+        for start in range(0, len(connections), chunk_size):
+            yield self._get_connection_columns(connections[start:start + chunk_size], names)
+
+    def _get_connection_columns(self, connections, names):
+        """
+        Return a dict containing a 1D array of the values of each of the
+        attributes in `names` for the given NEST connections.
+        """
         nest_names = []
         for name in names:
             if name == 'presynaptic_index':
@@ -444,52 +686,28 @@ class Projection(common.Projection):
                 nest_names.append('target')
             else:
                 nest_names.append(name)
-        values = nest.GetStatus(self.nest_connections, nest_names)
-        values = np.array(values)  # ought to preserve int type for source, target
-        if 'weight' in names:
-            # other attributes could also have scale factors - need to use translation mechanisms
-            scale_factors = np.ones(len(names))
-            scale_factors[names.index('weight')] = 0.001
-            if self.receptor_type == 'inhibitory' and self.post.conductance_based:
-                # NEST uses negative values for inhibitory weights, even if these are conductances
-                scale_factors[names.index('weight')] *= -1
-            values *= scale_factors
-        if 'presynaptic_index' in names:
-            values[:, names.index('presynaptic_index')] = self.pre.id_to_index(
-                values[:, names.index('presynaptic_index')])
-        if 'postsynaptic_index' in names:
-            values[:, names.index('postsynaptic_index')] = self.post.id_to_index(
-                values[:, names.index('postsynaptic_index')])
-        values = values.tolist()
-        for i in range(len(values)):
-            values[i] = tuple(values[i])
-        return values
-
-    def _get_attributes_as_arrays(self, names, multiple_synapses='sum'):
-        multi_synapse_operation = Projection.MULTI_SYNAPSE_OPERATIONS[multiple_synapses]
-        all_values = []
-        for attribute_name in names:
-            if attribute_name[-1] == "s":  # weights --> weight, delays --> delay
-                attribute_name = attribute_name[:-1]
-            value_arr = np.nan * np.ones((self.pre.size, self.post.size))
-            connection_attributes = nest.GetStatus(self.nest_connections,
-                                                   ('source', 'target', attribute_name))
-            for conn in connection_attributes:
-                # (offset is always 0,0 for connections created with connect())
-                src, tgt, value = conn
-                addr = self.pre.id_to_index(src), self.post.id_to_index(tgt)
-                if np.isnan(value_arr[addr]):
-                    value_arr[addr] = value
-                else:
-                    value_arr[addr] = multi_synapse_operation(value_arr[addr], value)
-            if attribute_name == 'weight':
-                value_arr *= 0.001
+        if len(connections) > 0:
+            values = connections.get(nest_names)
+        else:
+            values = dict((nest_name, []) for nest_name in nest_names)
+        columns = {}
+        for name, nest_name in zip(names, nest_names):
+            # with a single connection, NEST returns scalars rather than lists
+            if name == 'presynaptic_index':
+                value = self.pre.id_to_index(np.atleast_1d(np.array(values[nest_name], dtype=int)))
+            elif name == 'postsynaptic_index':
+                value = self.post.id_to_index(np.atleast_1d(np.array(values[nest_name], dtype=int)))
+            else:
+                value = np.atleast_1d(np.array(values[nest_name], dtype=float))
+            if name == 'weight':
+                # other attributes could also have scale factors - need to use translation mechanisms
+                scale = 0.001
                 if self.receptor_type == 'inhibitory' and self.post.conductance_based:
-                    # NEST uses negative values for inhibitory weights,
-                    # even if these are conductances
-                    value_arr *= -1
-            all_values.append(value_arr)
-        return all_values
+                    # NEST uses negative values for inhibitory weights, even if these are conductances
+                    scale = -scale
+                value *= scale
+            columns[name] = value
+        return columns
 
     def _set_initial_value_array(self, variable, value):
         local_value = value.evaluate(simplify=True)
@@ -152,7 +152,10 @@ class _State(common.control.BaseState):
         self.current_sources = []
         self._time_offset = 0.0
         self.t_flush = -1
+        # NEST may reorder connections when preparing a simulation, which
+        # invalidates the SynapseCollections cached by projections
         self.stale_connection_cache = False
+        self.connection_epoch = 0
 
     @property
     def t(self):
@@ -242,10 +245,15 @@ class _State(common.control.BaseState):
         for population in self.populations:
             if population._deferred_parrot_connections:
                 population._connect_parrot_neurons()
+                self.stale_connection_cache = True
         for device in self.recording_devices:
             if not device._connected:
                 device.connect_to_cells()
                 device._local_files_merged = False
+                self.stale_connection_cache = True
+        if self.stale_connection_cache and simtime > 0:
+            self.connection_epoch += 1
+            self.stale_connection_cache = False
         if not self.running and simtime > 0:
             # we simulate past the real time by one min_delay,
             # otherwise NEST doesn't give us all the recorded data
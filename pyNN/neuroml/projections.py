@@ -132,7 +132,7 @@ class Projection(common.Projection):
 
         ## Create connections
         self.connections = []
-        connector.connect(self)
+        self._build_or_defer()
 
     def __len__(self):
         return len(self.connections)
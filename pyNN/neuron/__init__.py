@@ -15,7 +15,7 @@ except ImportError:
 from .. import errors, random, space                                # noqa: F401
 from ..network import Network                                       # noqa: F401
 from ..standardmodels import StandardCellType
-from ..random import NumpyRNG, GSLRNG, RandomDistribution           # noqa: F401
+from ..random import NumpyRNG, GSLRNG, CounterRNG, RandomDistribution           # noqa: F401
 from .random import NativeRNG                                       # noqa: F401
 from .standardmodels.cells import *                                 # noqa: F403, F401
 from .connectors import *                                           # noqa: F403, F401
@@ -28,6 +28,7 @@ from .cells import NativeCellType, IntFire1, IntFire2, IntFire4     # noqa: F401
 from .control import (                                              # noqa: F401
     setup,
     end,
+    build,
     run,
     run_until,
     run_for,
@@ -24,5 +24,8 @@ from ..connectors import (
     CSAConnector,
     CloneConnector,
     ArrayConnector,
+    SparseMatrixConnector,
     FixedTotalNumberConnector,
+    CachedConnector,
+    ConnectionCache,
 )
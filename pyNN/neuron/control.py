@@ -45,6 +45,10 @@ def setup(timestep=DEFAULT_TIMESTEP, min_delay=DEFAULT_MIN_DELAY, **extra_params
     simulator.state.dt = timestep
     simulator.state.min_delay = min_delay
     simulator.state.max_delay = extra_params.get('max_delay', DEFAULT_MAX_DELAY)
+    simulator.state.n_threads = extra_params.get('n_threads', 1)
+    simulator.state.deferred_build = extra_params.get('deferred_build', False)
+    simulator.state.build_processes = extra_params.get('build_processes', None)
+    simulator.state.build_plan = []
     if 'use_cvode' in extra_params:
         simulator.state.record_sample_times = extra_params['use_cvode']
         simulator.state.cvode.active(int(extra_params['use_cvode']))
@@ -69,6 +73,7 @@ def end(compatible_output=True):
 
 
 run, run_until = common.build_run(simulator)
+build = common.build_build(simulator)
 run_for = run
 
 reset = common.build_reset(simulator)
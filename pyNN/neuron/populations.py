@@ -122,6 +122,7 @@ class PopulationMixin(object):
             if (
                 isinstance(initial_values.base_value, RandomDistribution)
                 and initial_values.base_value.rng.parallel_safe
+                and not initial_values.base_value.rng.counter_based
             ):
                 local_values = initial_values.evaluate()[self._mask_local]
             else:
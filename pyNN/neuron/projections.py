@@ -29,6 +29,7 @@ class Projection(common.Projection):
     __doc__ = common.Projection.__doc__
     _simulator = simulator
     _static_synapse_class = StaticSynapse
+    _bytes_per_connection = 1000
 
     def __init__(self, presynaptic_population, postsynaptic_population,
                  connector, synapse_type=None, source=None, receptor_type=None,
@@ -38,14 +39,17 @@ class Projection(common.Projection):
                                    space, label)
         self._connections = dict((index, defaultdict(list))
                                  for index in self.post._mask_local.nonzero()[0])
-        connector.connect(self)
         self._presynaptic_components = dict((index, {}) for index in
                                             self.pre._mask_local.nonzero()[0])
-        if self.synapse_type.presynaptic_type:
-            self._configure_presynaptic_components()
+        self._build_or_defer()
         _projections.append(self)
         logger.info("--- Projection[%s].__init__() ---" % self.label)
 
+    def _build(self, connector=None):
+        super()._build(connector)
+        if self.synapse_type.presynaptic_type:
+            self._configure_presynaptic_components()
+
     @property
     def connections(self):
         for x in self._connections.values():
@@ -97,6 +101,37 @@ class Projection(common.Projection):
             self._connections[postsynaptic_index][pre_idx].append(
                 self.synapse_type.connection_type(self, pre_idx, postsynaptic_index, **parameters))
 
+    def _connect_block(self, presynaptic_indices, postsynaptic_indices,
+                       **connection_parameters):
+        """
+        Connect a block of neurons with static connections.
+
+        `presynaptic_indices`   -- a 1D array of pre-synaptic cell indices
+        `postsynaptic_indices`  -- a 1D array of post-synaptic cell indices, of
+                                   the same length as `presynaptic_indices`.
+        `connection_parameters` -- each parameter should be either a
+                                   1D array of the same length as the index
+                                   arrays, or a single value.
+        """
+        for postsynaptic_index in np.unique(postsynaptic_indices):
+            postsynaptic_cell = self.post[postsynaptic_index]
+            if (
+                not isinstance(postsynaptic_cell, int)
+                or not (0 <= postsynaptic_cell <= simulator.state.gid_counter)
+            ):
+                err_msg = "Invalid post-synaptic cell: %s (gid_counter=%d)" % (
+                    postsynaptic_cell, simulator.state.gid_counter)
+                raise errors.ConnectionError(err_msg)
+            assert postsynaptic_cell.local
+        for name, value in connection_parameters.items():
+            if not core.is_listlike(value):
+                connection_parameters[name] = repeat(value)
+        for pre_idx, post_idx, *values in zip(presynaptic_indices, postsynaptic_indices,
+                                              *connection_parameters.values()):
+            parameters = dict(zip(connection_parameters.keys(), values))
+            self._connections[post_idx][pre_idx].append(
+                self.synapse_type.connection_type(self, pre_idx, post_idx, **parameters))
+
     def _configure_presynaptic_components(self):
         """
         For gap junctions potentially other complex synapse types the presynaptic side of the
@@ -139,5 +174,12 @@ class Projection(common.Projection):
                     for connection in connection_group[index]:
                         setattr(connection, name, value[index])
 
+    def _set_attributes_by_connection(self, connection_parameters, connection_indices=None):
+        if self.synapse_type.presynaptic_type:
+            raise NotImplementedError(
+                "Setting values for individual connections is not supported for synapse "
+                "types with pre-synaptic components")
+        super()._set_attributes_by_connection(connection_parameters, connection_indices)
+
     def _set_initial_value_array(self, variable, value):
         raise NotImplementedError
@@ -6,6 +6,8 @@ Parameter set handling
 """
 
 from collections.abc import Sized
+from copy import copy
+from functools import partial
 import numpy as np
 from lazyarray import larray, partial_shape
 from .core import is_listlike
@@ -68,31 +70,59 @@ class LazyArray(larray):
             self.base_value[addr] = new_value
             self.operations = []
 
-    def by_column(self, mask=None):
+    def _columns_to_evaluate(self, mask=None):
         """
-        Iterate over the columns of the array. Columns will be yielded either
-        as a 1D array or as a single value (for a flat array).
-
-        `mask`: either `None` or a boolean array indicating which columns should be included.
+        Yield (column index, included) for each column that must be evaluated
+        when iterating over the columns selected by `mask`: with a parallel-safe
+        random distribution, the columns that are not included must still be
+        evaluated, to keep the random number generator in step.
         """
         column_indices = np.arange(self.ncols)
         if mask is not None:
             if not isinstance(mask, slice):
                 assert len(mask) == self.ncols
             column_indices = column_indices[mask]
-        if isinstance(self.base_value, RandomDistribution) and self.base_value.rng.parallel_safe:
+        if (
+            isinstance(self.base_value, RandomDistribution)
+            and self.base_value.rng.parallel_safe
+            and not self.base_value.rng.counter_based
+        ):
             if mask is None:
                 for j in column_indices:
-                    yield self._partially_evaluate((slice(None), j), simplify=True)
+                    yield j, True
             else:
                 column_indices = np.arange(self.ncols)
                 for j, local in zip(column_indices, mask):
-                    col = self._partially_evaluate((slice(None), j), simplify=True)
-                    if local:
-                        yield col
+                    yield j, local
         else:
             for j in column_indices:
-                yield self._partially_evaluate((slice(None), j), simplify=True)
+                yield j, True
+
+    def by_column(self, mask=None):
+        """
+        Iterate over the columns of the array. Columns will be yielded either
+        as a 1D array or as a single value (for a flat array).
+
+        `mask`: either `None` or a boolean array indicating which columns should be included.
+        """
+        for j, included in self._columns_to_evaluate(mask):
+            col = self._partially_evaluate((slice(None), j), simplify=True)
+            if included:
+                yield col
+
+    def by_column_deferred(self, mask=None):
+        """
+        As :meth:`by_column`, but yield, for each column, a function with no
+        arguments that returns the column. Any random numbers needed for the
+        column are drawn when its function is yielded, in the same order as
+        by :meth:`by_column`, so the functions may be called later, in any
+        order or in different threads, and give the same results.
+        """
+        for j, included in self._columns_to_evaluate(mask):
+            addr = (slice(None), j)
+            array = _with_random_values_drawn(self, addr)
+            if included:
+                yield partial(array._partially_evaluate, addr, simplify=True)
 
     def _apply_operations(self, x, addr=None, simplify=False):
         # todo: move this modified version back into lazyarray
@@ -117,6 +147,47 @@ class LazyArray(larray):
         return x
 
 
+class _DrawnValues(object):
+    """
+    Random numbers already drawn for part of a lazy array, which take the place
+    of the random distribution they were drawn from.
+    """
+
+    def __init__(self, values):
+        self.values = values
+
+    def lazily_evaluate(self, mask=None, shape=None):
+        return self.values
+
+
+def _contains_random_values(array):
+    return (
+        hasattr(array.base_value, "lazily_evaluate")
+        or any(_contains_random_values(arg)
+               for f, arg in array.operations if isinstance(arg, larray))
+    )
+
+
+def _with_random_values_drawn(array, addr):
+    """
+    Return a copy of the lazy array `array` in which each random distribution
+    has been replaced by the values it produces when `array[addr]` is
+    evaluated. The values are drawn in the same order as they would be in
+    evaluating `array[addr]`.
+    """
+    if not _contains_random_values(array):
+        return array
+    new_array = copy(array)
+    if hasattr(array.base_value, "lazily_evaluate"):
+        new_array.base_value = _DrawnValues(
+            array.base_value.lazily_evaluate(addr, shape=array._shape))
+    new_array.operations = [
+        (f, _with_random_values_drawn(arg, addr) if isinstance(arg, larray) else arg)
+        for f, arg in array.operations
+    ]
+    return new_array
+
+
 class ArrayParameter(object):
     """
     Represents a parameter whose value consists of multiple values, e.g. a tuple or array.
@@ -397,6 +468,7 @@ class ParameterSpace(object):
                     if (
                         isinstance(value.base_value, RandomDistribution)
                         and value.base_value.rng.parallel_safe
+                        and not value.base_value.rng.counter_based
                     ):
                         value = value.evaluate()  # can't partially evaluate if using parallel safe
                     self._parameters[name] = value[mask]
@@ -492,8 +564,14 @@ class ParameterSpace(object):
 
     @property
     def parallel_safe(self):
+        """
+        True if any of the parameters must be evaluated in full, even if only
+        part is needed, to give the same values for any number of MPI processes.
+        """
         return any(
-            isinstance(value.base_value, RandomDistribution) and value.base_value.rng.parallel_safe
+            isinstance(value.base_value, RandomDistribution)
+            and value.base_value.rng.parallel_safe
+            and not value.base_value.rng.counter_based
             for value in self._parameters.values()
         )
 
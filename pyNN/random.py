@@ -4,6 +4,8 @@ common interface so that they can be used interchangeably in PyNN.
 
 Classes:
     NumpyRNG           - uses the np.random.RandomState RNG
+    CounterRNG         - uses the counter-based Philox RNG, so that any part of an
+                         array of random numbers can be generated on its own
     GSLRNG             - uses the RNGs from the Gnu Scientific Library
     NativeRNG          - indicates to the simulator that it should use it's own,
                          built-in RNG
@@ -28,7 +30,7 @@ try:
 except (ImportError, Warning):
     have_gsl = False
 
-from lazyarray import partial_shape
+from lazyarray import larray, partial_shape
 
 logger = logging.getLogger("PyNN")
 
@@ -51,6 +53,32 @@ available_distributions = {
 MAX_REDRAWS = 1000  # for clipped distributions
 
 
+def _mix64(z):
+    """SplitMix64 finaliser, applied element-wise to a uint64 array."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xbf58476d1ce4e5b9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94d049bb133111eb)
+    return z ^ (z >> np.uint64(31))
+
+
+def _hashed_uniform(key, stream, counter):
+    """
+    Return uniformly-distributed floats in [0, 1), each of which depends only on
+    the integer `key` and the corresponding elements of the integer arrays
+    `stream` and `counter`.
+
+    Unlike numbers drawn in sequence from an RNG, any subset of these numbers
+    can be computed without computing the others, e.g. the numbers for
+    the post-synaptic neurons on one MPI node.
+    """
+    golden_gamma = np.uint64(0x9e3779b97f4a7c15)
+    stream = np.asarray(stream).astype(np.uint64)
+    counter = np.asarray(counter).astype(np.uint64)
+    with np.errstate(over='ignore'):
+        z = _mix64(np.uint64(key) + stream * golden_gamma)
+        z = _mix64(z + (counter + np.uint64(1)) * golden_gamma)
+    return (z >> np.uint64(11)) * 2.0**-53
+
+
 def get_mpi_config():
     try:
         from mpi4py import MPI
@@ -68,6 +96,9 @@ class AbstractRNG(object):
     standard Python rng, e.g. a np.random.RandomState object, which would
     allow the same random numbers to be used across different simulators, or
     simply to read externally-generated numbers from files."""
+    # whether random numbers can be generated for any part of an array
+    # without generating those for the rest of the array
+    counter_based = False
 
     def __init__(self, seed=None):
         if seed is not None:
@@ -219,6 +250,8 @@ class NumpyRNG(WrappedRNG):
         This is to give the PyNN RNGs the same methods as the wrapped RNGs
         (:class:`np.random.RandomState` or the GSL RNGs.)
         """
+        if name == "rng":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
         return getattr(self.rng, name)
 
     def _next(self, distribution, n, parameters):
@@ -257,6 +290,94 @@ class NumpyRNG(WrappedRNG):
         return np.maximum(np.minimum(res, high), low)
 
 
+class CounterRNG(NumpyRNG):
+    """
+    Wrapper for the counter-based Philox PRNG.
+
+    Used directly, this behaves like :class:`NumpyRNG`. When used in a
+    :class:`RandomDistribution` to fill an array (for example a connection map,
+    or synaptic weights), each element of the array gets its own position in the
+    Philox stream, determined by the seed, the distribution and the element's
+    row and column. The values for any element, column or block of columns can
+    therefore be generated on their own. Since the values do not depend on the
+    order in which the array is evaluated, parallel-safe arrays do not need to be
+    generated in full on every MPI node: each node generates only its own columns,
+    and the results are the same for any number of nodes.
+
+    Each :class:`RandomDistribution` using this RNG gets its own stream, so evaluating
+    the same distribution twice for the same array gives the same values.
+    """
+    counter_based = True
+    # number of rows of a column which share a sub-stream of random numbers
+    block_size = 1024
+
+    def __init__(self, seed=None, parallel_safe=True):
+        if seed is None:
+            seed = int(np.random.SeedSequence().entropy % 2**63)
+        WrappedRNG.__init__(self, seed, parallel_safe)
+        self.rng = np.random.RandomState(np.random.Philox(key=self.seed % 2**64))
+        self._n_streams = 0
+
+    def __deepcopy__(self, memo):
+        return self._copy_with(deepcopy(self.rng, memo))
+
+    def _copy_with(self, rng):
+        obj = CounterRNG.__new__(CounterRNG)
+        AbstractRNG.__init__(obj, self.seed)
+        obj.parallel_safe = self.parallel_safe
+        obj.mpi_rank, obj.num_processes = self.mpi_rank, self.num_processes
+        obj.rng = rng
+        obj._n_streams = self._n_streams
+        return obj
+
+    def next_stream(self):
+        """Return the identifier of a new stream, for use with :meth:`next_at`."""
+        self._n_streams += 1
+        return self._n_streams
+
+    def next_at(self, stream, rows, columns, n_rows, distribution=None, parameters=None):
+        """
+        Return the random numbers at the given positions of an array with
+        `n_rows` rows, for the given `stream` (see :meth:`next_stream`).
+
+        `rows` and `columns` are integer arrays (or integers) giving the element
+        positions; the returned array has their (broadcast) shape. The value for
+        each element depends only on the seed, the stream, `n_rows`, the element's
+        position and the distribution.
+        """
+        if distribution is None:
+            distribution = 'uniform'
+            if parameters is None:
+                parameters = {"low": 0.0, "high": 1.0}
+        rows, columns = np.broadcast_arrays(np.asarray(rows, dtype=np.int64),
+                                            np.asarray(columns, dtype=np.int64))
+        chunks = rows // self.block_size
+        n_chunks = (n_rows - 1) // self.block_size + 1
+        # positions are grouped by sub-stream, one per (column, block of rows)
+        substreams = (columns * n_chunks + chunks).ravel()
+        order = np.argsort(substreams, kind="stable")
+        boundaries = np.flatnonzero(np.diff(substreams[order])) + 1
+        values = None
+        for group in np.split(order, boundaries):
+            if group.size == 0:
+                continue
+            column = int(columns.flat[group[0]])
+            chunk = int(chunks.flat[group[0]])
+            bit_generator = np.random.Philox(key=(stream << 64) | (self.seed % 2**64),
+                                             counter=(column << 128) | (chunk << 64))
+            # always draw the whole block, so the values do not depend on which
+            # elements were requested
+            n = min(self.block_size, n_rows - chunk * self.block_size)
+            draws = np.asarray(self._copy_with(np.random.RandomState(bit_generator))._next(
+                distribution, n, parameters))
+            if values is None:
+                values = np.empty(rows.shape, dtype=draws.dtype)
+            values.flat[group] = draws[rows.flat[group] % self.block_size]
+        if values is None:
+            values = np.empty(rows.shape)
+        return values
+
+
 class GSLRNG(WrappedRNG):
     """Wrapper for the GSL random number generators."""
     translations = {
@@ -284,6 +405,8 @@ class GSLRNG(WrappedRNG):
 
     def __getattr__(self, name):
         """This is to give GSLRNG the same methods as the GSL RNGs."""
+        if name == "rng":  # not yet set, e.g. while unpickling
+            raise AttributeError(name)
         return getattr(self.rng, name)
 
     def _next(self, distribution, n, parameters):
@@ -394,6 +517,8 @@ class RandomDistribution(object):
             self.rng = rng
         else:  # use np.random.RandomState() by default
             self.rng = NumpyRNG()  # should we provide a seed?
+        if self.rng.counter_based:
+            self._stream = self.rng.next_stream()
 
     def next(self, n=None, mask=None):
         """Return `n` random numbers from the distribution."""
@@ -435,7 +560,12 @@ class RandomDistribution(object):
 
         This method is called by the lazyarray `evaluate()` and
         `_partially_evaluate()` methods.
+
+        With a counter-based RNG, only the numbers for the requested region are
+        generated, and they are the same however the array is divided up.
         """
+        if self.rng.counter_based:
+            return self._evaluate_by_address(mask, shape)
         if mask is None:
             # produce an array of random numbers with the requested shape
             n = reduce(operator.mul, shape)
@@ -455,3 +585,20 @@ class RandomDistribution(object):
                 n = 1
             res = self.next(n).reshape(p_shape)
         return res
+
+    def _evaluate_by_address(self, mask, shape):
+        if mask is None:
+            indices = np.indices(shape)
+        else:
+            indices = larray(0, shape=shape)._array_indices(mask)
+        if len(shape) == 1:
+            rows, columns = indices[0], 0
+        elif len(shape) == 2:
+            rows, columns = indices
+        else:
+            raise NotImplementedError("Only 1D and 2D arrays supported")
+        res = self.rng.next_at(self._stream, rows, columns, shape[0],
+                               distribution=self.name, parameters=self.parameters)
+        if mask is None and res.size == 1:
+            res = res.flat[0]
+        return res
@@ -36,7 +36,8 @@ def get_mpi_comm():
         raise Exception(
             "Trying to gather data without MPI installed. "
             "If you are not running a distributed simulation, this is a bug in PyNN.")
-    return MPI.COMM_WORLD, {'DOUBLE': MPI.DOUBLE, 'SUM': MPI.SUM}
+    return MPI.COMM_WORLD, {'DOUBLE': MPI.DOUBLE, 'INT64': MPI.INT64_T,
+                            'SUM': MPI.SUM, 'MIN': MPI.MIN, 'MAX': MPI.MAX}
 
 
 def rename_existing(filename):
@@ -81,6 +82,59 @@ def gather_dict(D, all=False):
     return D
 
 
+def gather_columns(columns, all=False):
+    """
+    Gather a dict of 1D arrays of the same length (e.g. connection attributes)
+    from all MPI nodes, concatenating the arrays with the same key in rank order.
+
+    The arrays are sent as typed buffers with `Gatherv` (or `Allgatherv` if `all`
+    is True), rather than being pickled: integer arrays as 64-bit integers,
+    all others as doubles. Nodes which do not receive the data (i.e. other than
+    the root node, if `all` is False) get their own columns back.
+    """
+    mpi_comm, mpi_flags = get_mpi_comm()
+    n = len(next(iter(columns.values()))) if columns else 0
+    sizes = np.array(mpi_comm.allgather(n), dtype=int)
+    displacements = np.hstack(([0], np.cumsum(sizes)[:-1]))
+    receiving = all or mpi_comm.rank == MPI_ROOT
+    gathered = {}
+    for name, data in columns.items():
+        data = np.asarray(data)
+        if data.dtype.kind in "iub":
+            data, mpi_type = np.ascontiguousarray(data, dtype=np.int64), mpi_flags['INT64']
+        else:
+            data, mpi_type = np.ascontiguousarray(data, dtype=np.float64), mpi_flags['DOUBLE']
+        gdata = np.empty(sizes.sum() if receiving else 0, dtype=data.dtype)
+        receive_buffer = [gdata, (sizes, displacements), mpi_type]
+        if all:
+            mpi_comm.Allgatherv([data, mpi_type], receive_buffer)
+        else:
+            mpi_comm.Gatherv([data, mpi_type], receive_buffer, root=MPI_ROOT)
+        gathered[name] = gdata
+    if receiving:
+        return gathered
+    return columns
+
+
+def reduce_array(data, op='SUM', all=False):
+    """
+    Combine arrays of the same shape and type from all MPI nodes, element by
+    element, with the operation `op` ('SUM', 'MIN' or 'MAX'), using `Reduce`
+    (or `Allreduce` if `all` is True). Nodes which do not receive the result
+    get their own array back.
+    """
+    mpi_comm, mpi_flags = get_mpi_comm()
+    data = np.ascontiguousarray(data)
+    result = np.empty_like(data)
+    if all:
+        mpi_comm.Allreduce(data, result, op=mpi_flags[op])
+    else:
+        mpi_comm.Reduce(data, result, op=mpi_flags[op], root=MPI_ROOT)
+        if mpi_comm.rank != MPI_ROOT:
+            return data
+    return result
+
+
 def gather_blocks(data, ordered=True):
     """Gather Neo Blocks"""
     mpi_comm, mpi_flags = get_mpi_comm()
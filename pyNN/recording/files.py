@@ -7,6 +7,7 @@ Classes:
     StandardTextFile
     PickleFile
     NumpyBinaryFile
+    NumpyMemmapFile
     HDF5ArrayFile - requires PyTables
 
 :copyright: Copyright 2006-2023 by the PyNN team, see AUTHORS.
@@ -72,6 +73,53 @@ def savez(file, *args, **kwds):
     shutil.rmtree(direc)
 
 
+def get_file(filename, mode):
+    """
+    Return a file object of the appropriate class for the extension of
+    `filename`: ".npy" for `NumpyMemmapFile`, ".h5" for `HDF5ArrayFile`,
+    otherwise `StandardTextFile`.
+    """
+    if filename.endswith(".npy"):
+        return NumpyMemmapFile(filename, mode)
+    elif filename.endswith(".h5"):
+        if not have_hdf5:
+            raise ImportError("PyTables is required to read and write HDF5 files.")
+        return HDF5ArrayFile(filename, mode.replace('b', ''))
+    else:
+        return StandardTextFile(filename, mode)
+
+
+def _target_index(data, columns):
+    """
+    Sort a connection list by post-synaptic index (the column named "j") and
+    return the sorted list together with a row pointer, such that the
+    connections to target `k` are in rows `index[k]:index[k + 1]`.
+    """
+    targets = data[:, columns.index("j")].astype(int)
+    order = np.argsort(targets, kind="stable")
+    targets = targets[order]
+    index = np.searchsorted(targets, np.arange(targets[-1] + 2))
+    return data[order], index
+
+
+def _row_ranges(index, targets):
+    """
+    Return the start and stop rows of the blocks of a connection list, sorted
+    by post-synaptic index, that contain the connections to `targets`.
+    Blocks that follow on from one another are merged.
+    """
+    targets = np.unique(targets)
+    targets = targets[(targets >= 0) & (targets < index.size - 1)]
+    starts = index[targets]
+    stops = index[targets + 1]
+    nonempty = stops > starts
+    starts, stops = starts[nonempty], stops[nonempty]
+    new_block = np.ones(starts.size, dtype=bool)
+    new_block[1:] = starts[1:] != stops[:-1]
+    end_of_block = np.append(new_block[1:], True)[:starts.size]
+    return starts[new_block], stops[end_of_block]
+
+
 class BaseFile(object):
     """
     Base class for PyNN File classes.
@@ -129,6 +177,17 @@ class BaseFile(object):
         """
         raise NotImplementedError
 
+    def read_targets(self, targets):
+        """
+        Read the rows of a connection list whose post-synaptic index (column
+        "j") is in `targets`, and return them as a NumPy array.
+        """
+        columns = list(self.get_metadata().get("columns", ["i", "j"]))
+        data = self.read()
+        if data.size == 0:
+            return data
+        return data[np.isin(data[:, columns.index("j")], targets)]
+
     def close(self):
         """Close the file."""
         if hasattr(self, 'fileobj'):
@@ -229,6 +288,73 @@ class NumpyBinaryFile(BaseFile):
         return D
 
 
+class NumpyMemmapFile(BaseFile):
+    """
+    Data are saved in .npy format, and are memory-mapped when read, so that
+    only the parts of the file that are needed are loaded into memory.
+
+    Metadata are saved as typed arrays in a separate .npz file, with the
+    same name but the extension ".index.npz". If the metadata contain
+    "columns" with a column "j", the data are treated as a connection list:
+    they are sorted by post-synaptic index and a row index is saved with the
+    metadata, so that `read_targets()` can read just the rows it needs.
+    """
+
+    def __init__(self, filename, mode='rb'):
+        """
+        Create a file object for the given filename and mode. The file itself
+        is opened when reading or writing.
+        """
+        self.name = filename
+        self.mode = mode
+
+    @property
+    def index_name(self):
+        return os.path.splitext(self.name)[0] + ".index.npz"
+
+    def rename(self, filename):
+        self.name = filename
+
+    def write(self, data, metadata):
+        data = np.asarray(data)
+        arrays = {}
+        for name, value in metadata.items():
+            arrays[name] = np.asarray(value)
+            if arrays[name].dtype.hasobject:
+                raise TypeError("Metadata values must be numbers, strings, "
+                                "or lists or tuples of these.")
+        columns = list(metadata.get("columns", []))
+        if "j" in columns and data.size > 0:
+            data, arrays["_target_index"] = _target_index(data, columns)
+        dir = os.path.dirname(self.name)
+        if dir and not os.path.exists(dir):
+            os.makedirs(dir, exist_ok=True)
+        with open(self.name, 'wb') as fileobj:
+            np.save(fileobj, data)
+        np.savez(self.index_name, **arrays)
+
+    def read(self):
+        return np.load(self.name, mmap_mode='r')
+
+    def _read_index(self):
+        with np.load(self.index_name) as arrays:
+            return {name: arrays[name] for name in arrays.files}
+
+    def read_targets(self, targets):
+        index = self._read_index().get("_target_index")
+        if index is None:
+            return BaseFile.read_targets(self, targets)
+        data = self.read()
+        starts, stops = _row_ranges(index, targets)
+        if starts.size == 0:
+            return np.array(data[:0])
+        return np.concatenate([data[start:stop] for start, stop in zip(starts, stops)])
+
+    def get_metadata(self):
+        return {name: value.tolist() for name, value in self._read_index().items()
+                if name != "_target_index"}
+
+
 if have_hdf5:
     class HDF5ArrayFile(BaseFile):
         """
@@ -251,11 +377,18 @@ if have_hdf5:
 
         def write(self, data, metadata):
             if len(data) > 0:
+                index = None
+                columns = list(metadata.get("columns", []))
+                if "j" in columns:
+                    data, index = _target_index(np.asarray(data), columns)
+                if self._new_pytables:
+                    create_array = self.fileobj.create_array
+                else:
+                    create_array = self.fileobj.createArray
                 try:
-                    if self._new_pytables:
-                        node = self.fileobj.create_array(self.fileobj.root, "data", data)
-                    else:
-                        node = self.fileobj.createArray(self.fileobj.root, "data", data)
+                    node = create_array(self.fileobj.root, "data", data)
+                    if index is not None:
+                        create_array(self.fileobj.root, "target_index", index)
                 except tables.HDF5ExtError as e:
                     raise tables.HDF5ExtError("%s. data.shape=%s, metadata=%s" %
                                               (e, data.shape, metadata))
@@ -266,6 +399,15 @@ if have_hdf5:
         def read(self):
             return self.fileobj.root.data.read()
 
+        def read_targets(self, targets):
+            if "target_index" not in self.fileobj.root:
+                return BaseFile.read_targets(self, targets)
+            node = self.fileobj.root.data
+            starts, stops = _row_ranges(self.fileobj.root.target_index.read(), targets)
+            if starts.size == 0:
+                return node.read(0, 0)
+            return np.concatenate([node.read(start, stop) for start, stop in zip(starts, stops)])
+
         def get_metadata(self):
             D = {}
             node = self.fileobj.root.data
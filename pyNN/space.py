@@ -6,6 +6,8 @@ Classes:
 
   Space           - representation of a Cartesian space for use in calculating
                     distances
+  CellList        - spatial index for finding all pairs of points closer than
+                    a given distance
 
   Line            - represents a structure with neurons distributed evenly on a
                     straight line.
@@ -126,8 +128,34 @@ class Space(object):
         np.sqrt(d, d)
         return d.flatten()
 
+    def paired_distances(self, A, B):
+        """
+        Calculate the distances between corresponding rows of two arrays of
+        coordinates, given the topology of the current space, i.e. the result
+        has one element per row of `A` and `B`.
+        """
+        assert A.shape == B.shape
+        assert A.shape[-1] == 3
+        A = A.reshape(-1, 3)
+        B = self.scale_factor * (B.reshape(-1, 3) + self.offset)
+        d = np.zeros((A.shape[0],), dtype=A.dtype)
+        for axis in self.axes:
+            diff = np.abs(A[:, axis] - B[:, axis])
+            if self.periodic_boundaries is not None:
+                boundaries = self.periodic_boundaries[axis]
+                if boundaries is not None:
+                    range = boundaries[1] - boundaries[0]
+                    diff = np.minimum(diff, range - diff)
+            d += diff**2
+        return np.sqrt(d)
+
     def distance_generator(self, f, g):
         def distance_map(i, j):
+            if (isinstance(i, np.ndarray) and i.ndim == 1
+                    and isinstance(j, np.ndarray) and j.ndim == 1):
+                # paired indices, i.e. the distances between pre-synaptic neuron i[k]
+                # and post-synaptic neuron j[k] for each k
+                return self.paired_distances(f(i), g(j))
             shape = []
             if isinstance(i, np.ndarray) and i.ndim == 2:
                 i = i[:, 0]
@@ -143,6 +171,124 @@ class Space(object):
         return distance_map
 
 
+class CellList(object):
+    """
+    Spatial index for finding all pairs of neurons within a given distance
+    of each other, using a uniform grid of cells ("cell lists") with sides
+    at least as long as the search radius, so that only neighbouring cells
+    need to be searched.
+
+    Arguments:
+        `space`:
+            a :class:`Space` object, which defines how distances are calculated
+            (axes, scale factor, offset and periodic boundaries).
+        `positions`:
+            array of shape (n, 3) containing the positions of the
+            pre-synaptic neurons.
+        `radius`:
+            the maximum distance for which pairs should be found.
+
+    The positions passed to :meth:`pairs_within` are those of the
+    post-synaptic neurons, and have the scale factor and offset applied, as
+    for :meth:`Space.distances`.
+    """
+    max_cells = 2**62
+
+    def __init__(self, space, positions, radius):
+        assert radius > 0
+        self.space = space
+        self.positions = positions
+        self.radius = radius
+        points = positions[:, space.axes]
+        n_axes = points.shape[1]
+        self.origin = np.zeros(n_axes)
+        self.cell_size = np.full(n_axes, float(radius))
+        self.n_cells = np.ones(n_axes, dtype=np.int64)
+        self.periodic = np.zeros(n_axes, dtype=bool)
+        for k, axis in enumerate(space.axes):
+            boundaries = self._boundaries(axis)
+            if boundaries is not None:
+                length = boundaries[1] - boundaries[0]
+                self.periodic[k] = True
+                self.origin[k] = boundaries[0]
+                # cells must be at least `radius` wide, so we can have no more than length/radius
+                self.n_cells[k] = max(1, int(length // radius))
+                self.cell_size[k] = length / self.n_cells[k]
+            elif points.shape[0] > 0:
+                self.origin[k] = points[:, k].min()
+                extent = points[:, k].max() - self.origin[k]
+                self.n_cells[k] = int(extent // radius) + 1
+        # for very sparse positions, use coarser cells, so that cell keys fit in an integer
+        while np.prod(self.n_cells.astype(float)) > self.max_cells:
+            self.cell_size[~self.periodic] *= 2
+            self.n_cells[~self.periodic] = self.n_cells[~self.periodic] // 2 + 1
+        keys = self._keys(self._cell_coordinates(points))
+        self._order = np.argsort(keys, kind='stable')
+        self._sorted_keys = keys[self._order]
+
+    def _boundaries(self, axis):
+        if self.space.periodic_boundaries is not None:
+            return self.space.periodic_boundaries[axis]
+        return None
+
+    def _cell_coordinates(self, points):
+        coords = np.floor((points - self.origin) / self.cell_size).astype(np.int64)
+        coords[:, self.periodic] %= self.n_cells[self.periodic]
+        return coords
+
+    def _keys(self, coords):
+        keys = np.zeros(coords.shape[0], dtype=np.int64)
+        for k in range(coords.shape[1]):
+            keys = keys * self.n_cells[k] + coords[:, k]
+        return keys
+
+    def pairs_within(self, positions, radius=None):
+        """
+        Find all pairs (i, j) for which the distance between pre-synaptic
+        neuron `i` (in the positions given to the constructor) and post-synaptic
+        neuron `j` (in `positions`, an array of shape (m, 3)) is no greater than
+        `radius` (by default, the radius given to the constructor).
+
+        Returns three arrays: `i`, `j` and the distances, sorted by `j` then `i`.
+        """
+        if radius is None:
+            radius = self.radius
+        assert radius <= self.radius
+        points = (self.space.scale_factor * (positions + self.space.offset))[:, self.space.axes]
+        coords = self._cell_coordinates(points)
+        n_axes = coords.shape[1]
+        # offsets to neighbouring cells, avoiding searching the same cell twice
+        # when there are fewer than three cells along a periodic axis
+        axis_offsets = []
+        for k in range(n_axes):
+            if self.periodic[k]:
+                axis_offsets.append(np.unique(np.array([-1, 0, 1]) % self.n_cells[k]))
+            else:
+                axis_offsets.append(np.array([-1, 0, 1]))
+        i_list, j_list = [], []
+        for cell_offset in np.array(np.meshgrid(*axis_offsets, indexing='ij')).reshape(n_axes, -1).T:
+            neighbour_coords = coords + cell_offset
+            neighbour_coords[:, self.periodic] %= self.n_cells[self.periodic]
+            valid = ((neighbour_coords >= 0) & (neighbour_coords < self.n_cells)).all(axis=1)
+            j = np.flatnonzero(valid)
+            keys = self._keys(neighbour_coords[valid])
+            starts = np.searchsorted(self._sorted_keys, keys, side='left')
+            stops = np.searchsorted(self._sorted_keys, keys, side='right')
+            counts = stops - starts
+            j = np.repeat(j, counts)
+            # positions within the sorted keys of all candidates
+            within = np.arange(j.size) - np.repeat(np.cumsum(counts) - counts, counts)
+            i_list.append(self._order[np.repeat(starts, counts) + within])
+            j_list.append(j)
+        i = np.hstack(i_list).astype(int)
+        j = np.hstack(j_list).astype(int)
+        d = self.space.paired_distances(self.positions[i], positions[j])
+        inside = d <= radius
+        i, j, d = i[inside], j[inside], d[inside]
+        order = np.lexsort((i, j))
+        return i[order], j[order], d[order]
+
+
 class BaseStructure(object):
 
     def __repr__(self):
@@ -288,6 +288,15 @@ class AssemblyTest(unittest.TestCase):
         a = sim.Assembly(p3, p1, p2)
         self.assertRaises(IndexError, a.id_to_index, p3.last_id + 1)
 
+    def test_id_to_index_with_array_unsorted(self, sim=sim):
+        p1 = sim.Population(11, sim.IF_cond_exp())
+        p2 = sim.Population(6, sim.IF_cond_alpha())
+        p3 = sim.Population(3, sim.IF_curr_exp())
+        a = sim.Assembly(p3, p1, p2)
+        ids = np.array([p2[5], p3[1], p1[4], p3[1]])
+        assert_array_equal(a.id_to_index(ids), np.array([19, 1, 7, 1]))
+        self.assertRaises(IndexError, a.id_to_index, np.array([p1[0], p3.last_id + 1]))
+
     def test_getitem_int(self, sim=sim):
         p1 = sim.Population(11, sim.IF_cond_exp())
         p2 = sim.Population(6, sim.IF_cond_alpha())
@@ -8,6 +8,7 @@ Tests of the Connector classes, using the pyNN.mock backend.
 import unittest
 
 from pyNN import connectors, random, errors, space, recording
+from pyNN.parameters import LazyArray
 import numpy as np
 import os
 import sys
@@ -208,6 +209,24 @@ class TestFixedProbabilityConnector(unittest.TestCase):
                           (2, 1, 0.0, 0.123),
                           (3, 1, 0.0, 0.123)])
 
+    def test_connect_with_counter_based_rng(self, sim=sim):
+        syn = sim.StaticSynapse(weight=random.RandomDistribution('uniform', (0.1, 0.5),
+                                                                 rng=random.CounterRNG(seed=23)))
+        C = connectors.FixedProbabilityConnector(p_connect=0.6, rng=random.CounterRNG(seed=42))
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        # only the local columns are generated
+        self.assertFalse(C._needs_all_columns(
+            prj, LazyArray(random.RandomDistribution('uniform', (0, 1), rng=C.rng))))
+        local_connections = prj.get(["weight"], format='list', gather=False)
+        # the same connections are made on a single node
+        sim.setup(num_processes=1, rank=0)
+        p1 = sim.Population(4, sim.IF_cond_exp())
+        p2 = sim.Population(5, sim.HH_cond_exp())
+        C = connectors.FixedProbabilityConnector(p_connect=0.6, rng=random.CounterRNG(seed=42))
+        all_connections = sim.Projection(p1, p2, C, syn).get(["weight"], format='list')
+        self.assertGreater(len(local_connections), 0)
+        self.assertEqual(local_connections, [c for c in all_connections if c[1] in (1, 3)])
+
     def test_connect_with_default_args_again(self, sim=sim):
         C = connectors.FixedProbabilityConnector(p_connect=0.5,
                                                  rng=MockRNG2(1 - np.array([1, 0, 0, 1,
@@ -285,6 +304,26 @@ class TestFixedProbabilityConnector(unittest.TestCase):
                                                [nan, 1.4, nan, nan, nan]]),
                                   9)
 
+    def test_connect_sparse_parallel_safe(self, sim=sim):
+        C = connectors.FixedProbabilityConnector(p_connect=0.5, sparse=True,
+                                                 rng=random.NumpyRNG(seed=29, parallel_safe=True))
+        C.column_block_size = 2
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        local_connections = prj.get('weight', format='list', gather=False)
+        self.assertTrue(len(local_connections) > 0)
+        self.assertTrue(all(j in (1, 3) for i, j, w in local_connections))
+
+        sim.setup(num_processes=1, rank=0, min_delay=0.123)
+        p1 = sim.Population(4, sim.IF_cond_exp(), structure=space.Line())
+        p2 = sim.Population(5, sim.HH_cond_exp(), structure=space.Line())
+        C = connectors.FixedProbabilityConnector(p_connect=0.5, sparse=True,
+                                                 rng=random.NumpyRNG(seed=29, parallel_safe=True))
+        C.column_block_size = 2
+        prj = sim.Projection(p1, p2, C, sim.StaticSynapse())
+        all_connections = prj.get('weight', format='list', gather=False)
+        self.assertEqual(local_connections,
+                         [(i, j, w) for i, j, w in all_connections if j in (1, 3)])
+
     # def test_connect_with_random_delays_parallel_unsafe(self, sim=sim):
     #    rd = random.RandomDistribution('uniform', [0.1, 1.1], rng=MockRNG(start=1.0, delta=0.2, parallel_safe=False))
     #    syn = sim.StaticSynapse(delay=rd)
@@ -414,13 +453,26 @@ class TestFromFileConnector(unittest.TestCase):
         ]
 
     def tearDown(self, sim=sim):
-        for path in ("test.connections", "test.connections.1", "test.connections.2"):
+        for path in ("test.connections", "test.connections.1", "test.connections.2",
+                     "test_connections.npy", "test_connections.index.npz"):
             if os.path.exists(path):
                 try:
                     os.remove(path)
                 except PermissionError:
                     pass
 
+    def test_connect_with_numpy_memmap_file(self, sim=sim):
+        file = recording.files.NumpyMemmapFile("test_connections.npy", mode='wb')
+        file.write(self.connection_list, {"columns": ["i", "j", "weight", "delay"]})
+        C = connectors.FromFileConnector("test_connections.npy")
+        syn = sim.StaticSynapse()
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        # only the rows for local targets are read
+        self.assertEqual(C.conn_list.shape, (2, 4))
+        self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),
+                         [(0, 1, 0.5, 0.14),
+                          (2, 3, 0.3, 0.12)])
+
     def test_connect_with_standard_text_file_not_distributed(self, sim=sim):
         np.savetxt("test.connections", self.connection_list)
         C = connectors.FromFileConnector("test.connections", distributed=False)
@@ -470,11 +522,17 @@ class TestFixedNumberPostConnector(unittest.TestCase):
         C = connectors.FixedNumberPostConnector(n=3, rng=MockRNG(delta=1))
         syn = sim.StaticSynapse(weight="0.5*d")
         prj = sim.Projection(self.p1, self.p2, C, syn)
-        # MockRNG.permutation(arr) returns the reverse of arr, so each pre neuron will connect to neurons 4, 3, 2
-        # however, only neuron 3 is on the "local" (fake MPI) node
+        # since n is more than half the population size, the two neurons which are *not*
+        # connected to are drawn: (0, 1), (2, 3), (4, 0), (1, 2) with the MockRNG, so
+        #   0 - 2 3 4
+        #   1 - 0 1 4
+        #   2 - 1 2 3
+        #   3 - 0 3 4
+        # however, only neurons 1 and 3 are on the "local" (fake MPI) node
         self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
-                         [(0, 3, 1.5, 0.123),
-                          (1, 3, 1.0, 0.123),
+                         [(1, 1, 0.0, 0.123),
+                          (2, 1, 0.5, 0.123),
+                          (0, 3, 1.5, 0.123),
                           (2, 3, 0.5, 0.123),
                           (3, 3, 0.0, 0.123)])
 
@@ -482,19 +540,19 @@ class TestFixedNumberPostConnector(unittest.TestCase):
         C = connectors.FixedNumberPostConnector(n=7, rng=MockRNG(delta=1))
         syn = sim.StaticSynapse()
         prj = sim.Projection(self.p1, self.p2, C, syn)
-        # each pre neuron will connect to all post neurons (population size 5 is less than n), then to 4, 3 (MockRNG.permutation)
+        # each pre neuron will connect to all post neurons (population size 5 is less than n),
+        # then to two more, drawn by MockRNG: (0, 1), (2, 3), (4, 0), (1, 2)
         self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
                          [(0, 1, 0.0, 0.123),
+                          (0, 1, 0.0, 0.123),
                           (1, 1, 0.0, 0.123),
                           (2, 1, 0.0, 0.123),
                           (3, 1, 0.0, 0.123),
-                          (0, 3, 0.0, 0.123),
+                          (3, 1, 0.0, 0.123),
                           (0, 3, 0.0, 0.123),
                           (1, 3, 0.0, 0.123),
                           (1, 3, 0.0, 0.123),
                           (2, 3, 0.0, 0.123),
-                          (2, 3, 0.0, 0.123),
-                          (3, 3, 0.0, 0.123),
                           (3, 3, 0.0, 0.123)])
 
     def test_with_n_larger_than_population_size_no_self_connections(self, sim=sim):
@@ -503,11 +561,12 @@ class TestFixedNumberPostConnector(unittest.TestCase):
         syn = sim.StaticSynapse()
         prj = sim.Projection(self.p2, self.p2, C, syn)
         # connections as follows: (pre - list of post)
-        #   0 - 1 2 3 4 4 3 2
-        #   1 - 0 2 3 4 4 3 2
-        #   2 - 0 1 3 4 4 3 1
-        #   3 - 0 1 2 4 4 2 1
-        #   4 - 0 1 2 3 3 2 1
+        # (after one full set, the neuron left out of the second set is drawn by MockRNG)
+        #   0 - 1 2 3 4 2 3 4
+        #   1 - 0 2 3 4 0 3 4
+        #   2 - 0 1 3 4 0 1 4
+        #   3 - 0 1 2 4 0 1 2
+        #   4 - 0 1 2 3 1 2 3
         self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
                          [(0, 1, 0.0, 0.123),
                           (2, 1, 0.0, 0.123),
@@ -521,7 +580,6 @@ class TestFixedNumberPostConnector(unittest.TestCase):
                           (1, 3, 0.0, 0.123),
                           (1, 3, 0.0, 0.123),
                           (2, 3, 0.0, 0.123),
-                          (2, 3, 0.0, 0.123),
                           (4, 3, 0.0, 0.123),
                           (4, 3, 0.0, 0.123), ])
 
@@ -559,16 +617,19 @@ class TestFixedNumberPostConnector(unittest.TestCase):
                                                 allow_self_connections=False, rng=MockRNG(start=2, delta=1))
         syn = sim.StaticSynapse()
         prj = sim.Projection(self.p2, self.p2, C, syn)
-        # 0 - 2 3 4
-        # 1 - 0 2 3
-        # 2 - 4 0 1
-        # 3 - 2 4 0
-        # 4 - 1 2 3
+        # targets are drawn from the four other neurons, skipping over the source index
+        # 0 - 3 4 1
+        # 1 - 2 3 4
+        # 2 - 0 1 3
+        # 3 - 4 0 1
+        # 4 - 2 3 0
         self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
-                         [(2, 1, 0.0, 0.123),
-                          (4, 1, 0.0, 0.123),
+                         [(0, 1, 0.0, 0.123),
+                          (2, 1, 0.0, 0.123),
+                          (3, 1, 0.0, 0.123),
                           (0, 3, 0.0, 0.123),
                           (1, 3, 0.0, 0.123),
+                          (2, 3, 0.0, 0.123),
                           (4, 3, 0.0, 0.123)])
 
 
@@ -766,7 +827,7 @@ class TestArrayConnector(unittest.TestCase):
         self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),  # use gather False because we are faking the MPI
                          [(1, 0, 0.0, 1.0),
                           (0, 2, 3.0, 1.3),
-                          (2, 2, 4.0, 1.4000000000000001)])  # better to do an "almost-equal" check
+                          (2, 2, 4.0, 1.4)])  # better to do an "almost-equal" check
 
 
 class TestCloneConnector(unittest.TestCase):
@@ -935,3 +996,20 @@ class TestFixedTotalNumberConnector(unittest.TestCase):
         connections = prj.get(["weight", "delay"], format='list', gather=False)
         self.assertLess(len(connections), 12)    # unlikely to be 12, since we have 2 MPI nodes
         self.assertGreater(len(connections), 0)  # unlikely to be 0
+
+    def test_parallel_safe(self):
+        C = connectors.FixedTotalNumberConnector(n=12, rng=random.NumpyRNG(seed=72,
+                                                                           parallel_safe=True))
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        local_connections = prj.get("weight", format='list', gather=False)
+
+        sim.setup(num_processes=1, rank=0, min_delay=0.123)
+        p1 = sim.Population(4, sim.IF_cond_exp(), structure=space.Line())
+        p2 = sim.Population(5, sim.HH_cond_exp(), structure=space.Line())
+        C = connectors.FixedTotalNumberConnector(n=12, rng=random.NumpyRNG(seed=72,
+                                                                           parallel_safe=True))
+        prj = sim.Projection(p1, p2, C, sim.StaticSynapse())
+        all_connections = prj.get("weight", format='list', gather=False)
+        self.assertEqual(len(all_connections), 12)
+        self.assertEqual(local_connections,
+                         [(i, j, w) for i, j, w in all_connections if j in (1, 3)])
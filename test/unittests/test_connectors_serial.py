@@ -6,12 +6,15 @@ Tests of the Connector classes, using the pyNN.mock backend.
 """
 
 import unittest
+from unittest.mock import patch
 
 from pyNN import connectors, random, errors, space, recording
 import numpy as np
 from numpy import nan
 import os
+import shutil
 import sys
+import tempfile
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 from .mocks import MockRNG, MockRNG2, MockRNG3
 import pyNN.mock as sim
@@ -250,6 +253,28 @@ class TestAllToAllConnector(unittest.TestCase):
         C = connectors.AllToAllConnector()
         self.assertRaises(errors.ConnectionError, sim.Projection, self.p1, self.p2, C, syn)
 
+    def test_connect_with_invalid_weight_reports_connection(self, sim=sim):
+        weights = np.full((self.p1.size, self.p2.size), 0.1)
+        weights[2, 3] = -0.1
+        syn = sim.StaticSynapse(weight=weights)
+        C = connectors.AllToAllConnector()
+        with self.assertRaises(errors.ConnectionError) as context:
+            sim.Projection(self.p1, self.p2, C, syn)
+        self.assertIn("pre-synaptic index 2 to post-synaptic index 3", str(context.exception))
+
+    def test_homogeneous_weights_checked_once(self, sim=sim):
+        checked = []
+
+        def check_weights(weights, projection):
+            checked.append(weights)
+
+        syn = sim.StaticSynapse(weight=0.1)
+        syn.parameter_checks = {'weight': check_weights}
+        C = connectors.AllToAllConnector()
+        C.column_block_size = 2
+        sim.Projection(self.p1, self.p2, C, syn)
+        self.assertEqual(checked, [0.1])
+
 
 class TestFixedProbabilityConnector(unittest.TestCase):
 
@@ -281,6 +306,20 @@ class TestFixedProbabilityConnector(unittest.TestCase):
                           (0, 2, 0.0, 0.123)
                           ])
 
+    def test_connect_with_threads_from_setup(self, sim=sim):
+        syn = sim.StaticSynapse(weight=random.RandomDistribution('normal', (0.5, 0.1),
+                                                                 rng=random.NumpyRNG(seed=11)))
+        connections = []
+        for n_threads in (1, 3):
+            sim.setup(n_threads=n_threads)
+            p1 = sim.Population(50, sim.IF_cond_exp())
+            p2 = sim.Population(40, sim.IF_cond_exp())
+            C = connectors.FixedProbabilityConnector(p_connect=0.3, rng=random.NumpyRNG(seed=5))
+            C.column_block_size = 3
+            prj = sim.Projection(p1, p2, C, syn)
+            connections.append(prj.get(["weight"], format='list'))
+        self.assertEqual(connections[0], connections[1])
+
     def test_connect_with_default_args_again(self, sim=sim):
         C = connectors.FixedProbabilityConnector(p_connect=0.5,
                                                  rng=MockRNG2(1 - np.array([1, 0, 0, 1,
@@ -402,6 +441,70 @@ class TestFixedProbabilityConnector(unittest.TestCase):
                                                [1.2,   1.4,   nan,   nan,   2.8]]),
                                   9)
 
+    def test_connect_in_column_blocks(self, sim=sim):
+        results = []
+        for block_size in (1, 2, 1000):
+            rd = random.RandomDistribution('uniform', low=0.1, high=1.1,
+                                           rng=MockRNG(start=1.0, delta=0.25))
+            syn = sim.StaticSynapse(weight=lambda d: 0.1 * d, delay=rd)
+            C = connectors.FixedProbabilityConnector(p_connect=0.5,
+                                                     rng=MockRNG2(1 - np.array([1, 0, 0, 1,
+                                                                                   0, 0, 0, 1,
+                                                                                   1, 1, 0, 0,
+                                                                                   1, 0, 1, 0,
+                                                                                   1, 1, 0, 1])))
+            C.column_block_size = block_size
+            prj = sim.Projection(self.p1, self.p2, C, syn)
+            results.append(prj.get(["weight", "delay"], format='list'))
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+        self.assertEqual(results[0][-1], (3, 4, 0.1, 3.25))
+
+    def test_connect_sparse(self, sim=sim):
+        p1 = sim.Population(300, sim.IF_cond_exp())
+        C = connectors.FixedProbabilityConnector(p_connect=0.05, sparse=True,
+                                                 rng=random.NumpyRNG(seed=7213))
+        C.column_block_size = 64
+        prj = sim.Projection(p1, p1, C, sim.StaticSynapse())
+        connections = np.array(prj.get([], format='list'), dtype=int)
+        # 4500 connections expected, standard deviation ~66
+        self.assertLess(abs(len(connections) - 4500), 330)
+        # no repeated connections
+        self.assertEqual(len(np.unique(connections, axis=0)), len(connections))
+        # sources for each target are roughly uniformly distributed
+        self.assertLess(abs(connections[:, 0].mean() - 149.5), 5.0)
+
+    def test_connect_sparse_no_self_connections(self, sim=sim):
+        p1 = sim.Population(100, sim.IF_cond_exp())
+        for allow_self_connections in (False, 'NoMutual'):
+            C = connectors.FixedProbabilityConnector(p_connect=1.0, sparse=True,
+                                                     allow_self_connections=allow_self_connections)
+            prj = sim.Projection(p1, p1, C, sim.StaticSynapse())
+            connections = np.array(prj.get([], format='list'), dtype=int)
+            if allow_self_connections:
+                self.assertEqual(len(connections), 100 * 99 // 2)
+                self.assertTrue((connections[:, 0] > connections[:, 1]).all())
+            else:
+                self.assertEqual(len(connections), 100 * 99)
+                self.assertTrue((connections[:, 0] != connections[:, 1]).all())
+
+    def test_connect_sparse_no_self_connections_with_views(self, sim=sim):
+        p1 = sim.Population(50, sim.IF_cond_exp())
+        C = connectors.FixedProbabilityConnector(p_connect=0.5, sparse=True,
+                                                 allow_self_connections=False,
+                                                 rng=random.NumpyRNG(seed=42))
+        prj = sim.Projection(p1[10:40], p1[::2], C, sim.StaticSynapse())
+        connections = np.array(prj.get([], format='list'), dtype=int)
+        self.assertTrue(len(connections) > 0)
+        pre_ids = p1[10:40].all_cells[connections[:, 0]]
+        post_ids = p1[::2].all_cells[connections[:, 1]]
+        self.assertTrue((pre_ids != post_ids).all())
+
+    def test_get_parameters_includes_sparse(self, sim=sim):
+        C = connectors.FixedProbabilityConnector(p_connect=0.5, sparse=True)
+        self.assertEqual(C.get_parameters(),
+                         {'allow_self_connections': True, 'p_connect': 0.5, 'sparse': True})
+
 
 class TestDistanceDependentProbabilityConnector(unittest.TestCase):
 
@@ -433,6 +536,69 @@ class TestDistanceDependentProbabilityConnector(unittest.TestCase):
                           (3, 3, 0.0, 0.123),
                           (3, 4, 0.0, 0.123)])
 
+    def test_connect_with_max_distance(self, sim=sim):
+        syn = sim.StaticSynapse(weight=lambda d: 0.1 * d)
+        C = connectors.DistanceDependentProbabilityConnector(d_expression="d<1.5")
+        expected = sim.Projection(self.p1, self.p2, C, syn).get("weight", format='list')
+        for max_distance in (1.6, 2.0, 10.0, "auto"):
+            C = connectors.DistanceDependentProbabilityConnector(d_expression="d<1.5",
+                                                                 max_distance=max_distance)
+            prj = sim.Projection(self.p1, self.p2, C, syn)
+            self.assertEqual(prj.get("weight", format='list'), expected)
+
+    def test_connect_with_max_distance_periodic_boundaries(self, sim=sim):
+        p = sim.Population(20, sim.IF_cond_exp(), structure=space.Line())
+        for allow_self_connections in (True, False, 'NoMutual'):
+            prj = sim.Projection(p, p,
+                                 connectors.DistanceDependentProbabilityConnector(
+                                     "exp(-d)", max_distance=3.5,
+                                     allow_self_connections=allow_self_connections),
+                                 sim.StaticSynapse(),
+                                 space=space.Space(periodic_boundaries=((0, 20), None, None)))
+            connections = np.array(prj.get([], format='list'), dtype=int)[:, :2]
+            distances = np.abs(connections[:, 0] - connections[:, 1])
+            distances = np.minimum(distances, 20 - distances)
+            self.assertTrue((distances <= 3).all())
+            # connections across the boundary
+            self.assertTrue((np.abs(connections[:, 0] - connections[:, 1]) > 3).any())
+            if allow_self_connections == 'NoMutual':
+                self.assertTrue((connections[:, 0] > connections[:, 1]).all())
+            elif not allow_self_connections:
+                self.assertTrue((distances > 0).all())
+
+    def test_connect_with_threads(self, sim=sim):
+        p = sim.Population(60, sim.IF_cond_exp(), structure=space.Line())
+        syn = sim.StaticSynapse(weight=random.RandomDistribution('uniform', (0.1, 0.5),
+                                                                 rng=random.NumpyRNG(seed=7)),
+                                delay=lambda d: 0.2 + 0.1 * d)
+        connections = []
+        for n_threads in (1, 4):
+            C = connectors.DistanceDependentProbabilityConnector(d_expression="exp(-d/5)",
+                                                                 rng=random.NumpyRNG(seed=3))
+            C.column_block_size = 7
+            C.n_threads = n_threads
+            prj = sim.Projection(p, p, C, syn)
+            connections.append(prj.get(["weight", "delay"], format='list'))
+        self.assertGreater(len(connections[0]), 0)
+        self.assertEqual(connections[0], connections[1])
+
+    def test_find_support_radius(self, sim=sim):
+        C = connectors.DistanceDependentProbabilityConnector(d_expression="(d<2.5)*exp(-d)",
+                                                             max_distance="auto")
+        prj = sim.Projection(self.p1, self.p2, connectors.OneToOneConnector(), sim.StaticSynapse())
+        radius = C._find_support_radius(prj)
+        self.assertGreaterEqual(radius, 2.5)
+        self.assertLess(radius, 2.51)
+
+    def test_get_parameters_includes_max_distance(self, sim=sim):
+        C = connectors.DistanceDependentProbabilityConnector(d_expression="exp(-d)",
+                                                             max_distance=50.0)
+        self.assertEqual(C.get_parameters(),
+                         {'allow_self_connections': True, 'd_expression': "exp(-d)",
+                          'max_distance': 50.0})
+        self.assertNotEqual(C.get_parameters(),
+                            connectors.DistanceDependentProbabilityConnector("exp(-d)").get_parameters())
+
 
 class TestFromListConnector(unittest.TestCase):
 
@@ -480,6 +646,42 @@ class TestFromListConnector(unittest.TestCase):
                           (2, 2, 0.4, 0.15),
                           (2, 3, 0.3, 0.16)])
 
+    def test_connect_with_array_preserves_order_within_target(self, sim=sim):
+        connection_list = np.array([
+            (3, 2, 0.1, 0.18),
+            (1, 0, 0.2, 0.17),
+            (2, 2, 0.3, 0.16),
+            (0, 2, 0.4, 0.15),
+            (1, 0, 0.5, 0.14),
+        ])
+        original = connection_list.copy()
+        C = connectors.FromListConnector(connection_list)
+        syn = sim.StaticSynapse()
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        self.assertEqual(prj.get(["weight", "delay"], format='list'),
+                         [(1, 0, 0.2, 0.17),
+                          (1, 0, 0.5, 0.14),
+                          (3, 2, 0.1, 0.18),
+                          (2, 2, 0.3, 0.16),
+                          (0, 2, 0.4, 0.15)])
+        assert_array_equal(C.conn_list, original)
+
+    def test_list_index_columns_stored_as_integers(self, sim=sim):
+        connection_list = [
+            (3, 2, 0.1, 0.18),
+            (1, 0, 0.2, 0.17),
+            (2, 2, 0.3, 0.16),
+        ]
+        C = connectors.FromListConnector(connection_list)
+        self.assertEqual(C._indices.dtype, int)
+        assert_array_equal(C._indices, np.array([(3, 2), (1, 0), (2, 2)]))
+        assert_array_equal(C.conn_list, np.array(connection_list))
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        self.assertEqual(prj.get(["weight", "delay"], format='list'),
+                         [(1, 0, 0.2, 0.17),
+                          (3, 2, 0.1, 0.18),
+                          (2, 2, 0.3, 0.16)])
+
     def test_connect_with_out_of_range_index(self, sim=sim):
         connection_list = [
             (0, 0, 0.1, 0.1),
@@ -528,7 +730,8 @@ class TestFromFileConnector(unittest.TestCase):
 
     def tearDown(self, sim=sim):
         sim.end()
-        for path in ("test.connections", "test.connections.1", "test.connections.2"):
+        for path in ("test.connections", "test.connections.1", "test.connections.2",
+                     "test_connections.npy", "test_connections.index.npz"):
             if os.path.exists(path):
                 os.remove(path)
 
@@ -564,6 +767,18 @@ class TestFromFileConnector(unittest.TestCase):
                           (2, 2, 0.4, 0.13, 130.0, 97.0, 88.8),
                           (2, 3, 0.3, 0.12, 120.0, 98.0, 88.8)])
 
+    def test_save_and_connect_with_numpy_memmap_file(self, sim=sim):
+        syn = sim.StaticSynapse()
+        prj = sim.Projection(self.p1, self.p2,
+                             connectors.FromListConnector(self.connection_list), syn)
+        prj.save("all", "test_connections.npy")
+        file = recording.files.NumpyMemmapFile("test_connections.npy")
+        self.assertEqual(file.get_metadata(), {"columns": ["i", "j", "weight", "delay"]})
+        C = connectors.FromFileConnector("test_connections.npy")
+        prj2 = sim.Projection(self.p1, self.p2, C, syn)
+        self.assertEqual(prj2.get(["weight", "delay"], format='list'),
+                         prj.get(["weight", "delay"], format='list'))
+
 
 class TestFixedNumberPreConnector(unittest.TestCase):
 
@@ -879,6 +1094,93 @@ class TestArrayConnector(unittest.TestCase):
                                    (1, 3, 5.0, 1.5)])
 
 
+class TestSparseMatrixConnector(unittest.TestCase):
+
+    def setUp(self, sim=sim, **extra):
+        sim.setup(min_delay=0.123, **extra)
+        self.p1 = sim.Population(3, sim.IF_cond_exp(), structure=space.Line())
+        self.p2 = sim.Population(4, sim.HH_cond_exp(), structure=space.Line())
+
+    def tearDown(self, sim=sim):
+        sim.end()
+
+    def test_connect_with_weights_and_delays(self, sim=sim):
+        from scipy import sparse
+        weights = sparse.csr_matrix(np.array([
+            [0.0, 0.1, 0.2, 0.0],
+            [0.3, 0.4, 0.0, 0.5],
+            [0.0, 0.0, 0.6, 0.0],
+        ]))
+        delays = weights.copy()
+        delays.data = np.arange(1.0, 7.0)
+        C = connectors.SparseMatrixConnector(weights, delays)
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        self.assertEqual(prj.get(["weight", "delay"], format='list'),
+                         [(1, 0, 0.3, 3.0),
+                          (0, 1, 0.1, 1.0),
+                          (1, 1, 0.4, 4.0),
+                          (0, 2, 0.2, 2.0),
+                          (2, 2, 0.6, 6.0),
+                          (1, 3, 0.5, 5.0)])
+        assert_array_almost_equal(prj.to_sparse("weight").toarray(), weights.toarray())
+
+    def test_connect_with_delays_from_synapse_type(self, sim=sim):
+        from scipy import sparse
+        weights = sparse.coo_matrix(([0.1, 0.2], ([0, 2], [3, 1])), shape=(3, 4))
+        C = connectors.SparseMatrixConnector(weights)
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse(delay=0.5))
+        self.assertEqual(prj.get(["weight", "delay"], format='list'),
+                         [(2, 1, 0.2, 0.5),
+                          (0, 3, 0.1, 0.5)])
+
+    def test_connect_with_invalid_weights(self, sim=sim):
+        from scipy import sparse
+        weights = sparse.csr_matrix(np.array([[0.1, -0.1, 0.0, 0.0]] * 3))
+        C = connectors.SparseMatrixConnector(weights)
+        self.assertRaises(errors.ConnectionError, sim.Projection, self.p1, self.p2, C,
+                          sim.StaticSynapse())
+
+    def test_with_wrong_shape(self, sim=sim):
+        from scipy import sparse
+        C = connectors.SparseMatrixConnector(sparse.csr_matrix((4, 3)))
+        self.assertRaises(errors.ConnectionError, sim.Projection, self.p1, self.p2, C,
+                          sim.StaticSynapse())
+
+    def test_with_mismatched_delays(self, sim=sim):
+        from scipy import sparse
+        weights = sparse.csr_matrix(np.eye(3, 4))
+        delays = sparse.csr_matrix(np.ones((3, 4)))
+        self.assertRaises(errors.ConnectionError, connectors.SparseMatrixConnector,
+                          weights, delays)
+
+
+@unittest.skipUnless(connectors.haveCSA, "Requires the csa package")
+class TestCSAConnector(unittest.TestCase):
+
+    def setUp(self, sim=sim):
+        sim.setup(num_processes=2, rank=1, min_delay=0.123)
+        self.p1 = sim.Population(4, sim.IF_cond_exp(), structure=space.Line())
+        self.p2 = sim.Population(5, sim.HH_cond_exp(), structure=space.Line())
+        assert_array_equal(self.p2._mask_local, np.array([0, 1, 0, 1, 0], dtype=bool))
+
+    def test_connect_with_mask(self, sim=sim):
+        import csa
+        C = connectors.CSAConnector(csa.oneToOne)
+        syn = sim.StaticSynapse(weight=0.5, delay=0.5)
+        prj = sim.Projection(self.p1, self.p2, C, syn)
+        self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),
+                         [(1, 1, 0.5, 0.5),
+                          (3, 3, 0.5, 0.5)])
+
+    def test_connect_with_value_set(self, sim=sim):
+        import csa
+        C = connectors.CSAConnector(csa.cset(csa.oneToOne, 0.2, 0.3))
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        self.assertEqual(prj.get(["weight", "delay"], format='list', gather=False),
+                         [(1, 1, 0.2, 0.3),
+                          (3, 3, 0.2, 0.3)])
+
+
 class TestCloneConnector(unittest.TestCase):
 
     def setUp(self, sim=sim, **extra):
@@ -926,6 +1228,38 @@ class TestCloneConnector(unittest.TestCase):
         p3 = sim.Population(5, sim.IF_cond_exp(), structure=space.Line())
         self.assertRaises(errors.ConnectionError, sim.Projection, self.p1, p3, C, syn)
 
+    def test_connect_with_multiple_connections_per_pair(self, sim=sim):
+        connection_list = [
+            (0, 0, 0.1, 1.0),
+            (0, 0, 0.2, 1.0),
+            (2, 3, 0.3, 1.0),
+        ]
+        ref_prj = sim.Projection(self.p1, self.p2,
+                                 connectors.FromListConnector(connection_list),
+                                 sim.StaticSynapse())
+        prj = sim.Projection(self.p1, self.p2, connectors.CloneConnector(ref_prj),
+                             sim.StaticSynapse(weight=5.0, delay=0.5))
+        self.assertEqual(prj.get(["weight", "delay"], format='list'),
+                         [(0, 0, 5.0, 0.5),
+                          (0, 0, 5.0, 0.5),
+                          (2, 3, 5.0, 0.5)])
+
+    def test_connect_reusing_parameters(self, sim=sim):
+        connection_list = [
+            (0, 0, 0.1, 1.0),
+            (3, 0, 0.2, 1.1),
+            (2, 3, 0.3, 1.2),
+        ]
+        ref_prj = sim.Projection(self.p1, self.p2,
+                                 connectors.FromListConnector(connection_list),
+                                 sim.StaticSynapse())
+        C = connectors.CloneConnector(ref_prj, reuse_parameters=True)
+        prj = sim.Projection(self.p1, self.p2, C, sim.TsodyksMarkramSynapse(U=0.7))
+        self.assertEqual(prj.get(["weight", "delay", "U"], format='list'),
+                         [(0, 0, 0.1, 1.0, 0.7),
+                          (3, 0, 0.2, 1.1, 0.7),
+                          (2, 3, 0.3, 1.2, 0.7)])
+
 
 class TestIndexBasedProbabilityConnector(unittest.TestCase):
 
@@ -980,6 +1314,31 @@ class TestIndexBasedProbabilityConnector(unittest.TestCase):
                           (3, 3, 10., 2),
                           (2, 4, 9., 2)])
 
+    def test_connect_with_block_evaluation(self, sim=sim):
+
+        class RandomProbability(connectors.IndexBasedExpression):
+
+            def __call__(self, i, j):
+                return np.cos(i * 0.7 + j * 1.3) ** 2
+
+        class BlockRandomProbability(RandomProbability):
+            supports_blocks = True
+
+        class BlockWeights(self.IndexBasedWeights):
+            supports_blocks = True
+
+        p = sim.Population(40, sim.IF_cond_exp())
+        connections = []
+        for probability, weights in ((RandomProbability(), self.IndexBasedWeights()),
+                                     (BlockRandomProbability(), BlockWeights())):
+            C = connectors.IndexBasedProbabilityConnector(probability, allow_self_connections=False,
+                                                          rng=random.NumpyRNG(seed=17))
+            C.column_block_size = 7
+            prj = sim.Projection(p, p, C, sim.StaticSynapse(weight=weights))
+            connections.append(prj.get(["weight"], format='list'))
+        self.assertGreater(len(connections[0]), 0)
+        self.assertEqual(connections[0], connections[1])
+
     def test_connect_with_index_based_delays(self, sim=sim):
         syn = sim.StaticSynapse(weight=1.0, delay=self.IndexBasedDelays())
         C = connectors.IndexBasedProbabilityConnector(self.IndexBasedProbability())
@@ -1060,6 +1419,229 @@ class TestFixedTotalNumberConnector(unittest.TestCase):
         connections = prj.get(["weight", "delay"], format='list', gather=False)
         self.assertEqual(len(connections), 12)
 
+    def test_no_self_connections(self):
+        C = connectors.FixedTotalNumberConnector(n=200, allow_self_connections=False,
+                                                 rng=random.NumpyRNG(seed=8658764))
+        prj = sim.Projection(self.p2, self.p2, C, sim.StaticSynapse())
+        connections = np.array(prj.get("weight", format='list', gather=False))
+        self.assertEqual(len(connections), 200)
+        self.assertTrue((connections[:, 0] != connections[:, 1]).all())
+
+    def test_with_parallel_unsafe_rng(self):
+        C = connectors.FixedTotalNumberConnector(n=12,
+                                                 rng=random.NumpyRNG(seed=1, parallel_safe=False))
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        self.assertEqual(len(prj.get("weight", format='list', gather=False)), 12)
+
+
+class TestFixedNumberPostConnector(unittest.TestCase):
+
+    def setUp(self, sim=sim):
+        sim.setup(num_processes=1, rank=0, min_delay=0.123)
+        self.p1 = sim.Population(50, sim.IF_cond_exp())
+        self.p2 = sim.Population(40, sim.HH_cond_exp())
+
+    def test_without_replacement(self):
+        rng = random.NumpyRNG(seed=3752)
+        for n, allow_self_connections in ((10, True), (35, True), (95, True), (30, False)):
+            C = connectors.FixedNumberPostConnector(n=n, rng=rng,
+                                                    allow_self_connections=allow_self_connections)
+            if allow_self_connections:
+                prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+                n_candidates = self.p2.size
+            else:
+                prj = sim.Projection(self.p2, self.p2, C, sim.StaticSynapse())
+                n_candidates = self.p2.size - 1
+            connections = np.array(prj.get("weight", format='list'), dtype=int)[:, :2]
+            for i in range(prj.pre.size):
+                targets = connections[connections[:, 0] == i, 1]
+                self.assertEqual(targets.size, n)
+                counts = np.bincount(targets, minlength=self.p2.size)
+                if not allow_self_connections:
+                    self.assertEqual(counts[i], 0)
+                    counts = np.delete(counts, i)
+                # each neuron is chosen either n // n_candidates or n // n_candidates + 1 times
+                self.assertTrue(np.isin(counts, (n // n_candidates, n // n_candidates + 1)).all())
+
+
+class TestSmallWorldConnector(unittest.TestCase):
+
+    def setUp(self, sim=sim):
+        sim.setup(num_processes=1, rank=0, min_delay=0.123)
+        self.p1 = sim.Population(40, sim.IF_cond_exp(), structure=space.Line())
+        self.p2 = sim.Population(50, sim.HH_cond_exp(), structure=space.Line())
+
+    def _connections(self, prj):
+        return np.array(prj.get("weight", format='list'), dtype=int).reshape(-1, 3)[:, :2]
+
+    def test_connect_without_rewiring(self, sim=sim):
+        C = connectors.SmallWorldConnector(degree=2.5, rewiring=0.0,
+                                           rng=random.NumpyRNG(seed=8743))
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        lattice = connectors.DistanceDependentProbabilityConnector("d < 2.5")
+        lattice_prj = sim.Projection(self.p1, self.p2, lattice, sim.StaticSynapse())
+        assert_array_equal(self._connections(prj), self._connections(lattice_prj))
+
+    def test_connect_with_n_connections_no_self_connections(self, sim=sim):
+        C = connectors.SmallWorldConnector(degree=10.0, rewiring=0.0, n_connections=2,
+                                           allow_self_connections=False,
+                                           rng=random.NumpyRNG(seed=8743))
+        prj = sim.Projection(self.p1, self.p1, C, sim.StaticSynapse())
+        connections = self._connections(prj)
+        self.assertEqual(connections.shape, (2 * self.p1.size, 2))
+        # each neuron is connected to its two nearest neighbours
+        self.assertEqual(connections[0].tolist(), [1, 0])
+        self.assertEqual(connections[1].tolist(), [2, 0])
+        self.assertEqual(connections[2].tolist(), [0, 1])
+        self.assertEqual(connections[3].tolist(), [2, 1])
+
+    def test_connect_with_rewiring(self, sim=sim):
+        C = connectors.SmallWorldConnector(degree=2.5, rewiring=0.3, allow_self_connections=False,
+                                           rng=random.NumpyRNG(seed=8743))
+        prj = sim.Projection(self.p2, self.p2, C, sim.StaticSynapse())
+        connections = self._connections(prj)
+        # rewiring changes the sources, but not the number of connections per target
+        assert_array_equal(np.bincount(connections[:, 1]), [2, 3] + [4] * 46 + [3, 2])
+        self.assertFalse((connections[:, 0] == connections[:, 1]).any())
+        rewired = np.abs(connections[:, 0] - connections[:, 1]) > 2
+        self.assertTrue(0.15 < rewired.mean() < 0.4)
+
+    def test_local_columns_do_not_depend_on_number_of_processes(self, sim=sim):
+        def connect():
+            C = connectors.SmallWorldConnector(degree=2.5, rewiring=0.5,
+                                               rng=random.NumpyRNG(seed=8743))
+            prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+            return self._connections(prj)
+        all_connections = connect()
+        sim.setup(num_processes=2, rank=1, min_delay=0.123)
+        self.p1 = sim.Population(40, sim.IF_cond_exp(), structure=space.Line())
+        self.p2 = sim.Population(50, sim.HH_cond_exp(), structure=space.Line())
+        local_connections = np.array(sim.Projection(
+            self.p1, self.p2,
+            connectors.SmallWorldConnector(degree=2.5, rewiring=0.5,
+                                           rng=random.NumpyRNG(seed=8743)),
+            sim.StaticSynapse()).get("weight", format='list', gather=False),
+            dtype=int)[:, :2]
+        assert_array_equal(local_connections, all_connections[all_connections[:, 1] % 2 == 1])
+
+
+class TestCachedConnector(unittest.TestCase):
+
+    def setUp(self, sim=sim):
+        sim.setup(num_processes=1, rank=0, min_delay=0.123)
+        self.p1 = sim.Population(20, sim.IF_cond_exp(), structure=space.Line())
+        self.p2 = sim.Population(30, sim.HH_cond_exp(), structure=space.Line())
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self, sim=sim):
+        shutil.rmtree(self.directory)
+
+    def _cached_connector(self, seed=871, **cache_parameters):
+        rng = random.NumpyRNG(seed=seed)
+        return connectors.CachedConnector(
+            connectors.FixedProbabilityConnector(0.3, rng=rng),
+            cache=connectors.ConnectionCache(self.directory, **cache_parameters))
+
+    def _cache_files(self):
+        return [name for _, _, names in os.walk(self.directory) for name in names]
+
+    def test_connect_from_cache(self, sim=sim):
+        syn = sim.StaticSynapse(weight=random.RandomDistribution('uniform', (0, 1),
+                                                                 rng=random.NumpyRNG(seed=4)))
+        C1 = self._cached_connector()
+        prj1 = sim.Projection(self.p1, self.p2, C1, syn)
+        self.assertEqual(len(self._cache_files()), 1)
+
+        C2 = self._cached_connector()
+        with patch.object(connectors.FixedProbabilityConnector, "connect") as connect:
+            prj2 = sim.Projection(self.p1, self.p2, C2, syn)
+        connect.assert_not_called()
+        self.assertEqual(prj2.get(["weight", "delay"], format='list'),
+                         prj1.get(["weight", "delay"], format='list'))
+        # the RNG is left in the same state as if the connections had been generated
+        assert_array_equal(C2.connector.rng.rng.get_state()[1],
+                           C1.connector.rng.rng.get_state()[1])
+
+    def test_cache_miss_with_different_seed_or_populations(self, sim=sim):
+        sim.Projection(self.p1, self.p2, self._cached_connector(), sim.StaticSynapse())
+        sim.Projection(self.p1, self.p2, self._cached_connector(seed=872), sim.StaticSynapse())
+        sim.Projection(self.p2, self.p1, self._cached_connector(), sim.StaticSynapse())
+        self.assertEqual(len(self._cache_files()), 3)
+
+    def test_not_cached_without_seed(self, sim=sim):
+        C = connectors.CachedConnector(connectors.FixedProbabilityConnector(0.3),
+                                       cache=connectors.ConnectionCache(self.directory))
+        C.connector.rng = random.NumpyRNG()
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        self.assertGreater(len(prj), 0)
+        self.assertEqual(self._cache_files(), [])
+
+    def test_least_recently_used_entries_are_evicted(self, sim=sim):
+        C = self._cached_connector()
+        sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        entry_size = os.path.getsize(os.path.join(self.directory, "rank0_of_1",
+                                                  self._cache_files()[0]))
+        C = self._cached_connector(seed=872, max_size=int(1.5 * entry_size))
+        sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        self.assertEqual(len(self._cache_files()), 1)
+
+    def test_nested_rngs_restored_from_cache(self, sim=sim):
+        def build():
+            n = random.RandomDistribution('poisson', lambda_=5, rng=random.NumpyRNG(seed=12))
+            weights = random.RandomDistribution('uniform', (0, 1), rng=random.NumpyRNG(seed=4))
+            C = connectors.CachedConnector(
+                connectors.FixedNumberPreConnector(n=n, with_replacement=True,
+                                               rng=random.NumpyRNG(seed=7)),
+                cache=connectors.ConnectionCache(self.directory))
+            prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse(weight=weights))
+            return (prj.get("weight", format="list"),
+                    [rng.rng.get_state()[1] for rng in (n.rng, weights.rng, C.connector.rng)])
+
+        connections1, states1 = build()
+        self.assertEqual(len(self._cache_files()), 1)
+        with patch.object(connectors.FixedNumberPreConnector, "connect") as connect:
+            connections2, states2 = build()
+        connect.assert_not_called()
+        self.assertEqual(connections2, connections1)
+        for state1, state2 in zip(states1, states2):
+            assert_array_equal(state2, state1)
+
+
+class TestConnectorEstimate(unittest.TestCase):
+
+    def setUp(self, sim=sim):
+        sim.setup()
+        self.p1 = sim.Population(200, sim.IF_cond_exp(), structure=space.Line())
+        self.p2 = sim.Population(300, sim.IF_cond_exp(), structure=space.Line())
+
+    def tearDown(self, sim=sim):
+        sim.end()
+
+    def test_estimate_from_sample(self, sim=sim):
+        C = connectors.FixedProbabilityConnector(p_connect=0.2, rng=random.NumpyRNG(seed=73))
+        estimate = C.estimate(self.p1, self.p2, n_columns=50, num_processes=3)
+        self.assertFalse(estimate.exact)
+        self.assertEqual(estimate.connections_per_process.shape, (3,))
+        self.assertAlmostEqual(estimate.n_connections / (0.2 * 200 * 300), 1.0, delta=0.1)
+        assert_array_almost_equal(estimate.bytes_per_process,
+                                  estimate.connections_per_process * sim.Projection._bytes_per_connection)
+        self.assertTrue((estimate.build_time_per_process >= 0).all())
+
+    def test_estimate_is_exact_for_all_columns(self, sim=sim):
+        C = connectors.FixedTotalNumberConnector(1000, rng=random.NumpyRNG(seed=29))
+        estimate = C.estimate(self.p1, self.p2, num_processes=2)
+        self.assertTrue(estimate.exact)
+        prj = sim.Projection(self.p1, self.p2, C, sim.StaticSynapse())
+        targets = np.array(prj.get([], format='list'), dtype=int)[:, 1]
+        owners = self.p2.all_cells[targets].astype(int) % 2
+        assert_array_equal(estimate.connections_per_process, np.bincount(owners))
+
+    def test_estimate_leaves_rng_unchanged(self, sim=sim):
+        C = connectors.DistanceDependentProbabilityConnector("exp(-d/5)",
+                                                             rng=random.NumpyRNG(seed=61))
+        state = C.rng.rng.get_state()[1].copy()
+        C.estimate(self.p1, self.p1)
+        assert_array_equal(C.rng.rng.get_state()[1], state)
 
 if __name__ == "__main__":
     unittest.main()
@@ -103,6 +103,35 @@ def test_PickleFile():
 #    os.remove("tmp.npz")
 
 
+def test_NumpyMemmapFile():
+    nmf = files.NumpyMemmapFile("tmp.npy", "wb")
+    data = [(0, 2, 0.1), (1, 0, 0.2), (2, 2, 0.3), (3, 1, 0.4), (0, 4, 0.5)]
+    metadata = {'columns': ['i', 'j', 'weight'], 'b': 9.99}
+    nmf.write(data, metadata)
+    nmf.close()
+
+    nmf = files.NumpyMemmapFile("tmp.npy", "rb")
+    assert nmf.get_metadata() == metadata
+    assert isinstance(nmf.read(), np.memmap)
+    # rows are sorted by target
+    assert_array_equal(nmf.read()[:, 1], [0, 1, 2, 2, 4])
+    assert_array_equal(nmf.read_targets([2, 4]),
+                       np.array([(0, 2, 0.1), (2, 2, 0.3), (0, 4, 0.5)]))
+    assert_array_equal(nmf.read_targets([0, 3, 7]), np.array([(1, 0, 0.2)]))
+    assert nmf.read_targets([3]).shape == (0, 3)
+    nmf.close()
+
+    os.remove("tmp.npy")
+    os.remove("tmp.index.npz")
+
+
+def test_row_ranges():
+    index = np.array([0, 1, 2, 4, 4, 5])
+    starts, stops = files._row_ranges(index, [0, 1, 3, 4])
+    assert_array_equal(starts, [0, 4])
+    assert_array_equal(stops, [2, 5])
+
+
 def test_HDF5ArrayFile():
     if files.have_hdf5:
         h5f = files.HDF5ArrayFile("tmp.h5", "w")
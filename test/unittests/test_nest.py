@@ -1,10 +1,12 @@
 try:
     import pyNN.nest as sim
+    from pyNN.nest.projections import merge_connection_blocks
     import nest
 except ImportError:
     nest = False
 from pyNN.standardmodels import StandardCellType
 import unittest
+from unittest.mock import patch
 import numpy as np
 from numpy.testing import assert_array_equal, assert_array_almost_equal
 
@@ -134,6 +136,53 @@ class TestProjection(unittest.TestCase):
         prj.set(weight=weight_array)
         self.assertTrue((weight_array == prj.get("weight", format="array")).all())
 
+    def test_set_array_with_sparse_connections(self):
+        prj = sim.Projection(self.p1, self.p2, sim.FixedNumberPostConnector(n=2),
+                             synapse_type=self.syn_rnd, receptor_type="inhibitory")
+        weight_array = np.arange(7 * 4, dtype=float).reshape((7, 4)) / 100 + 0.01
+        prj.set(weight=weight_array, delay=lambda d: 0.5 + d)
+        for pre, post, weight, delay in prj.get(["weight", "delay"], format="list"):
+            self.assertAlmostEqual(weight, weight_array[int(pre), int(post)])
+            self.assertGreater(delay, 0.5)
+
+    def test_len_and_connection_cache(self):
+        prj1 = sim.Projection(self.p1, self.p2, self.all2all, synapse_type=self.syn_a2a)
+        self.assertEqual(len(prj1), 7 * 4)
+        connections = prj1.nest_connections
+        prj2 = sim.Projection(self.p1, self.p3, self.random_connect, synapse_type=self.syn_rnd)
+        self.assertEqual(len(prj2), 7 * 2)
+        # creating another projection does not invalidate the cache
+        self.assertIs(prj1.nest_connections, connections)
+        self.assertEqual(len(prj2.nest_connections), len(prj2))
+        sim.run(1.0)
+        # but NEST may reorder connections during the simulation
+        self.assertIsNot(prj1.nest_connections, connections)
+        self.assertEqual(len(prj1.nest_connections), 7 * 4)
+
+    def test_single_connect_call_per_connector(self):
+        connector = sim.AllToAllConnector()
+        connector.column_block_size = 1
+        weights = np.arange(7 * 4, dtype=float).reshape((7, 4)) / 100
+        with patch("pyNN.nest.projections.nest.Connect", wraps=nest.Connect) as connect:
+            prj = sim.Projection(self.p1, self.p2, connector,
+                                 synapse_type=sim.StaticSynapse(weight=weights, delay=0.5))
+        # one call for the first column, needed to identify the common
+        # synapse properties, and a single call for the remaining columns
+        self.assertEqual(connect.call_count, 2)
+        self.assertEqual(len(prj), 7 * 4)
+        assert_array_almost_equal(prj.get("weight", format="array"), weights)
+
+    def test_merge_connection_blocks(self):
+        blocks = [
+            (np.array([0, 1]), np.array([0, 0]), {"weight": np.array([0.1, 0.2]), "delay": 0.5}),
+            (np.array([2]), np.array([1]), {"weight": 0.3, "delay": 0.5}),
+        ]
+        pre, post, parameters = merge_connection_blocks(blocks)
+        assert_array_equal(pre, np.array([0, 1, 2]))
+        assert_array_equal(post, np.array([0, 0, 1]))
+        assert_array_almost_equal(parameters["weight"], np.array([0.1, 0.2, 0.3]))
+        self.assertEqual(parameters["delay"], 0.5)
+
     def test_single_postsynaptic_neuron(self):
         prj = sim.Projection(self.p1, self.p4, sim.AllToAllConnector(),
                              synapse_type=sim.StaticSynapse(weight=0.123))
@@ -19,8 +19,8 @@ except ImportError:
 from .mocks import MockRNG
 import pyNN.mock as sim
 
-from pyNN import random, errors, space, standardmodels
-from pyNN.parameters import Sequence
+from pyNN import random, errors, space, standardmodels, connectors
+from pyNN.parameters import ParameterSpace, Sequence
 
 
 def _sort_by_column(A, col):
@@ -168,6 +168,25 @@ class ProjectionTest(unittest.TestCase):
         target = 0.007 * np.ones((self.p1.size, self.p2.size))
         assert_array_equal(weights, target)
 
+    def test_get_weights_and_delays_as_columns(self, sim=sim):
+        prj = sim.Projection(self.p1, self.p2, connector=self.all2all, synapse_type=self.syn2)
+        connections = prj.get(["weight", "delay"], format="list", gather=False)
+        columns = prj.get(["weight", "delay"], format="columns", gather=False)
+        self.assertEqual(list(columns), ["presynaptic_index", "postsynaptic_index", "weight", "delay"])
+        self.assertEqual(columns["presynaptic_index"].dtype.kind, "i")
+        self.assertEqual(columns["weight"].dtype.kind, "f")
+        assert_array_equal(np.array(list(columns.values())).T, np.array(connections))
+
+    def test_get_weights_as_structured_array(self, sim=sim):
+        prj = sim.Projection(self.p1, self.p2, connector=self.all2all, synapse_type=self.syn2)
+        connections = prj.get("weight", format="list", gather=False)
+        values = prj.get("weight", format="structured", gather=False)
+        self.assertEqual(values.dtype.names, ("presynaptic_index", "postsynaptic_index", "weight"))
+        assert_array_equal(values.presynaptic_index, [c[0] for c in connections])
+        assert_array_equal(values.weight, [c[2] for c in connections])
+        values = prj.get("weight", format="structured", gather=False, with_address=False)
+        self.assertEqual(values.dtype.names, ("weight",))
+
     def test_get_weights_as_array_with_multapses(self, sim=sim):
         C = sim.FixedNumberPreConnector(n=7, rng=MockRNG(delta=1))
         prj = sim.Projection(self.p2, self.p3, C, synapse_type=self.syn1)
@@ -195,6 +214,189 @@ class ProjectionTest(unittest.TestCase):
         weights = prj.get("weight", format="array", gather=False, multiple_synapses='min')
         assert_array_equal(weights, target)
 
+    def test_connection_matrix_with_multapses(self, sim=sim):
+        prj = sim.Projection(self.p2, self.p3, sim.OneToOneConnector(), synapse_type=self.syn1)
+        pre = np.array([0, 1, 0, 2, 0])
+        post = np.array([1, 1, 1, 3, 1])
+        values = np.array([0.3, 0.2, 0.1, 0.4, 0.5])
+        for multiple_synapses, value in (('first', 0.3), ('last', 0.5), ('sum', 0.9),
+                                         ('min', 0.1), ('max', 0.5)):
+            matrix = prj._connection_matrix(pre, post, values, multiple_synapses)
+            self.assertAlmostEqual(matrix[0, 1], value)
+            self.assertEqual(matrix[1, 1], 0.2)
+            self.assertEqual(matrix[2, 3], 0.4)
+            self.assertEqual(np.isnan(matrix).sum(), matrix.size - 3)
+
+    def test_to_sparse_with_multapses(self, sim=sim):
+        from scipy import sparse
+        C = sim.FixedNumberPreConnector(n=7, rng=MockRNG(delta=1))
+        prj = sim.Projection(self.p2, self.p3, C, synapse_type=self.syn1)
+        for multiple_synapses in ('sum', 'min'):
+            matrix = prj.to_sparse("weight", multiple_synapses=multiple_synapses, gather=False)
+            self.assertTrue(sparse.isspmatrix_csr(matrix))
+            assert_array_equal(matrix.toarray(),
+                               prj.get("weight", format="array", gather=False,
+                                       multiple_synapses=multiple_synapses))
+        self.assertTrue(sparse.isspmatrix_coo(prj.to_sparse(format="coo", gather=False)))
+
+    def test_set_weights_with_vector(self, sim=sim):
+        prj = sim.Projection(self.p1, self.p2, connector=self.all2all, synapse_type=self.syn2)
+        weights = 0.001 * np.arange(len(prj))
+        prj.set(weight=weights)
+        assert_array_equal(prj.get("weight", format="columns", gather=False)["weight"], weights)
+        self.assertRaises(ValueError, prj.set, weight=weights[1:])
+
+    def test_set_weights_with_triples(self, sim=sim):
+        prj = sim.Projection(self.p1, self.p2, connector=self.all2all, synapse_type=self.syn2)
+        prj.set(weight=(np.array([2, 0]), np.array([1, 3]), np.array([0.05, 0.06])))
+        weights = prj.get("weight", format="array", gather=False)
+        self.assertEqual(weights[2, 1], 0.05)
+        self.assertEqual(weights[0, 3], 0.06)
+        self.assertEqual((weights == 0.007).sum(), weights.size - 2)
+
+    def test_statistics(self, sim=sim):
+        C = sim.FixedNumberPreConnector(n=7, rng=MockRNG(delta=1))
+        prj = sim.Projection(self.p2, self.p3, C, synapse_type=self.syn1)
+        prj._statistics_chunk_size = 4
+        columns = prj.get(["weight"], format="columns", gather=False)
+        statistics = prj.statistics(distance_bins=[0.0, 1.0, 1000.0], gather=False)
+        self.assertEqual(statistics["n_connections"], 35)
+        assert_array_equal(statistics["in_degree"],
+                           np.bincount(columns["postsynaptic_index"], minlength=5))
+        assert_array_equal(statistics["out_degree"],
+                           np.bincount(columns["presynaptic_index"], minlength=4))
+        self.assertEqual(statistics["n_multapses"], 15)
+        self.assertEqual(statistics["n_autapses"], 0)
+        self.assertAlmostEqual(statistics["weight"]["mean"], 0.006)
+        self.assertAlmostEqual(statistics["weight"]["std"], 0.0)
+        self.assertEqual(statistics["delay"]["max"], 0.5)
+        distances = prj.space.paired_distances(self.p2.positions.T[columns["presynaptic_index"]],
+                                               self.p3.positions.T[columns["postsynaptic_index"]])
+        assert_array_equal(statistics["distance_histogram"][0],
+                           np.histogram(distances, bins=[0.0, 1.0, 1000.0])[0])
+
+    def test_statistics_reads_chunks_and_keeps_precision(self, sim=sim):
+        weights = 1e6 + np.arange(7 * 4, dtype=float).reshape((7, 4)) * 1e-3
+        prj = sim.Projection(self.p1, self.p2, connector=self.all2all,
+                             synapse_type=sim.StaticSynapse(weight=weights, delay=0.5))
+        prj._statistics_chunk_size = 5
+        prj._get_attributes_as_columns = None
+        prj._get_attributes_as_gathered_columns = None
+        statistics = prj.statistics("weight", gather=False)
+        self.assertEqual(statistics["n_connections"], 28)
+        self.assertEqual(statistics["n_multapses"], 0)
+        self.assertAlmostEqual(statistics["weight"]["mean"], weights.mean(), places=6)
+        self.assertAlmostEqual(statistics["weight"]["std"], weights.std(), places=9)
+
+    def test_statistics_multapses_without_bitmap(self, sim=sim):
+        C = sim.FixedNumberPreConnector(n=7, rng=MockRNG(delta=1))
+        prj = sim.Projection(self.p2, self.p3, C, synapse_type=self.syn1)
+        prj._statistics_chunk_size = 4
+        with patch("pyNN.common.projections._ConnectedPairs.max_bits_per_connection", 0):
+            statistics = prj.statistics(gather=False)
+        self.assertEqual(statistics["n_multapses"], 15)
+
+    def test_statistics_with_autapses(self, sim=sim):
+        prj = sim.Projection(self.p1, self.p1, connector=self.all2all, synapse_type=self.syn2)
+        statistics = prj.statistics("weight", gather=False)
+        self.assertEqual(statistics["n_autapses"], 7)
+        self.assertEqual(statistics["n_multapses"], 0)
+        self.assertNotIn("delay", statistics)
+
+    def _build_network(self, sim=sim):
+        space_ = space.Space(axes="x")
+        projections = [
+            sim.Projection(self.p1, self.p3,
+                           sim.DistanceDependentProbabilityConnector("d < 2", rng=random.NumpyRNG(seed=7)),
+                           sim.StaticSynapse(weight="0.01 + 0.001 * d"), space=space_),
+            sim.Projection(self.p1, self.p3,
+                           sim.FixedProbabilityConnector(0.5, rng=random.NumpyRNG(seed=8)),
+                           sim.StaticSynapse(weight="0.02 + 0.001 * d"), space=space_),
+        ]
+        return projections
+
+    def test_deferred_build(self, sim=sim):
+        expected = [prj.get("weight", format="list") for prj in self._build_network()]
+        sim.setup(deferred_build=True)
+        projections = self._build_network()
+        self.assertEqual([len(prj) for prj in projections], [0, 0])
+        self.assertEqual(len(sim.simulator.state.build_plan), 2)
+        sim.build()
+        self.assertEqual(sim.simulator.state.build_plan, [])
+        self.assertEqual([prj.get("weight", format="list") for prj in projections], expected)
+        self.assertFalse(hasattr(projections[0], "_distance_map_cache"))
+
+    def test_deferred_build_shares_distances_only_when_used(self, sim=sim):
+        sim.setup(deferred_build=True)
+        projections = [sim.Projection(self.p1, self.p3, sim.FixedNumberPreConnector(2),
+                                      sim.StaticSynapse(weight=0.01))
+                       for i in range(2)]
+        with patch.object(connectors._ColumnCachedDistances, "column") as column:
+            sim.build()
+        self.assertEqual([len(prj) for prj in projections], [2 * self.p3.size] * 2)
+        column.assert_not_called()
+
+    def test_deferred_build_on_run(self, sim=sim):
+        sim.setup(deferred_build=True)
+        prj = sim.Projection(self.p1, self.p2, self.all2all, self.syn2)
+        self.assertEqual(len(prj), 0)
+        sim.run(1.0)
+        self.assertEqual(len(prj), self.p1.size * self.p2.size)
+
+    def test_deferred_build_in_processes(self, sim=sim):
+        projections = self._build_network()
+        expected = [prj.get("weight", format="list") for prj in projections]
+        expected_next = projections[1]._connector.rng.next()
+        sim.setup(deferred_build=True)
+        projections = self._build_network()
+        sim.build(processes=2)
+        self.assertEqual([prj.get("weight", format="list") for prj in projections], expected)
+        # the random number generator is left in the same state as after building in this process
+        self.assertEqual(projections[1]._connector.rng.next(), expected_next)
+
+    def test_evaluate_at_connections_independent_of_num_processes(self, sim=sim):
+        values = {}
+        for num_processes, rank in ((1, 0), (2, 0), (2, 1)):
+            sim.setup(num_processes=num_processes, rank=rank)
+            p1 = sim.Population(7, sim.IF_cond_exp())
+            p2 = sim.Population(6, sim.IF_cond_exp())
+            prj = sim.Projection(p1, p2, sim.AllToAllConnector(), sim.StaticSynapse())
+            weights = random.RandomDistribution('uniform', (0, 1),
+                                                rng=random.NumpyRNG(seed=93, parallel_safe=True))
+            ps = ParameterSpace({"weight": weights}, shape=prj.shape)
+            local_columns = p2._mask_local.nonzero()[0]
+            pre = np.tile(np.arange(p1.size), local_columns.size)
+            post = np.repeat(local_columns, p1.size)
+            result = prj._evaluate_at_connections(ps["weight"], pre, post)
+            values.update(((num_processes, i, j), w) for i, j, w in zip(pre, post, result))
+        for (num_processes, i, j), w in values.items():
+            self.assertEqual(w, values[(1, i, j)])
+        self.assertEqual(len(values), 2 * 7 * 6)
+
+    def test_deferred_build_in_processes_with_shared_nested_rng(self, sim=sim):
+        def build_network():
+            rng = random.NumpyRNG(seed=37)
+            n = random.RandomDistribution('poisson', lambda_=5, rng=rng)
+            projections = [
+                sim.Projection(self.p1, self.p3,
+                               sim.FixedNumberPreConnector(n=n, with_replacement=True,
+                                                           rng=random.NumpyRNG(seed=i)),
+                               sim.StaticSynapse())
+                for i in range(3)]
+            return projections, rng
+
+        # the connector constructors draw from `rng`, so the reference is also a deferred build
+        sim.setup(deferred_build=True)
+        projections, rng = build_network()
+        sim.build()
+        expected = [prj.get([], format="list") for prj in projections]
+        expected_next = rng.next()
+        sim.setup(deferred_build=True)
+        projections, rng = build_network()
+        sim.build(processes=3)
+        self.assertEqual([prj.get([], format="list") for prj in projections], expected)
+        self.assertEqual(rng.next(), expected_next)
+
     def test_synapse_with_lambda_parameter(self, sim=sim):
         syn = sim.StaticSynapse(weight=lambda d: 0.01 + 0.001 * d)
         prj = sim.Projection(self.p1, self.p2, self.all2all, synapse_type=syn)
@@ -3,6 +3,7 @@ Unit tests for pyNN/random.py.
 """
 
 import unittest
+from copy import deepcopy
 import numpy as np
 from numpy.testing import assert_allclose
 
@@ -232,6 +233,40 @@ class RandomDistributionTests(unittest.TestCase):
             self.assertRaises(Exception, rd1.next, 1000)
 
 
+class CounterRNGTests(unittest.TestCase):
+
+    def setUp(self):
+        random.get_mpi_config = lambda: (0, 1)
+
+    def test_next(self):
+        rng = random.CounterRNG(seed=2468)
+        vals = rng.next(100, 'normal', {'mu': 0.0, 'sigma': 1.0})
+        self.assertEqual(vals.shape, (100,))
+        assert_allclose(vals, random.CounterRNG(seed=2468).next(100, 'normal', {'mu': 0.0, 'sigma': 1.0}))
+
+    def test_evaluate_by_parts(self):
+        rd = random.RandomDistribution('normal_clipped', (0.0, 1.0, -1.0, 1.0),
+                                       rng=random.CounterRNG(seed=1357))
+        shape = (2500, 6)
+        values = rd.lazily_evaluate(shape=shape)
+        self.assertEqual(values.shape, shape)
+        assert_allclose(rd.lazily_evaluate((slice(None), 4), shape), values[:, 4])
+        rows = np.array([2499, 0, 1024, 7])
+        columns = np.array([5, 5, 0, 3])
+        assert_allclose(rd.lazily_evaluate((rows, columns), shape), values[rows, columns])
+        # a new distribution gets a new stream
+        rd2 = random.RandomDistribution('normal_clipped', (0.0, 1.0, -1.0, 1.0), rng=rd.rng)
+        self.assertFalse(np.allclose(rd2.lazily_evaluate(shape=shape), values))
+
+    def test_deepcopy(self):
+        rd = random.RandomDistribution('uniform_int', (0, 100), rng=random.CounterRNG(seed=97))
+        rd_copy = deepcopy(rd)
+        self.assertIsInstance(rd_copy.rng, random.CounterRNG)
+        mask = np.array([True, False, True, True, False])
+        np.testing.assert_array_equal(rd_copy.lazily_evaluate(mask, (5,)),
+                                      rd.lazily_evaluate(shape=(5,))[mask])
+
+
 # ==============================================================================
 if __name__ == "__main__":
     unittest.main()
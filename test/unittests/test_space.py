@@ -115,6 +115,40 @@ class SpaceTest(unittest.TestCase):
         self.assertArraysEqual(s.distances(self.C, self.ABCD),
                                np.array([sqrt(3), sqrt(4 + 4 + 4), 0.0, sqrt(4 + 1 + 0)]))
 
+    def test_paired_distances(self):
+        s = space.Space(periodic_boundaries=((-1.0, 4.0), (-1.0, 4.0), (-1.0, 4.0)))
+        DCBA = self.ABCD[::-1]
+        assert_array_equal(s.paired_distances(self.ABCD, DCBA),
+                           np.diag(s.distances(self.ABCD, DCBA).reshape(4, 4)))
+
+    def test_generator_with_paired_indices(self):
+        s = space.Space(scale_factor=2.0, offset=1.0)
+        def f(i): return self.ABCD[i]
+        def g(j): return self.ABCD[j]
+        i = np.array([0, 1, 3, 3])
+        j = np.array([2, 2, 0, 1])
+        assert_array_equal(s.distance_generator(f, g)(i, j),
+                           np.array([s.distances(self.ABCD[ii], self.ABCD[jj])[0]
+                                     for ii, jj in zip(i, j)]))
+
+
+class CellListTest(unittest.TestCase):
+
+    def test_pairs_within(self):
+        rng = np.random.RandomState(8741)
+        A = rng.uniform(0, 10, size=(100, 3))
+        B = rng.uniform(0, 10, size=(80, 3))
+        for s in (space.Space(), space.Space(axes='xy'),
+                  space.Space(scale_factor=0.5, offset=2.0),
+                  space.Space(periodic_boundaries=((0, 10), None, (0, 10)))):
+            for radius in (0.7, 3.0, 12.0):
+                i, j, d = space.CellList(s, A, radius).pairs_within(B)
+                D = s.distances(A, B).reshape(100, 80)
+                expected_j, expected_i = np.nonzero(D.T <= radius)
+                assert_array_equal(i, expected_i)
+                assert_array_equal(j, expected_j)
+                assert_allclose(d, D[i, j])
+
 
 class LineTest(unittest.TestCase):
 